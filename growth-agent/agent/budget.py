@@ -0,0 +1,137 @@
+"""Per-run LLM budget — bounds the calls, tokens and wall-clock time of one cron run."""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("growth-agent")
+
+# Purposes allowed to spend the reserve; refinement, critique etc. are optional polish.
+ESSENTIAL_PURPOSES = frozenset({"generate", "insights"})
+# Share of the call and token limits a purpose may use in total. Article summaries run
+# before first-pass generation, so they get a small sub-budget of their own.
+PURPOSE_SHARES = {"summarize": 0.1}
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised by LLMClient when the run budget does not allow another call."""
+
+
+def _env_limit(name: str) -> float | None:
+    """Read a positive limit from env. Unset, 0 or unparsable means no limit."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning("%s=%r is not a number — running without that limit", name, raw)
+        return None
+    return value if value > 0 else None
+
+
+@dataclass
+class LLMBudget:
+    """Token/call/deadline budget shared by every LLMClient of one run.
+
+    First-pass generation may use the whole budget. Optional work (critique,
+    refinement, re-critique) stops once less than ``reserve_fraction`` of any
+    limit is left, so the remaining budget goes to posts that do not exist yet.
+    Purposes in PURPOSE_SHARES are further capped at that share of the call and
+    token limits.
+    """
+
+    max_tokens: int | None = None
+    max_calls: int | None = None
+    deadline_seconds: float | None = None
+    reserve_fraction: float = 0.25
+    tokens_used: int = 0
+    calls_used: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    skipped: dict[str, int] = field(default_factory=dict)
+    # purpose -> (calls, tokens) charged so far
+    used_by_purpose: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "LLMBudget":
+        """Construct from LLM_BUDGET_MAX_TOKENS, LLM_BUDGET_MAX_CALLS, LLM_BUDGET_SECONDS.
+
+        Limits that are not set are unbounded, so an unconfigured run behaves as before.
+        """
+        max_tokens = _env_limit("LLM_BUDGET_MAX_TOKENS")
+        max_calls = _env_limit("LLM_BUDGET_MAX_CALLS")
+        return cls(
+            max_tokens=int(max_tokens) if max_tokens is not None else None,
+            max_calls=int(max_calls) if max_calls is not None else None,
+            deadline_seconds=_env_limit("LLM_BUDGET_SECONDS"),
+        )
+
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining_fraction(self) -> float:
+        """Smallest remaining share across all configured limits (1.0 when unbounded)."""
+        fractions = [1.0]
+        if self.max_tokens:
+            fractions.append(1.0 - self.tokens_used / self.max_tokens)
+        if self.max_calls:
+            fractions.append(1.0 - self.calls_used / self.max_calls)
+        if self.deadline_seconds:
+            fractions.append(1.0 - self.elapsed_seconds() / self.deadline_seconds)
+        return max(0.0, min(fractions))
+
+    def is_tight(self) -> bool:
+        return self.remaining_fraction() < self.reserve_fraction
+
+    def allows(self, purpose: str, estimated_tokens: int = 0) -> bool:
+        """Whether a call for ``purpose`` costing ~``estimated_tokens`` fits the budget."""
+        if self.max_calls is not None and self.calls_used >= self.max_calls:
+            return False
+        if self.max_tokens is not None and self.tokens_used + estimated_tokens > self.max_tokens:
+            return False
+        if self.deadline_seconds is not None and self.elapsed_seconds() >= self.deadline_seconds:
+            return False
+        if purpose not in ESSENTIAL_PURPOSES and self.is_tight():
+            return False
+        share = PURPOSE_SHARES.get(purpose)
+        if share is not None:
+            calls, tokens = self.used_by_purpose.get(purpose, (0, 0))
+            if self.max_calls is not None and calls + 1 > share * self.max_calls:
+                return False
+            if self.max_tokens is not None and tokens + estimated_tokens > share * self.max_tokens:
+                return False
+        return True
+
+    def record(self, tokens: int, purpose: str = "generate") -> None:
+        tokens = max(0, tokens)
+        self.calls_used += 1
+        self.tokens_used += tokens
+        calls, used = self.used_by_purpose.get(purpose, (0, 0))
+        self.used_by_purpose[purpose] = (calls + 1, used + tokens)
+
+    def skip(self, purpose: str) -> None:
+        """Record that a ``purpose`` call was skipped for budget reasons."""
+        self.skipped[purpose] = self.skipped.get(purpose, 0) + 1
+        logger.info(
+            "LLM budget: skipping %s (calls=%d, tokens=%d, elapsed=%.0fs)",
+            purpose,
+            self.calls_used,
+            self.tokens_used,
+            self.elapsed_seconds(),
+        )
+
+    def diagnostics(self) -> dict[str, int | float | bool | str]:
+        """Flat summary of budget usage and decisions for run logs."""
+        diagnostics: dict[str, int | float | bool | str] = {
+            "calls_used": self.calls_used,
+            "tokens_used": self.tokens_used,
+            "max_calls": self.max_calls or 0,
+            "max_tokens": self.max_tokens or 0,
+            "deadline_seconds": self.deadline_seconds or 0,
+            "elapsed_seconds": round(self.elapsed_seconds(), 1),
+            "tight": self.is_tight(),
+        }
+        for purpose, count in sorted(self.skipped.items()):
+            diagnostics[f"skipped_{purpose}"] = count
+        return diagnostics
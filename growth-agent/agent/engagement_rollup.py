@@ -0,0 +1,143 @@
+"""Materialized engagement rollups: per page, per channel, per publish week.
+
+The metrics refresh adds each refreshed post's change in counts (new minus stored
+PostMetrics), so an update costs O(refreshed posts). Readers such as
+generate_insights load the small engagement_rollup.json instead of joining all of
+performance.json against the published queue. build_rollup does that full join
+when no rollup is stored yet or it was built by an older ROLLUP_VERSION.
+
+Reads trust the stored rollup and never touch performance.json. The metrics
+refresh, which loads performance.json anyway, checks the rollup's grand total
+against it before adding deltas and rebuilds on a mismatch (a lost rollup write,
+or a manual edit of performance.json).
+"""
+
+import logging
+from datetime import datetime
+
+from agent.models import (
+    ContentQueue,
+    Draft,
+    EngagementRollup,
+    EngagementTotals,
+    Performance,
+    PostMetrics,
+)
+from agent.storage import load_model
+from agent.utils import normalize_url
+
+logger = logging.getLogger("growth-agent")
+
+ROLLUP_KEY = "engagement_rollup.json"
+# Bump when the rollup's layout or what it counts changes; stored rollups are rebuilt.
+ROLLUP_VERSION = 1
+
+
+def week_key(ts: datetime) -> str:
+    year, week, _ = ts.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _add(
+    totals: dict[str, EngagementTotals],
+    key: str,
+    current: PostMetrics,
+    previous: PostMetrics | None,
+) -> None:
+    entry = totals.setdefault(key, EngagementTotals())
+    entry.favourites += current.favourites - (previous.favourites if previous else 0)
+    entry.reblogs += current.reblogs - (previous.reblogs if previous else 0)
+    entry.replies += current.replies - (previous.replies if previous else 0)
+    if previous is None:
+        entry.posts += 1
+
+
+def apply_refresh(
+    rollup: EngagementRollup,
+    draft: Draft,
+    current: PostMetrics,
+    previous: PostMetrics | None,
+) -> None:
+    """Fold one post's refreshed metrics into ``rollup`` in place."""
+    _add(rollup.channels, current.channel, current, previous)
+    if draft.published_at is not None:
+        _add(rollup.weeks, week_key(draft.published_at), current, previous)
+    if draft.link:
+        _add(rollup.pages, normalize_url(draft.link), current, previous)
+
+
+def build_rollup(performance: Performance, queue: ContentQueue) -> EngagementRollup:
+    """Full rebuild from performance.json and the published queue."""
+    published_by_id = {d.id: d for d in queue.published}
+    rollup = EngagementRollup(version=ROLLUP_VERSION)
+    for metrics in performance.posts:
+        draft = published_by_id.get(metrics.id)
+        if draft is not None:
+            apply_refresh(rollup, draft, metrics, None)
+    return rollup
+
+
+def load_rollup(storage) -> EngagementRollup | None:
+    data = storage.read(ROLLUP_KEY)
+    if not isinstance(data, dict):
+        return None
+    try:
+        rollup = EngagementRollup.model_validate(data)
+    except ValueError:
+        logger.warning("%s is not a valid rollup — rebuilding", ROLLUP_KEY)
+        return None
+    if rollup.version != ROLLUP_VERSION:
+        logger.info(
+            "%s is version %d, not %d — rebuilding", ROLLUP_KEY, rollup.version, ROLLUP_VERSION
+        )
+        return None
+    return rollup
+
+
+def _grand_total(totals: list[EngagementTotals | PostMetrics]) -> tuple[int, int, int, int]:
+    return (
+        sum(t.favourites for t in totals),
+        sum(t.reblogs for t in totals),
+        sum(t.replies for t in totals),
+        sum(t.posts if isinstance(t, EngagementTotals) else 1 for t in totals),
+    )
+
+
+def is_consistent(rollup: EngagementRollup, performance: Performance, queue: ContentQueue) -> bool:
+    """Whether the rollup's grand total matches performance.json's published posts.
+
+    Every counted post appears in exactly one channel, so the channel totals must
+    sum to the same counts as a plain pass over performance.json.
+    """
+    published_ids = {d.id for d in queue.published}
+    expected = _grand_total([p for p in performance.posts if p.id in published_ids])
+    return _grand_total(list(rollup.channels.values())) == expected
+
+
+def checked_rollup(
+    storage, performance: Performance, queue: ContentQueue
+) -> tuple[EngagementRollup, bool]:
+    """The stored rollup if it matches ``performance``, else a rebuild. Second item: rebuilt.
+
+    This is the full O(history) check; only the metrics refresh calls it.
+    """
+    rollup = load_rollup(storage)
+    if rollup is not None and is_consistent(rollup, performance, queue):
+        return rollup, False
+    if rollup is not None:
+        logger.warning("%s does not match performance.json — rebuilding", ROLLUP_KEY)
+    return build_rollup(performance, queue), True
+
+
+def load_or_build_rollup(storage) -> EngagementRollup:
+    """The stored rollup; built (and written back) only if missing or outdated."""
+    rollup = load_rollup(storage)
+    if rollup is not None:
+        return rollup
+    rollup = build_rollup(
+        load_model(storage, "performance.json", Performance),
+        load_model(storage, "content_queue.json", ContentQueue),
+    )
+    storage.write(ROLLUP_KEY, rollup)
+    logger.info("Engagement rollup rebuilt: %d pages", len(rollup.pages))
+    return rollup
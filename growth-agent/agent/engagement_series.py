@@ -0,0 +1,174 @@
+"""Append-only engagement time series, partitioned by month.
+
+performance.json only holds each post's latest counts. Every metrics refresh also
+appends a (post, timestamp, reblogs, favourites, replies) snapshot here, so growth
+curves survive. Partitions are column arrays (see EngagementPartition); a day's run
+rewrites only the current month's partition. A snapshot whose counts equal the
+post's previous row in the same partition is dropped, so an unchanged post costs
+one row per month.
+"""
+
+import logging
+from array import array
+from datetime import datetime, timezone
+
+from agent.models import EngagementPartition
+
+try:  # optional: return NumPy arrays from read()
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is not a runtime dependency
+    np = None
+
+logger = logging.getLogger("growth-agent")
+
+ENGAGEMENT_PREFIX = "engagement/"
+COLUMNS = ("ts", "reblogs", "favourites", "replies")
+
+
+def partition_key(month: str) -> str:
+    return f"{ENGAGEMENT_PREFIX}{month}.json"
+
+
+def _month(ts: datetime) -> str:
+    return ts.astimezone(timezone.utc).strftime("%Y-%m")
+
+
+class _Partition:
+    """A month partition held as typed arrays while it is being appended to."""
+
+    def __init__(self, data: EngagementPartition):
+        self.month = data.month
+        self.post_ids = list(data.post_ids)
+        self.index = {post_id: i for i, post_id in enumerate(self.post_ids)}
+        self.post = array("l", data.post)
+        self.columns = {name: array("q", getattr(data, name)) for name in COLUMNS}
+        # Latest counts per post index, for deduplication.
+        self.last: dict[int, tuple[int, int, int]] = {}
+        for row, post in enumerate(self.post):
+            self.last[post] = self._counts(row)
+
+    def _counts(self, row: int) -> tuple[int, int, int]:
+        c = self.columns
+        return (c["reblogs"][row], c["favourites"][row], c["replies"][row])
+
+    def append(self, post_id: str, ts: int, counts: tuple[int, int, int]) -> bool:
+        post = self.index.get(post_id)
+        if post is None:
+            post = self.index[post_id] = len(self.post_ids)
+            self.post_ids.append(post_id)
+        elif self.last.get(post) == counts:
+            return False
+        self.post.append(post)
+        self.columns["ts"].append(ts)
+        for name, value in zip(COLUMNS[1:], counts):
+            self.columns[name].append(value)
+        self.last[post] = counts
+        return True
+
+    def to_model(self) -> EngagementPartition:
+        return EngagementPartition(
+            month=self.month,
+            post_ids=self.post_ids,
+            post=self.post.tolist(),
+            **{name: column.tolist() for name, column in self.columns.items()},
+        )
+
+
+class EngagementSeries:
+    """Appends snapshots to month partitions and reads them back as arrays."""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._partitions: dict[str, _Partition] = {}
+        self._dirty: set[str] = set()
+        self.appended = 0
+        self.deduplicated = 0
+
+    def _partition(self, month: str) -> _Partition:
+        partition = self._partitions.get(month)
+        if partition is None:
+            data = self.storage.read(partition_key(month))
+            model = (
+                EngagementPartition.model_validate(data)
+                if data
+                else EngagementPartition(month=month)
+            )
+            partition = self._partitions[month] = _Partition(model)
+        return partition
+
+    def append(
+        self, post_id: str, ts: datetime, reblogs: int, favourites: int, replies: int
+    ) -> bool:
+        """Record a snapshot; False if it repeats the post's previous counts."""
+        month = _month(ts)
+        added = self._partition(month).append(
+            post_id, int(ts.timestamp()), (reblogs, favourites, replies)
+        )
+        if added:
+            self.appended += 1
+            self._dirty.add(month)
+        else:
+            self.deduplicated += 1
+        return added
+
+    def save(self) -> None:
+        """Write the partitions that received rows."""
+        for month in sorted(self._dirty):
+            self.storage.write(partition_key(month), self._partitions[month].to_model())
+        if self._dirty:
+            logger.info(
+                "Engagement series: %d snapshots appended, %d unchanged skipped (%s)",
+                self.appended,
+                self.deduplicated,
+                ", ".join(sorted(self._dirty)),
+            )
+        self._dirty.clear()
+
+    def read(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        post_ids: list[str] | None = None,
+    ) -> dict:
+        """Snapshots with ``start <= ts < end`` as columns, sorted by (post_id, ts).
+
+        Returns ``post_id`` plus the COLUMNS as NumPy arrays when numpy is installed,
+        else as lists. Only partitions overlapping the range are loaded.
+        """
+        months = sorted(
+            key.removeprefix(ENGAGEMENT_PREFIX).removesuffix(".json")
+            for key in self.storage.list_keys(ENGAGEMENT_PREFIX)
+            if key.endswith(".json")
+        )
+        if start is not None:
+            months = [m for m in months if m >= _month(start)]
+        if end is not None:
+            months = [m for m in months if m <= _month(end)]
+        lo = int(start.timestamp()) if start else None
+        hi = int(end.timestamp()) if end else None
+        wanted = set(post_ids) if post_ids is not None else None
+
+        rows: list[tuple[str, int, int, int, int]] = []
+        for month in months:
+            partition = self._partition(month)
+            ts_column = partition.columns["ts"]
+            for row, post in enumerate(partition.post):
+                post_id = partition.post_ids[post]
+                ts = ts_column[row]
+                if (wanted is not None and post_id not in wanted) or (
+                    (lo is not None and ts < lo) or (hi is not None and ts >= hi)
+                ):
+                    continue
+                rows.append((post_id, ts, *partition._counts(row)))
+        rows.sort()
+
+        columns = {
+            "post_id": [r[0] for r in rows],
+            **{name: [r[i + 1] for r in rows] for i, name in enumerate(COLUMNS)},
+        }
+        if np is None:
+            return columns
+        return {
+            "post_id": np.asarray(columns["post_id"], dtype=object),
+            **{name: np.asarray(columns[name], dtype=np.int64) for name in COLUMNS},
+        }
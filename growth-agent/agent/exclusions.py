@@ -0,0 +1,108 @@
+"""Registry exclusion rules compiled into a path-segment trie.
+
+registry_excluded.json may hold:
+- ``urls``: exact URLs (normalized before comparison)
+- ``prefixes``: path prefixes, matched like ``path.startswith(prefix)``
+- ``globs``: fnmatch patterns over the path, e.g. ``/blog/*/draft-*``
+- ``regexes``: regular expressions searched in the path
+
+Prefixes are stored in a trie keyed by path segment, so matching costs O(path
+length) however many prefixes exist. Globs and regexes are checked afterwards.
+"""
+
+import fnmatch
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from agent.utils import normalize_url
+
+logger = logging.getLogger("growth-agent")
+
+
+@dataclass
+class _TrieNode:
+    children: dict[str, "_TrieNode"] = field(default_factory=dict)
+    # (partial last segment, rule): a path matches if its next segment starts with it
+    partials: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _string_list(data: dict, key: str) -> list[str]:
+    values = data.get(key, [])
+    if not isinstance(values, list):
+        return []
+    return [v.strip() for v in values if isinstance(v, str) and v.strip()]
+
+
+class ExclusionRules:
+    """Compiled exclusion rules. ``match`` returns the rule that excludes a URL."""
+
+    def __init__(
+        self,
+        urls: list[str] | None = None,
+        prefixes: list[str] | None = None,
+        globs: list[str] | None = None,
+        regexes: list[str] | None = None,
+    ):
+        self._urls = {normalize_url(u): f"url:{u}" for u in urls or []}
+        self._root = _TrieNode()
+        for prefix in prefixes or []:
+            self._add_prefix(prefix)
+        # (matcher, rule): globs must match the whole path, regexes anywhere in it
+        self._patterns: list[tuple[Callable[[str], object], str]] = []
+        for glob in globs or []:
+            self._patterns.append((re.compile(fnmatch.translate(glob)).match, f"glob:{glob}"))
+        for regex in regexes or []:
+            try:
+                self._patterns.append((re.compile(regex).search, f"regex:{regex}"))
+            except re.error:
+                logger.warning("Ignoring invalid exclusion regex %r", regex)
+
+    @classmethod
+    def from_payload(cls, data: dict | list | None) -> "ExclusionRules":
+        """Compile the registry_excluded.json payload; anything else means no rules."""
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            urls=_string_list(data, "urls"),
+            prefixes=_string_list(data, "prefixes"),
+            globs=_string_list(data, "globs"),
+            regexes=_string_list(data, "regexes"),
+        )
+
+    def _add_prefix(self, prefix: str) -> None:
+        # "/blog/dr" -> full segments ["", "blog"], partial "dr". Splitting the path the
+        # same way makes startswith() equivalent to a segment walk plus one partial check.
+        *segments, partial = prefix.split("/")
+        node = self._root
+        for segment in segments:
+            node = node.children.setdefault(segment, _TrieNode())
+        node.partials.append((partial, f"prefix:{prefix}"))
+
+    def _match_prefix(self, path: str) -> str | None:
+        node = self._root
+        for segment in path.split("/"):
+            for partial, rule in node.partials:
+                if segment.startswith(partial):
+                    return rule
+            child = node.children.get(segment)
+            if child is None:
+                return None
+            node = child
+        return None
+
+    def match(self, url: str) -> str | None:
+        """The first rule excluding ``url`` (``url:``, ``prefix:``, ``glob:``, ``regex:``)."""
+        rule = self._urls.get(url)
+        if rule:
+            return rule
+        path = urlsplit(url).path or "/"
+        rule = self._match_prefix(path)
+        if rule:
+            return rule
+        for matcher, pattern_rule in self._patterns:
+            if matcher(path):
+                return pattern_rule
+        return None
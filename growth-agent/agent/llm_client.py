@@ -7,6 +7,9 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, SecretStr
 
+from agent.budget import BudgetExceeded, LLMBudget
+from agent.tokens import estimate_tokens
+
 
 @dataclass
 class ProviderConfig:
@@ -48,11 +51,35 @@ def _to_langchain_messages(
     return result
 
 
+def _estimate_tokens(messages: list[dict[str, str]]) -> int:
+    """Estimated prompt size for budget checks before a call."""
+    return sum(estimate_tokens(msg["content"]) for msg in messages)
+
+
+def _usage_tokens(message: object, fallback: int) -> int:
+    """Total tokens reported by the provider, or ``fallback`` when usage is missing."""
+    usage = getattr(message, "usage_metadata", None)
+    if isinstance(usage, dict) and isinstance(usage.get("total_tokens"), int):
+        return usage["total_tokens"]
+    return fallback
+
+
 class LLMClient:
-    """OpenAI-compatible LLM client. Use from_env() for provider selection via LLM_PROVIDER."""
+    """OpenAI-compatible LLM client. Use from_env() for provider selection via LLM_PROVIDER.
 
-    def __init__(self, api_token: SecretStr, base_url: str, model: str):
+    An optional LLMBudget is charged for every call; calls it does not allow raise
+    BudgetExceeded before anything is sent to the provider.
+    """
+
+    def __init__(
+        self,
+        api_token: SecretStr,
+        base_url: str,
+        model: str,
+        budget: LLMBudget | None = None,
+    ):
         self.model = model
+        self.budget = budget
         self._chat_model = ChatOpenAI(
             base_url=base_url,
             api_key=api_token,
@@ -62,7 +89,7 @@ class LLMClient:
         )
 
     @classmethod
-    def from_env(cls, model: str | None = None) -> "LLMClient":
+    def from_env(cls, model: str | None = None, budget: LLMBudget | None = None) -> "LLMClient":
         """Construct from environment. Reads LLM_PROVIDER (default: 'ionos') and LLM_MODEL."""
         provider_name = os.environ.get("LLM_PROVIDER", "ionos")
         if provider_name not in PROVIDERS:
@@ -74,16 +101,36 @@ class LLMClient:
             api_token=SecretStr(os.environ[config.api_key_env]),
             base_url=config.base_url,
             model=model or os.environ.get("LLM_MODEL") or config.default_model,
+            budget=budget,
         )
 
+    def admit(self, purpose: str) -> bool:
+        """Whether the run budget admits a ``purpose`` call; records a skip when it does not."""
+        if self.budget is None or self.budget.allows(purpose):
+            return True
+        self.budget.skip(purpose)
+        return False
+
+    def _reserve(self, purpose: str, messages: list[dict[str, str]], max_tokens: int) -> int:
+        """Check the budget before a call. Returns the estimated token cost."""
+        estimate = _estimate_tokens(messages) + max_tokens
+        if self.budget is not None and not self.budget.allows(purpose, estimate):
+            self.budget.skip(purpose)
+            raise BudgetExceeded(f"LLM budget does not allow another {purpose} call")
+        return estimate
+
     def chat(
         self,
         messages: list[dict[str, str]],
         temperature: float = 0.7,
         max_tokens: int = 2048,
+        purpose: str = "generate",
     ) -> dict:
+        estimate = self._reserve(purpose, messages, max_tokens)
         model = self._chat_model.bind(temperature=temperature, max_tokens=max_tokens)
         result = model.invoke(_to_langchain_messages(messages))
+        if self.budget is not None:
+            self.budget.record(_usage_tokens(result, estimate), purpose)
         return {"content": result.content}
 
     def structured_output(
@@ -92,17 +139,27 @@ class LLMClient:
         messages: list[dict[str, str]],
         temperature: float | None = None,
         max_tokens: int | None = None,
+        purpose: str = "generate",
     ) -> BaseModel:
+        estimate = self._reserve(purpose, messages, max_tokens or 2048)
         bind_kwargs: dict[str, float | int] = {}
         if temperature is not None:
             bind_kwargs["temperature"] = temperature
         if max_tokens is not None:
             bind_kwargs["max_tokens"] = max_tokens
-        structured = self._chat_model.with_structured_output(schema)
+        # include_raw keeps the AIMessage so provider token usage can be charged.
+        structured = self._chat_model.with_structured_output(schema, include_raw=True)
         if bind_kwargs:
             structured = structured.bind(**bind_kwargs)
-        result = structured.invoke(_to_langchain_messages(messages))
-        assert isinstance(result, BaseModel)  # narrowing for mypy
+        output = structured.invoke(_to_langchain_messages(messages))
+        assert isinstance(output, dict)  # narrowing for mypy
+        if self.budget is not None:
+            self.budget.record(_usage_tokens(output.get("raw"), estimate), purpose)
+        if output.get("parsing_error") is not None:
+            raise output["parsing_error"]
+        result = output.get("parsed")
+        if not isinstance(result, BaseModel):
+            raise ValueError(f"LLM returned no parseable {schema.__name__}")
         return result
 
     def close(self):
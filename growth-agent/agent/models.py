@@ -12,6 +12,24 @@ class PageMeta(BaseModel):
     url: str
     title: str = ""
     description: str | None = None
+    og: dict[str, str] = Field(default_factory=dict)  # og:* properties, e.g. og:image
+    canonical: str | None = None
+
+
+class PageMetaCacheEntry(BaseModel):
+    """Cached PageMeta with the HTTP validators of the response it came from."""
+
+    meta: PageMeta
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: datetime
+    ttl_seconds: int  # served without any request until fetched_at + ttl_seconds
+
+
+class PageMetaCache(BaseModel):
+    """Page metadata by normalized URL (page_meta_cache.json), shared by plan and insights."""
+
+    entries: dict[str, PageMetaCacheEntry] = Field(default_factory=dict)
 
 
 class SocialMetrics(BaseModel):
@@ -41,6 +59,146 @@ class LLMAnalysis(BaseModel):
     )
 
 
+class LLMAnalysisRecord(LLMAnalysis):
+    """LLMAnalysis as persisted in llm_analysis.json, with run metadata.
+
+    Kept separate from LLMAnalysis so these fields never reach the LLM output schema.
+    """
+
+    prompt_tokens: int | None = None
+    generated_at: datetime | None = None
+    # Input fingerprints let the Monday run reuse this analysis when nothing changed.
+    input_fingerprint: str | None = None
+    context_fingerprint: str | None = None  # same inputs without engagement
+    engagement_totals: dict[str, int] = Field(default_factory=dict)
+    # "refreshed" when written; generate_insights returns "reused" copies on a skip
+    decision: str = "refreshed"
+    decision_reason: str = ""
+
+
+class SitemapEntry(BaseModel):
+    """A <url> (urlset) or <sitemap> (sitemapindex) entry."""
+
+    loc: str
+    lastmod: str | None = None
+
+
+class SitemapFile(BaseModel):
+    """One fetched sitemap document with its HTTP cache validators."""
+
+    kind: Literal["urlset", "sitemapindex"] = "urlset"
+    etag: str | None = None
+    last_modified: str | None = None
+    entries: list[SitemapEntry] = Field(default_factory=list)
+
+
+class SitemapState(BaseModel):
+    """Last fetched sitemap documents by URL, persisted next to registry.json."""
+
+    files: dict[str, SitemapFile] = Field(default_factory=dict)
+    fetched_at: datetime | None = None
+
+
+class RegistryPage(BaseModel):
+    """Persistent per-URL registry record."""
+
+    url: str
+    lastmod: str | None = None  # sitemap <lastmod> when the record was last updated
+    first_seen: datetime
+
+
+class RegistryPages(BaseModel):
+    """All registry records by normalized URL (registry_pages.json)."""
+
+    pages: dict[str, RegistryPage] = Field(default_factory=dict)
+    updated_at: datetime | None = None
+
+
+class LastPublishedEntry(BaseModel):
+    """Publication summary for one page URL."""
+
+    last_published_at: datetime
+    counts: dict[str, int] = Field(default_factory=dict)  # posts per channel
+
+
+class LastPublishedIndex(BaseModel):
+    """Last publication per normalized page URL (last_published.json)."""
+
+    pages: dict[str, LastPublishedEntry] = Field(default_factory=dict)
+    # Number of queue.published entries folded in; a mismatch triggers a rebuild.
+    post_count: int = 0
+    rebuilt_at: datetime | None = None
+
+
+class BlackoutWindow(BaseModel):
+    """Interval [start, end) in which nothing is scheduled."""
+
+    start: datetime
+    end: datetime
+    reason: str = ""
+
+
+class CalendarConfig(BaseModel):
+    """Editable scheduling rules for the planner (the config part of calendar.json)."""
+
+    slot_times: list[str] = Field(default_factory=lambda: ["07:00"])  # UTC "HH:MM", per day
+    channel_daily_capacity: dict[str, int] = Field(default_factory=dict)  # unset: no limit
+    blackouts: list[BlackoutWindow] = Field(default_factory=list)
+
+
+class CalendarBooking(BaseModel):
+    """An occupied slot: a queued draft, approved post or newly planned item."""
+
+    at: datetime
+    channel: str
+    ref: str = ""  # draft ID, or page URL for planned items
+
+
+class CalendarState(BaseModel):
+    """Persisted calendar (calendar.json): config plus upcoming bookings at ``updated_at``.
+
+    Only ``config`` is read back; bookings are rebuilt from the queue on each plan run.
+    """
+
+    config: CalendarConfig = Field(default_factory=CalendarConfig)
+    bookings: list[CalendarBooking] = Field(default_factory=list)
+    updated_at: datetime | None = None
+
+
+class BlueskySession(BaseModel):
+    """Persisted AT Protocol session (bluesky_session.json), reused across runs."""
+
+    handle: str
+    did: str
+    access_jwt: str
+    refresh_jwt: str
+    access_expires_at: datetime | None = None  # from the JWT "exp" claim
+    refresh_expires_at: datetime | None = None
+    updated_at: datetime
+
+
+class ArticleSummary(BaseModel):
+    """LLM summary of one version of an article body."""
+
+    url: str
+    content_hash: str
+    summary: str
+    created_at: datetime
+    last_used_at: datetime
+    # HTTP validators of the fetched page, for conditional re-fetches
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class ArticleSummaryCache(BaseModel):
+    """Article summaries keyed by content hash, with cumulative cache counters."""
+
+    entries: dict[str, ArticleSummary] = Field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
 class Insights(BaseModel):
     """Combined insights from all data sources."""
 
@@ -62,6 +220,8 @@ class Strategy(BaseModel):
         ]
     )
     channels: list[str] = Field(default_factory=lambda: ["mastodon", "bluesky"])
+    # Languages to draft per plan item; ["en", "de"] switches to single-call bilingual drafts
+    draft_languages: list[str] = Field(default_factory=lambda: ["en"])
     tone: str = "insightful, technical, opinionated, accessible"
     target_audience: str = "Tech-curious academics, developers, blockchain enthusiasts"
     website_url: str = "https://fretchen.eu"
@@ -145,6 +305,26 @@ class PostMetrics(BaseModel):
     replies: int = 0
     link_clicks: int | None = None  # future: Umami UTM correlation
     website_referral_sessions: int = 0  # future: Umami UTM correlation
+    # Refresh schedule (see agent.nodes.ingest._schedule_refresh)
+    fetched_at: datetime | None = None
+    last_changed_at: datetime | None = None  # last fetch where any count moved
+    next_refresh_at: datetime | None = None
+    frozen: bool = False  # engagement settled; no longer re-fetched
+
+
+class EngagementPartition(BaseModel):
+    """One month of engagement snapshots (engagement/YYYY-MM.json), stored column-wise.
+
+    Row i is post ``post_ids[post[i]]`` observed at ``ts[i]`` (epoch seconds).
+    """
+
+    month: str
+    post_ids: list[str] = Field(default_factory=list)
+    post: list[int] = Field(default_factory=list)
+    ts: list[int] = Field(default_factory=list)
+    reblogs: list[int] = Field(default_factory=list)
+    favourites: list[int] = Field(default_factory=list)
+    replies: list[int] = Field(default_factory=list)
 
 
 class Performance(BaseModel):
@@ -153,6 +333,42 @@ class Performance(BaseModel):
     posts: list[PostMetrics] = Field(default_factory=list)
 
 
+class EngagementTotals(BaseModel):
+    favourites: int = 0
+    reblogs: int = 0
+    replies: int = 0
+    posts: int = 0
+
+
+class EngagementRollup(BaseModel):
+    """Engagement summed per page, channel and publish week (engagement_rollup.json).
+
+    Kept current by the metrics refresh, which adds each post's change in counts.
+    """
+
+    pages: dict[str, EngagementTotals] = Field(default_factory=dict)  # canonical page URL
+    channels: dict[str, EngagementTotals] = Field(default_factory=dict)
+    weeks: dict[str, EngagementTotals] = Field(default_factory=dict)  # ISO week, "2026-W03"
+    updated_at: datetime | None = None
+    version: int = 0  # ROLLUP_VERSION it was built with; older rollups are rebuilt on read
+
+
+class MastodonTimelineState(BaseModel):
+    """Cursor for the incremental account timeline sync (mastodon_timeline.json)."""
+
+    account_id: str | None = None
+    last_status_id: str | None = None  # newest status seen; the next sync asks for newer ones
+    synced_at: datetime | None = None
+
+
+class BlueskyFeedState(BaseModel):
+    """Cursor for the incremental author-feed sync (bluesky_feed.json)."""
+
+    did: str | None = None
+    last_indexed_at: datetime | None = None  # newest post seen; the next sync stops there
+    synced_at: datetime | None = None
+
+
 class DraftCritique(BaseModel):
     """Structured critique output for self-refine pattern."""
 
@@ -172,3 +388,10 @@ class DraftCritique(BaseModel):
         default="",
         description="Brief suggestion for how to improve the draft, if needed",
     )
+
+
+class BilingualDraftCritique(BaseModel):
+    """Batched critique of the English and German variants of one post."""
+
+    en: DraftCritique = Field(description="Critique of the English post")
+    de: DraftCritique = Field(description="Critique of the German post")
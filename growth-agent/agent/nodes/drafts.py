@@ -1,14 +1,25 @@
 """Drafts node — LLM-based social media draft generation."""
 
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 from pydantic import BaseModel, Field
 
+from agent.budget import BudgetExceeded, LLMBudget
 from agent.llm_client import LLMClient
-from agent.models import ContentPlan, ContentQueue, Draft, DraftCritique, Strategy
+from agent.models import (
+    BilingualDraftCritique,
+    ContentPlan,
+    ContentPlanItem,
+    ContentQueue,
+    Draft,
+    DraftCritique,
+    Strategy,
+)
 from agent.state import AgentState
 from agent.storage import load_model
+from agent.summaries import ArticleSummaryStore
 from agent.utils import normalize_url as _normalize_url
 
 logger = logging.getLogger("growth-agent")
@@ -19,6 +30,9 @@ CHANNEL_CONFIG = {
     "bluesky": {"max_tokens": 200},
 }
 
+# Language pair generated in a single structured call when strategy.draft_languages matches
+BILINGUAL_LANGUAGES = ["en", "de"]
+
 
 class MastodonDraftOutput(BaseModel):
     """Structured Mastodon draft output with explicit hashtag list."""
@@ -30,6 +44,39 @@ class MastodonDraftOutput(BaseModel):
     )
 
 
+class BilingualDraftOutput(BaseModel):
+    """Structured output holding the English and German variant of one post."""
+
+    en: MastodonDraftOutput = Field(description="English post")
+    de: MastodonDraftOutput = Field(description="German post (du-form)")
+
+
+@dataclass
+class _DraftCandidate:
+    """A generated post variant travelling through critique and refinement."""
+
+    item: ContentPlanItem
+    language: str
+    content: str
+    critique: DraftCritique | None  # None when the critique was skipped for budget
+    hashtags: list[str] = field(default_factory=list)
+    quality_score: int | None = None
+    quality_issues: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.critique is not None:
+            self.quality_score = self.critique.overall_score
+            self.quality_issues = self.critique.issues
+
+    @property
+    def needs_refinement(self) -> bool:
+        return (
+            self.critique is not None
+            and self.critique.overall_score < 70
+            and bool(self.critique.issues)
+        )
+
+
 def drafts_node(state: AgentState) -> dict:
     """LangGraph node: generate draft posts from the content plan."""
     storage = state["storage"]
@@ -38,7 +85,7 @@ def drafts_node(state: AgentState) -> dict:
         if not plan.items:
             logger.info("Content plan is empty — skipping draft creation")
             return {"drafts_created": 0}
-        count = create_drafts(storage, plan)
+        count = create_drafts(storage, plan, budget=state.get("llm_budget"))
         return {"drafts_created": count}
     except Exception:
         logger.exception("Draft pipeline refill failed")
@@ -72,16 +119,46 @@ Rules: do not reuse the same opening hook or the exact same claim framing from t
 ------------------------------------------"""
 
 
-def _mastodon_prompt(item, language: str, strategy: Strategy, former_context: str = "") -> str:
+def _article_summary_block(article_summary: str, language: str) -> str:
+    """Cached article summary line for the prompt. Empty when no summary is available."""
+    if not article_summary:
+        return ""
+    label = "Inhalt des Artikels (englische Zusammenfassung)" if language == "de" else "Key points"
+    return f"{label}: {article_summary}\n"
+
+
+_OUTPUT_RULES = {
+    "de": "Gib NUR den Post-Text zurück, nichts anderes.",
+    "en": "Return ONLY the post text, nothing else.",
+}
+
+
+def _output_rule(language: str, plain_text: bool) -> str:
+    """Closing output instruction of a single-post prompt; empty for structured output."""
+    if not plain_text:
+        return ""
+    return _OUTPUT_RULES["de" if language == "de" else "en"]
+
+
+def _mastodon_prompt(
+    item,
+    language: str,
+    strategy: Strategy,
+    former_context: str = "",
+    article_summary: str = "",
+    plain_text: bool = True,
+) -> str:
+    output_rule = _output_rule(language, plain_text)
     url = f"{item.page_url}?utm_source=mastodon&utm_campaign=growth-agent"
     history_block = _former_context_block(former_context)
+    summary_block = _article_summary_block(article_summary, language)
     if language == "de":
         return f"""Schreibe einen Mastodon-Post (max 500 Zeichen) über diesen Blog-Artikel:
 
 URL: {url}
 Titel: {item.page_title}
 Zusammenfassung: {item.page_description}
-{history_block}
+{summary_block}{history_block}
 Anforderungen:
 - Hook im ersten Satz (Frage oder starke These)
 - Ein konkretes Insight aus dem Artikel erwähnen
@@ -90,7 +167,7 @@ Anforderungen:
 - Duzen, nicht Siezen
 - Ton: {strategy.tone}
 
-Gib NUR den Post-Text zurück, nichts anderes."""
+{output_rule}"""
 
     pillars = ", ".join(strategy.content_pillars)
     return f"""Write a Mastodon post (max 500 characters) about this blog article:
@@ -98,7 +175,7 @@ Gib NUR den Post-Text zurück, nichts anderes."""
 URL: {url}
 Title: {item.page_title}
 Article summary: {item.page_description}
-{history_block}
+{summary_block}{history_block}
 Context: {strategy.website_url} covers {pillars}.
 Target audience: {strategy.target_audience}
 
@@ -110,33 +187,42 @@ Requirements:
 - Tone: {strategy.tone}
 
 Do NOT use emojis excessively. One is fine.
-Return ONLY the post text, nothing else."""
+{output_rule}"""
 
 
-def _bluesky_prompt(item, language: str, strategy: Strategy, former_context: str = "") -> str:
+def _bluesky_prompt(
+    item,
+    language: str,
+    strategy: Strategy,
+    former_context: str = "",
+    article_summary: str = "",
+    plain_text: bool = True,
+) -> str:
+    output_rule = _output_rule(language, plain_text)
     url = f"{item.page_url}?utm_source=bluesky&utm_campaign=growth-agent"
     history_block = _former_context_block(former_context)
+    summary_block = _article_summary_block(article_summary, language)
     if language == "de":
         return f"""Schreibe einen Bluesky-Post (max 300 Zeichen) über diesen Blog-Artikel:
 
 URL: {url}
 Titel: {item.page_title}
 Zusammenfassung: {item.page_description}
-{history_block}
+{summary_block}{history_block}
 Anforderungen:
 - Knackiger Hook
 - Link einbinden
 - Keine Hashtags (Bluesky-Kultur)
 - Ton: {strategy.tone}
 
-Gib NUR den Post-Text zurück, nichts anderes."""
+{output_rule}"""
 
     return f"""Write a Bluesky post (max 300 characters) about this blog article:
 
 URL: {url}
 Title: {item.page_title}
 Article summary: {item.page_description}
-{history_block}
+{summary_block}{history_block}
 Target audience: {strategy.target_audience}
 
 Requirements:
@@ -145,7 +231,7 @@ Requirements:
 - No hashtags (Bluesky culture)
 - Tone: {strategy.tone}
 
-Return ONLY the post text, nothing else."""
+{output_rule}"""
 
 
 def _critique_prompt(draft_content: str, channel: str, strategy: Strategy) -> str:
@@ -176,11 +262,54 @@ Evaluate:
 Provide an overall quality score (0-100) and list any specific issues."""
 
 
+def _bilingual_prompt(
+    item, channel: str, strategy: Strategy, former_context: str = "", article_summary: str = ""
+) -> str:
+    """Combine the English and German channel prompts into one two-variant request.
+
+    The per-language blocks leave out their plain-text output rule, so the JSON
+    instruction at the end is the only output format the model is given.
+    """
+    prompt_fn = {"mastodon": _mastodon_prompt, "bluesky": _bluesky_prompt}[channel]
+    hashtag_rule = (
+        "Include hashtags both in content and in hashtags list."
+        if channel == "mastodon"
+        else "Leave hashtags empty."
+    )
+    return f"""Write two variants of the same {channel} post: one in English, one in German.
+Both variants promote the same article but should read as native posts, not translations.
+
+=== ENGLISH VARIANT (key: en) ===
+{prompt_fn(item, "en", strategy, former_context, article_summary, plain_text=False).rstrip()}
+
+=== GERMAN VARIANT (key: de) ===
+{prompt_fn(item, "de", strategy, former_context, article_summary, plain_text=False).rstrip()}
+
+Return JSON with keys en and de, each an object with keys content, hashtags. {hashtag_rule}"""
+
+
+def _bilingual_critique_prompt(variants: dict[str, str], channel: str, strategy: Strategy) -> str:
+    """Critique prompt covering both language variants in one structured call."""
+    return f"""{_critique_prompt(variants["en"], channel, strategy)}
+
+Apply the same evaluation separately to the German variant of the post:
+---
+{variants["de"]}
+---
+
+Return one critique per language under the keys en and de."""
+
+
 def _refine_prompt(
-    original_draft: str, critique: DraftCritique, channel: str, strategy: Strategy
+    original_draft: str,
+    critique: DraftCritique,
+    channel: str,
+    strategy: Strategy,
+    language: str = "en",
 ) -> str:
     """Generate a refinement prompt based on critique feedback."""
     issues_str = ", ".join(critique.issues) if critique.issues else "minor improvements needed"
+    language_rule = "\n- Keep the post in German (du-form)" if language == "de" else ""
     return f"""Improve this {channel} post based on the critique.
 
 Original post:
@@ -193,7 +322,7 @@ Suggestion: {critique.suggested_improvement}
 
 Requirements:
 - Fix the identified issues
-- Keep the same link and core message
+- Keep the same link and core message{language_rule}
 - Target audience: {strategy.target_audience}
 - Tone: {strategy.tone}
 - {"Max 500 chars, 2-3 hashtags" if channel == "mastodon" else "Max 300 chars, NO hashtags"}
@@ -275,8 +404,10 @@ def _refine_mastodon_draft_structured(
     critique: DraftCritique,
     strategy: Strategy,
     max_tokens: int,
+    language: str = "en",
 ) -> MastodonDraftOutput | None:
     """Refine Mastodon draft and keep explicit hashtag list."""
+    refine_prompt = _refine_prompt(original, critique, "mastodon", strategy, language)
     try:
         result = llm.structured_output(
             schema=MastodonDraftOutput,
@@ -285,13 +416,14 @@ def _refine_mastodon_draft_structured(
                 {
                     "role": "user",
                     "content": (
-                        f"{_refine_prompt(original, critique, 'mastodon', strategy)}\n\n"
+                        f"{refine_prompt}\n\n"
                         "Return JSON with keys: content, hashtags. "
                         "Include hashtags both in content and in hashtags list."
                     ),
                 },
             ],
             max_tokens=max_tokens,
+            purpose="refine",
         )
         assert isinstance(result, MastodonDraftOutput)
         result.hashtags = _normalize_hashtags(result.hashtags)
@@ -301,19 +433,192 @@ def _refine_mastodon_draft_structured(
         return None
 
 
-def create_drafts(storage, plan: ContentPlan) -> int:
+def _generate_single_variant(
+    llm: LLMClient,
+    item: ContentPlanItem,
+    language: str,
+    strategy: Strategy,
+    former_context: str,
+    max_tokens: int,
+    article_summary: str = "",
+) -> _DraftCandidate:
+    """Generate and critique one post variant in a single language."""
+    channel = item.channel
+    prompt_fn = {"mastodon": _mastodon_prompt, "bluesky": _bluesky_prompt}[channel]
+    prompt = prompt_fn(item, language, strategy, former_context, article_summary)
+    draft_hashtags: list[str] = []
+
+    if channel == "mastodon":
+        generated = _generate_mastodon_draft_structured(
+            llm,
+            prompt,
+            strategy,
+            max_tokens,
+        )
+        draft_content = generated.content.strip()
+        draft_hashtags = generated.hashtags
+    else:
+        result = llm.chat(
+            messages=[
+                {"role": "system", "content": _system_prompt(strategy)},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.8,
+            max_tokens=max_tokens,
+        )
+        draft_content = result["content"].strip()
+
+    critique = _critique_draft(llm, draft_content, channel, strategy)
+    return _DraftCandidate(
+        item=item,
+        language=language,
+        content=draft_content,
+        critique=critique,
+        hashtags=draft_hashtags,
+    )
+
+
+def _generate_bilingual_variants(
+    llm: LLMClient,
+    item: ContentPlanItem,
+    strategy: Strategy,
+    former_context: str,
+    max_tokens: int,
+    article_summary: str = "",
+) -> list[_DraftCandidate]:
+    """Generate en+de variants in one structured call and critique both in one more."""
+    channel = item.channel
+    result = llm.structured_output(
+        schema=BilingualDraftOutput,
+        messages=[
+            {"role": "system", "content": _system_prompt(strategy)},
+            {
+                "role": "user",
+                "content": _bilingual_prompt(
+                    item, channel, strategy, former_context, article_summary
+                ),
+            },
+        ],
+        max_tokens=max_tokens * len(BILINGUAL_LANGUAGES),
+    )
+    assert isinstance(result, BilingualDraftOutput)
+
+    variants = {"en": result.en, "de": result.de}
+    contents = {lang: v.content.strip() for lang, v in variants.items()}
+    critiques = _critique_bilingual(llm, contents, channel, strategy)
+    return [
+        _DraftCandidate(
+            item=item,
+            language=lang,
+            content=contents[lang],
+            critique=critiques.get(lang),
+            # Bluesky posts carry no hashtags, even if the model returned some.
+            hashtags=_normalize_hashtags(variants[lang].hashtags) if channel == "mastodon" else [],
+        )
+        for lang in BILINGUAL_LANGUAGES
+    ]
+
+
+def _self_refine(
+    llm: LLMClient,
+    candidate: _DraftCandidate,
+    strategy: Strategy,
+) -> None:
+    """Refine a weak candidate in place, updating its content and quality fields.
+
+    Refinement and the follow-up re-critique are optional work: each is skipped
+    when the run budget no longer admits it, keeping the last known score.
+    """
+    item = candidate.item
+    channel = item.channel
+    critique = candidate.critique
+    if critique is None or not candidate.needs_refinement or not llm.admit("refine"):
+        return
+
+    logger.info(
+        "Draft for %s [%s] scored %d, refining (issues: %s)",
+        item.page_title,
+        candidate.language,
+        critique.overall_score,
+        critique.issues,
+    )
+    max_tokens = CHANNEL_CONFIG[channel]["max_tokens"]
+    refined_applied = False
+    if channel == "mastodon":
+        refined = _refine_mastodon_draft_structured(
+            llm, candidate.content, critique, strategy, max_tokens, candidate.language
+        )
+        if refined:
+            candidate.content = refined.content.strip()
+            candidate.hashtags = refined.hashtags
+            refined_applied = True
+    else:
+        refined_content = _refine_draft(
+            llm,
+            candidate.content,
+            critique,
+            channel,
+            strategy,
+            max_tokens,
+            candidate.language,
+        )
+        if refined_content:
+            candidate.content = refined_content
+            refined_applied = True
+
+    if refined_applied:
+        # Re-critique to get updated score
+        new_critique = _critique_draft(
+            llm, candidate.content, channel, strategy, purpose="recritique"
+        )
+        if new_critique is not None:
+            candidate.quality_score = new_critique.overall_score
+            candidate.quality_issues = new_critique.issues
+        logger.info(
+            "Refined draft for %s [%s], new score: %s",
+            item.page_title,
+            candidate.language,
+            candidate.quality_score,
+        )
+
+
+def create_drafts(storage, plan: ContentPlan, budget: LLMBudget | None = None) -> int:
     """Generate social media draft posts from a content plan. Returns count.
 
     Uses Self-Refine pattern: generate → critique → refine (max 1 iteration).
+
+    One draft is created per plan item and language in ``strategy.draft_languages``.
+    For the en+de pair, both variants come from one structured call and are critiqued
+    together; only refinement of weak variants runs per language.
+
+    With a run budget, first-pass generation for every plan item runs before any
+    refinement, and refinements go to the weakest drafts first.
+
+    Prompts include a cached summary of the article body (see agent.summaries) when
+    one exists or the budget allows creating it; otherwise only the meta description.
+    New summaries are capped at their PURPOSE_SHARES sub-budget, so they cannot eat
+    into what first-pass generation needs.
     """
     strategy = load_model(storage, "strategy.json", Strategy)
     queue = load_model(storage, "content_queue.json", ContentQueue)
+    languages = [lang for lang in strategy.draft_languages if lang] or ["en"]
+    bilingual = languages == BILINGUAL_LANGUAGES
 
-    llm = LLMClient.from_env()
-    new_drafts: list[Draft] = []
-    draft_index = 0
+    llm = LLMClient.from_env(budget=budget)
+    candidates: list[_DraftCandidate] = []
+    summaries = ArticleSummaryStore(storage)
+    article_summaries: dict[str, str] = {}
 
     try:
+        try:
+            article_summaries = summaries.summarize_pages(
+                llm,
+                [(i.page_url, i.page_title) for i in plan.items if i.channel in CHANNEL_CONFIG],
+            )
+        except Exception:
+            logger.exception("Article summaries unavailable — using meta descriptions")
+
+        # Pass 1: generate + critique a first draft for every plan item.
         for item in plan.items:
             channel = item.channel
             if channel not in CHANNEL_CONFIG:
@@ -323,101 +628,65 @@ def create_drafts(storage, plan: ContentPlan) -> int:
                     item.page_title,
                 )
                 continue
-            config = CHANNEL_CONFIG[channel]
-            prompt_fn = {"mastodon": _mastodon_prompt, "bluesky": _bluesky_prompt}[channel]
             former_context = _former_posts_context(queue, item.page_url, channel)
-            prompt = prompt_fn(item, "en", strategy, former_context)
-            max_tokens = config["max_tokens"]
-            draft_hashtags: list[str] = []
-
-            # Step 1: Generate initial draft
-            if channel == "mastodon":
-                generated = _generate_mastodon_draft_structured(
-                    llm,
-                    prompt,
-                    strategy,
-                    max_tokens,
-                )
-                draft_content = generated.content.strip()
-                draft_hashtags = generated.hashtags
-            else:
-                result = llm.chat(
-                    messages=[
-                        {"role": "system", "content": _system_prompt(strategy)},
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0.8,
-                    max_tokens=max_tokens,
-                )
-                draft_content = result["content"].strip()
-
-            # Step 2: Self-critique
-            critique = _critique_draft(llm, draft_content, channel, strategy)
-
-            # Step 3: Refine if quality is below threshold
-            quality_score = critique.overall_score
-            quality_issues = critique.issues
-
-            if critique.overall_score < 70 and critique.issues:
-                logger.info(
-                    "Draft for %s scored %d, refining (issues: %s)",
-                    item.page_title,
-                    critique.overall_score,
-                    critique.issues,
-                )
-                refined_applied = False
-                if channel == "mastodon":
-                    refined = _refine_mastodon_draft_structured(
-                        llm, draft_content, critique, strategy, max_tokens
+            article_summary = article_summaries.get(item.page_url, "")
+            max_tokens = CHANNEL_CONFIG[channel]["max_tokens"]
+
+            try:
+                if bilingual:
+                    candidates.extend(
+                        _generate_bilingual_variants(
+                            llm, item, strategy, former_context, max_tokens, article_summary
+                        )
                     )
-                    if refined:
-                        draft_content = refined.content.strip()
-                        draft_hashtags = refined.hashtags
-                        refined_applied = True
                 else:
-                    refined_content = _refine_draft(
-                        llm,
-                        draft_content,
-                        critique,
-                        channel,
-                        strategy,
-                        max_tokens,
-                    )
-                    if refined_content:
-                        draft_content = refined_content
-                        refined_applied = True
-
-                if refined_applied:
-                    # Re-critique to get updated score
-                    new_critique = _critique_draft(llm, draft_content, channel, strategy)
-                    quality_score = new_critique.overall_score
-                    quality_issues = new_critique.issues
-                    logger.info(
-                        "Refined draft for %s, new score: %d",
-                        item.page_title,
-                        quality_score,
-                    )
-
-            new_drafts.append(
-                Draft(
-                    id=_make_draft_id(channel, "en", draft_index),
-                    channel=channel,
-                    language="en",
-                    content=draft_content,
-                    source_blog_post=item.page_title,
-                    hashtags=draft_hashtags,
-                    link=f"{item.page_url}?utm_source={channel}&utm_campaign=growth-agent",
-                    scheduled_at=item.scheduled_at,
-                    quality_score=quality_score,
-                    quality_issues=quality_issues,
-                )
-            )
-            draft_index += 1
+                    for language in languages:
+                        candidates.append(
+                            _generate_single_variant(
+                                llm,
+                                item,
+                                language,
+                                strategy,
+                                former_context,
+                                max_tokens,
+                                article_summary,
+                            )
+                        )
+            except BudgetExceeded:
+                logger.warning("LLM budget exhausted — no further first drafts this run")
+                break
+
+        # Pass 2: refine weak drafts, weakest first, while the budget allows.
+        weakest_first = sorted(
+            (c for c in candidates if c.needs_refinement),
+            key=lambda c: c.critique.overall_score if c.critique else 0,
+        )
+        for candidate in weakest_first:
+            _self_refine(llm, candidate, strategy)
 
     except Exception:
         logger.exception("Draft creation failed")
     finally:
         llm.close()
+        summaries.save()
+
+    new_drafts: list[Draft] = []
+    for draft_index, candidate in enumerate(candidates):
+        channel = candidate.item.channel
+        new_drafts.append(
+            Draft(
+                id=_make_draft_id(channel, candidate.language, draft_index),
+                channel=channel,
+                language=candidate.language,
+                content=candidate.content,
+                source_blog_post=candidate.item.page_title,
+                hashtags=candidate.hashtags,
+                link=f"{candidate.item.page_url}?utm_source={channel}&utm_campaign=growth-agent",
+                scheduled_at=candidate.item.scheduled_at,
+                quality_score=candidate.quality_score,
+                quality_issues=candidate.quality_issues,
+            )
+        )
 
     queue.drafts.extend(new_drafts)
     storage.write("content_queue.json", queue)
@@ -426,9 +695,15 @@ def create_drafts(storage, plan: ContentPlan) -> int:
 
 
 def _critique_draft(
-    llm: LLMClient, content: str, channel: str, strategy: Strategy
-) -> DraftCritique:
-    """Critique a draft using structured output."""
+    llm: LLMClient,
+    content: str,
+    channel: str,
+    strategy: Strategy,
+    purpose: str = "critique",
+) -> DraftCritique | None:
+    """Critique a draft using structured output. Returns None when the budget skips it."""
+    if not llm.admit(purpose):
+        return None
     try:
         critique = llm.structured_output(
             schema=DraftCritique,
@@ -443,21 +718,60 @@ def _critique_draft(
                     "content": _critique_prompt(content, channel, strategy),
                 },
             ],
+            purpose=purpose,
         )
         assert isinstance(critique, DraftCritique)
         return critique
+    except BudgetExceeded:
+        return None
     except Exception:
         logger.exception("Draft critique failed, using default")
-        return DraftCritique(
-            has_strong_hook=True,
-            follows_platform_conventions=True,
-            mentions_specific_insight=True,
-            includes_link=True,
-            appropriate_tone=True,
-            overall_score=70,
-            issues=[],
-            suggested_improvement="",
+        return _default_critique()
+
+
+def _default_critique() -> DraftCritique:
+    """Neutral passing critique used when the critique call itself fails."""
+    return DraftCritique(
+        has_strong_hook=True,
+        follows_platform_conventions=True,
+        mentions_specific_insight=True,
+        includes_link=True,
+        appropriate_tone=True,
+        overall_score=70,
+        issues=[],
+        suggested_improvement="",
+    )
+
+
+def _critique_bilingual(
+    llm: LLMClient, variants: dict[str, str], channel: str, strategy: Strategy
+) -> dict[str, DraftCritique]:
+    """Critique both language variants in one structured call. Empty when budget skips it."""
+    if not llm.admit("critique"):
+        return {}
+    try:
+        critique = llm.structured_output(
+            schema=BilingualDraftCritique,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a social media quality reviewer. "
+                    "Be constructive but honest.",
+                },
+                {
+                    "role": "user",
+                    "content": _bilingual_critique_prompt(variants, channel, strategy),
+                },
+            ],
+            purpose="critique",
         )
+        assert isinstance(critique, BilingualDraftCritique)
+        return {"en": critique.en, "de": critique.de}
+    except BudgetExceeded:
+        return {}
+    except Exception:
+        logger.exception("Bilingual draft critique failed, using default")
+        return {lang: _default_critique() for lang in BILINGUAL_LANGUAGES}
 
 
 def _refine_draft(
@@ -467,6 +781,7 @@ def _refine_draft(
     channel: str,
     strategy: Strategy,
     max_tokens: int,
+    language: str = "en",
 ) -> str | None:
     """Refine a draft based on critique feedback. Returns None on failure."""
     try:
@@ -475,11 +790,12 @@ def _refine_draft(
                 {"role": "system", "content": _system_prompt(strategy)},
                 {
                     "role": "user",
-                    "content": _refine_prompt(original, critique, channel, strategy),
+                    "content": _refine_prompt(original, critique, channel, strategy, language),
                 },
             ],
             temperature=0.7,
             max_tokens=max_tokens,
+            purpose="refine",
         )
         return result["content"].strip()
     except Exception:
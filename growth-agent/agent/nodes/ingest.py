@@ -1,20 +1,25 @@
 """Ingest node — fetches social media metrics."""
 
 import logging
-import os
+import statistics
+import time
 from datetime import datetime, timedelta, timezone
 
+from agent.engagement_rollup import ROLLUP_KEY, apply_refresh, checked_rollup
+from agent.engagement_series import EngagementSeries
 from agent.models import (
     ContentQueue,
+    Draft,
     Insights,
     Performance,
     PostMetrics,
     SocialMetrics,
 )
-from agent.platforms.bluesky import BlueskyClient
 from agent.platforms.mastodon import MastodonClient
+from agent.platforms.pool import ClientPool, borrowed_pool
 from agent.state import AgentState
 from agent.storage import load_model
+from agent.timeline_sync import sync_bluesky_feed, sync_mastodon_timeline
 
 logger = logging.getLogger("growth-agent")
 
@@ -22,140 +27,298 @@ logger = logging.getLogger("growth-agent")
 def ingest_node(state: AgentState) -> dict:
     """LangGraph node: ingest analytics, update state."""
     try:
-        ingest_analytics(state["storage"])
+        ingest_analytics(state["storage"], clients=state.get("clients"))
         return {"analytics_ok": True}
     except Exception:
         logger.exception("Analytics ingest failed")
         return {"analytics_ok": False}
 
 
-def ingest_analytics(storage) -> Insights:
+def ingest_analytics(storage, clients: ClientPool | None = None) -> Insights:
     """Fetch social metrics and per-post engagement, write to insights.json."""
     insights = load_model(storage, "insights.json", Insights)
 
-    # Mastodon metrics
-    try:
-        with MastodonClient(
-            instance=os.environ.get("MASTODON_INSTANCE", "https://mastodon.social"),
-            access_token=os.environ["MASTODON_ACCESS_TOKEN"],
-        ) as masto:
-            creds = masto.verify_credentials()
+    with borrowed_pool(clients, storage) as pool:
+        # Mastodon metrics
+        account_id = None
+        try:
+            creds = pool.mastodon().verify_credentials()
             insights.social_metrics["mastodon"] = SocialMetrics(
                 followers=creds.get("followers_count", 0),
             )
-    except Exception:
-        logger.exception("Mastodon metrics failed")
+            account_id = creds.get("id")
+        except Exception:
+            logger.exception("Mastodon metrics failed")
 
-    # Bluesky metrics
-    try:
-        with BlueskyClient(
-            handle=os.environ.get("BLUESKY_HANDLE", "fretchen.eu"),
-            app_password=os.environ["BLUESKY_APP_PASSWORD"],
-        ) as bsky:
-            profile = bsky.get_profile()
+        # Bluesky metrics
+        did = None
+        try:
+            profile = pool.bluesky().get_profile()
             insights.social_metrics["bluesky"] = SocialMetrics(
                 followers=profile.get("followersCount", 0),
             )
-    except Exception:
-        logger.exception("Bluesky metrics failed")
+            did = profile.get("did")
+        except Exception:
+            logger.exception("Bluesky metrics failed")
+
+        storage.write("insights.json", insights)
+        logger.info("Analytics ingested")
 
-    storage.write("insights.json", insights)
-    logger.info("Analytics ingested")
+        # New statuses from the account timeline: backfills platform_ids, carries counts
+        timeline: dict[str, dict] = {}
+        if isinstance(account_id, str):
+            try:
+                timeline = sync_mastodon_timeline(storage, pool.mastodon(), account_id)
+            except Exception:
+                logger.exception("Mastodon timeline sync failed")
+
+        # Same for new posts in the Bluesky author feed
+        feed: dict[str, dict] = {}
+        if isinstance(did, str):
+            try:
+                feed = sync_bluesky_feed(storage, pool.bluesky(), did)
+            except Exception:
+                logger.exception("Bluesky feed sync failed")
 
-    # Per-post engagement metrics
-    _collect_post_metrics(storage)
+        # Per-post engagement metrics
+        _collect_post_metrics(storage, clients=pool, mastodon_statuses=timeline, bluesky_posts=feed)
 
     return insights
 
 
-_METRICS_REFRESH_DAYS = 30  # only re-fetch engagement for posts published within this window
+# Metrics refresh tiers by post age: hourly on day 1, daily in week 1, weekly after.
+# A post older than a week whose counts have not moved for METRICS_FREEZE_DAYS is frozen.
+METRICS_REFRESH_TIERS = [
+    (timedelta(days=1), timedelta(hours=1)),
+    (timedelta(days=7), timedelta(days=1)),
+]
+METRICS_REFRESH_SLOW = timedelta(days=7)
+METRICS_FREEZE_DAYS = 14
+# Stored metrics from before the schedule existed are only refreshed within this window.
+_METRICS_REFRESH_DAYS = 30
+
+
+def _refresh_interval(age: timedelta, since_change: timedelta) -> timedelta | None:
+    """Time until the next refresh, or None once the post should be frozen."""
+    for max_age, interval in METRICS_REFRESH_TIERS:
+        if age < max_age:
+            return interval
+    if since_change >= timedelta(days=METRICS_FREEZE_DAYS):
+        return None
+    return METRICS_REFRESH_SLOW
+
+
+def _is_due(draft: Draft, metrics: PostMetrics | None, now: datetime) -> bool:
+    if metrics is None:
+        return True
+    if metrics.frozen:
+        return False
+    if metrics.next_refresh_at is None:  # legacy entry without a schedule
+        assert draft.published_at is not None
+        return now - draft.published_at < timedelta(days=_METRICS_REFRESH_DAYS)
+    return metrics.next_refresh_at <= now
+
+
+def _schedule_refresh(
+    draft: Draft,
+    previous: PostMetrics | None,
+    reblogs: int,
+    favourites: int,
+    replies: int,
+    now: datetime,
+) -> PostMetrics:
+    """Freshly fetched metrics for ``draft`` with change tracking and the next refresh time."""
+    last_changed_at = now
+    if previous is not None and previous.last_changed_at is not None:
+        unchanged = (reblogs, favourites, replies) == (
+            previous.reblogs,
+            previous.favourites,
+            previous.replies,
+        )
+        if unchanged:
+            last_changed_at = previous.last_changed_at
+    assert draft.published_at is not None
+    interval = _refresh_interval(now - draft.published_at, now - last_changed_at)
+    return PostMetrics(
+        id=draft.id,
+        channel=draft.channel,
+        published_at=draft.published_at.isoformat(),
+        platform_id=draft.platform_id,
+        reblogs=reblogs,
+        favourites=favourites,
+        replies=replies,
+        link_clicks=previous.link_clicks if previous else None,
+        website_referral_sessions=previous.website_referral_sessions if previous else 0,
+        fetched_at=now,
+        last_changed_at=last_changed_at,
+        next_refresh_at=now + interval if interval else None,
+        frozen=interval is None,
+    )
+
+
+def _latency_stats(latencies: list[float]) -> str:
+    """Compact ms summary for the run log: n, p50, p95, max."""
+    ordered = sorted(latencies)
+    if not ordered:
+        return "n=0"
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return (
+        f"n={len(ordered)} p50={statistics.median(ordered) * 1000:.0f}ms "
+        f"p95={p95 * 1000:.0f}ms max={ordered[-1] * 1000:.0f}ms"
+    )
+
 
+def _fetch_mastodon_statuses(
+    masto: MastodonClient, drafts: list[Draft], known: dict[str, dict] | None = None
+) -> dict[str, dict]:
+    """Fetch statuses in bulk, returning {draft id: status} for those that succeeded.
 
-def _collect_post_metrics(storage) -> None:
+    Statuses in ``known`` (by status id, e.g. from the timeline sync) are not fetched
+    again. A status that fails or is gone is skipped without affecting the others.
+    """
+    started = time.perf_counter()
+    # A pooled client has already made other reads (credentials, timeline) this run.
+    first_request = len(masto.request_latencies)
+    known = known or {}
+    missing = [d.platform_id for d in drafts if d.platform_id and d.platform_id not in known]
+    by_status_id = {**masto.get_statuses(missing), **known} if missing else dict(known)
+    statuses = {d.id: by_status_id[d.platform_id] for d in drafts if d.platform_id in by_status_id}
+    latencies = masto.request_latencies[first_request:]
+    logger.info(
+        "Mastodon status fetch: %d/%d ok (%d from timeline), %d requests in %.0fms (%s)",
+        len(statuses),
+        len(drafts),
+        sum(1 for d in drafts if d.platform_id in known),
+        len(latencies),
+        (time.perf_counter() - started) * 1000,
+        _latency_stats(latencies),
+    )
+    return statuses
+
+
+def _append_engagement_snapshots(storage, refreshed: list[PostMetrics], now: datetime) -> None:
+    """Append the counts fetched this run to the engagement series; never fails the run."""
+    try:
+        series = EngagementSeries(storage)
+        for metrics in refreshed:
+            series.append(metrics.id, now, metrics.reblogs, metrics.favourites, metrics.replies)
+        series.save()
+    except Exception:
+        logger.exception("Engagement series append failed")
+
+
+def _update_engagement_rollup(
+    storage,
+    queue: ContentQueue,
+    existing: Performance,
+    existing_by_id: dict[str, PostMetrics],
+    refreshed: list[tuple[Draft, PostMetrics]],
+    now: datetime,
+) -> None:
+    """Add the refreshed posts' changes to engagement_rollup.json.
+
+    The stored rollup is checked against the pre-refresh ``existing`` metrics first
+    and rebuilt from them if it is missing or has drifted.
+    """
+    try:
+        rollup, _ = checked_rollup(storage, existing, queue)
+        for draft, metrics in refreshed:
+            apply_refresh(rollup, draft, metrics, existing_by_id.get(draft.id))
+        rollup.updated_at = now
+        storage.write(ROLLUP_KEY, rollup)
+    except Exception:
+        logger.exception("Engagement rollup update failed")
+
+
+def _collect_post_metrics(
+    storage,
+    clients: ClientPool | None = None,
+    mastodon_statuses: dict[str, dict] | None = None,
+    bluesky_posts: dict[str, dict] | None = None,
+) -> None:
     """Fetch per-post engagement counts from Mastodon and Bluesky, write performance.json.
 
-    Merges with existing performance.json — posts outside the refresh window are preserved
-    unchanged; only posts published within the last _METRICS_REFRESH_DAYS are re-fetched.
+    Merges with existing performance.json, appends the fresh counts to the
+    engagement time series (agent.engagement_series) and folds their changes into
+    the engagement rollup (agent.engagement_rollup). Only posts whose refresh is
+    due are re-fetched (see _refresh_interval); all others, and posts whose fetch
+    fails, keep their stored metrics. ``mastodon_statuses`` ({status id: status},
+    e.g. from the timeline sync) and ``bluesky_posts`` ({AT URI: post}, from the feed
+    sync) are used instead of fetching those posts again.
     """
     try:
         queue = load_model(storage, "content_queue.json", ContentQueue)
         existing = load_model(storage, "performance.json", Performance)
 
         existing_by_id: dict[str, PostMetrics] = {p.id: p for p in existing.posts}
-        cutoff = datetime.now(timezone.utc) - timedelta(days=_METRICS_REFRESH_DAYS)
-        published = queue.published
-
-        recent_mastodon = [
+        now = datetime.now(timezone.utc)
+        due = [
             d
-            for d in published
-            if d.channel == "mastodon"
-            and d.platform_id
+            for d in queue.published
+            if d.platform_id
             and d.published_at is not None
-            and d.published_at >= cutoff
-        ]
-        recent_bluesky = [
-            d
-            for d in published
-            if d.channel == "bluesky"
-            and d.platform_id
-            and d.published_at is not None
-            and d.published_at >= cutoff
+            and _is_due(d, existing_by_id.get(d.id), now)
         ]
+        due_mastodon = [d for d in due if d.channel == "mastodon"]
+        due_bluesky = [d for d in due if d.channel == "bluesky"]
 
         updated: dict[str, PostMetrics] = dict(existing_by_id)
 
-        if recent_mastodon:
+        if due_mastodon:
             try:
-                with MastodonClient(
-                    instance=os.environ.get("MASTODON_INSTANCE", "https://mastodon.social"),
-                    access_token=os.environ["MASTODON_ACCESS_TOKEN"],
-                ) as masto:
-                    for draft in recent_mastodon:
-                        try:
-                            status = masto.get_status(draft.platform_id)  # type: ignore[arg-type]
-                            updated[draft.id] = PostMetrics(
-                                id=draft.id,
-                                channel="mastodon",
-                                published_at=(
-                                    draft.published_at.isoformat() if draft.published_at else ""
-                                ),
-                                platform_id=draft.platform_id,
-                                reblogs=status.get("reblogs_count", 0),
-                                favourites=status.get("favourites_count", 0),
-                                replies=status.get("replies_count", 0),
-                            )
-                        except Exception:
-                            logger.warning("Failed to fetch Mastodon status %s", draft.platform_id)
+                with borrowed_pool(clients, storage) as pool:
+                    statuses = _fetch_mastodon_statuses(
+                        pool.mastodon(), due_mastodon, known=mastodon_statuses
+                    )
+                for draft in due_mastodon:
+                    status = statuses.get(draft.id)
+                    if status is None:
+                        continue
+                    updated[draft.id] = _schedule_refresh(
+                        draft,
+                        existing_by_id.get(draft.id),
+                        reblogs=status.get("reblogs_count", 0),
+                        favourites=status.get("favourites_count", 0),
+                        replies=status.get("replies_count", 0),
+                        now=now,
+                    )
             except Exception:
                 logger.exception("Mastodon per-post metrics failed")
 
-        if recent_bluesky:
+        if due_bluesky:
             try:
-                with BlueskyClient(
-                    handle=os.environ.get("BLUESKY_HANDLE", "fretchen.eu"),
-                    app_password=os.environ["BLUESKY_APP_PASSWORD"],
-                ) as bsky:
-                    uris = [d.platform_id for d in recent_bluesky]
-                    posts_by_uri = {p["uri"]: p for p in bsky.get_posts(uris)}  # type: ignore[arg-type]
-                    for draft in recent_bluesky:
-                        post = posts_by_uri.get(draft.platform_id or "")
-                        if post:
-                            updated[draft.id] = PostMetrics(
-                                id=draft.id,
-                                channel="bluesky",
-                                published_at=(
-                                    draft.published_at.isoformat() if draft.published_at else ""
-                                ),
-                                platform_id=draft.platform_id,
-                                reblogs=post.get("repostCount", 0),
-                                favourites=post.get("likeCount", 0),
-                                replies=post.get("replyCount", 0),
-                            )
+                posts_by_uri = dict(bluesky_posts or {})
+                uris = [d.platform_id for d in due_bluesky if d.platform_id not in posts_by_uri]
+                if uris:
+                    with borrowed_pool(clients, storage) as pool:
+                        posts = pool.bluesky().get_posts(uris)  # type: ignore[arg-type]
+                    posts_by_uri.update((p["uri"], p) for p in posts)
+                for draft in due_bluesky:
+                    post = posts_by_uri.get(draft.platform_id or "")
+                    if not post:
+                        continue
+                    updated[draft.id] = _schedule_refresh(
+                        draft,
+                        existing_by_id.get(draft.id),
+                        reblogs=post.get("repostCount", 0),
+                        favourites=post.get("likeCount", 0),
+                        replies=post.get("replyCount", 0),
+                        now=now,
+                    )
             except Exception:
                 logger.exception("Bluesky per-post metrics failed")
 
-        refreshed = len(recent_mastodon) + len(recent_bluesky)
         storage.write("performance.json", Performance(posts=list(updated.values())))
-        logger.info("Per-post metrics: %d total, %d refreshed", len(updated), refreshed)
+        refreshed = [
+            (d, updated[d.id]) for d in due if d.id in updated and updated[d.id].fetched_at == now
+        ]
+        _append_engagement_snapshots(storage, [metrics for _, metrics in refreshed], now)
+        _update_engagement_rollup(storage, queue, existing, existing_by_id, refreshed, now)
+        logger.info(
+            "Per-post metrics: %d total, %d due, %d frozen",
+            len(updated),
+            len(due),
+            sum(1 for p in updated.values() if p.frozen),
+        )
     except Exception:
         logger.exception("Per-post metrics collection failed")
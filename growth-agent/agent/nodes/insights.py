@@ -1,13 +1,26 @@
 """Insights node — LLM-based analysis of analytics data."""
 
+import hashlib
+import json
 import logging
 from datetime import datetime, timezone
 
+from agent.budget import LLMBudget
+from agent.engagement_rollup import load_or_build_rollup
 from agent.llm_client import LLMClient
-from agent.models import ContentQueue, Insights, LLMAnalysis, Performance, Strategy
+from agent.models import (
+    EngagementRollup,
+    Insights,
+    LLMAnalysis,
+    LLMAnalysisRecord,
+    PageMeta,
+    Strategy,
+)
 from agent.page_meta import fetch_pages_meta
 from agent.state import AgentState
 from agent.storage import load_model
+from agent.summaries import ArticleSummaryStore
+from agent.tokens import estimate_tokens
 from agent.utils import normalize_url
 
 logger = logging.getLogger("growth-agent")
@@ -15,79 +28,151 @@ logger = logging.getLogger("growth-agent")
 INSIGHTS_REGISTRY_LIMIT = 30
 INSIGHTS_CANDIDATE_TARGET = 5
 
+# Prompt trimming policy: shrink these until the prompt fits INSIGHTS_PROMPT_TOKEN_LIMIT.
+INSIGHTS_PROMPT_TOKEN_LIMIT = 3000
+INSIGHTS_ENGAGEMENT_TOP_K = 15
+INSIGHTS_DESCRIPTION_MAX_CHARS = 200
+_MIN_ENGAGEMENT_TOP_K = 3
+_MIN_DESCRIPTION_CHARS = 60
+_MIN_PAGE_DESCRIPTIONS = 5
+
+# Reuse last week's analysis if total engagement moved by fewer interactions than this.
+INSIGHTS_ENGAGEMENT_DELTA_THRESHOLD = 5
+
 
 def insights_node(state: AgentState) -> dict:
     """LangGraph node: generate LLM insights, update state."""
     try:
-        generate_insights(state["storage"])
-        return {"insights_ok": True}
+        record = generate_insights(state["storage"], budget=state.get("llm_budget"))
+        return {
+            "insights_ok": True,
+            "insights_decision": f"{record.decision}:{record.decision_reason}",
+        }
     except Exception:
         logger.exception("Insight generation failed")
-        return {"insights_ok": False}
-
-
-def _build_page_engagement(performance: Performance, queue: ContentQueue) -> dict[str, dict]:
-    """Aggregate Mastodon/Bluesky engagement metrics by canonical page URL."""
-    published_by_id = {d.id: d for d in queue.published}
-    page_engagement: dict[str, dict] = {}
-    for pm in performance.posts:
-        draft = published_by_id.get(pm.id)
-        if not draft or not draft.link:
-            continue
-        url = normalize_url(draft.link)
-        e = page_engagement.setdefault(
-            url, {"favourites": 0, "reblogs": 0, "replies": 0, "posts": 0}
-        )
-        e["favourites"] += pm.favourites
-        e["reblogs"] += pm.reblogs
-        e["replies"] += pm.replies
-        e["posts"] += 1
-    return page_engagement
+        return {"insights_ok": False, "insights_decision": "failed"}
 
 
-def generate_insights(storage) -> LLMAnalysis:
-    """Run LLM insight generation on current analytics data. Raises on failure."""
-    insights = load_model(storage, "insights.json", Insights)
-    strategy = load_model(storage, "strategy.json", Strategy)
-    performance = load_model(storage, "performance.json", Performance)
-    queue = load_model(storage, "content_queue.json", ContentQueue)
+def _page_engagement(rollup: EngagementRollup) -> dict[str, dict]:
+    """Per-page Mastodon/Bluesky engagement by canonical page URL, from the rollup."""
+    return {url: totals.model_dump() for url, totals in rollup.pages.items()}
+
+
+def _fingerprint(payload: dict) -> str:
+    """Stable SHA-256 over a JSON-normalized payload."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _input_fingerprints(
+    strategy: Strategy,
+    page_metas: dict[str, PageMeta],
+    page_engagement: dict[str, dict],
+) -> tuple[str, str]:
+    """Fingerprint the prompt inputs. Returns (full fingerprint, fingerprint w/o engagement)."""
+    context = {
+        "strategy": strategy.model_dump(
+            include={"content_pillars", "channels", "target_audience", "website_url"}
+        ),
+        "pages": sorted((m.url, m.description or "") for m in page_metas.values()),
+    }
+    engagement = {
+        url: [e["favourites"], e["reblogs"], e["replies"], e["posts"]]
+        for url, e in page_engagement.items()
+    }
+    return _fingerprint({**context, "engagement": engagement}), _fingerprint(context)
+
 
-    llm = LLMClient.from_env()
+def _engagement_totals(page_engagement: dict[str, dict]) -> dict[str, int]:
+    return {
+        url: e["favourites"] + e["reblogs"] + e["replies"] for url, e in page_engagement.items()
+    }
+
+
+def _reuse_reason(
+    previous: LLMAnalysisRecord | None,
+    input_fingerprint: str,
+    context_fingerprint: str,
+    engagement_totals: dict[str, int],
+) -> str | None:
+    """Why the previous analysis can be reused, or None if it must be refreshed."""
+    if previous is None or previous.input_fingerprint is None:
+        return None
+    if previous.input_fingerprint == input_fingerprint:
+        return "fingerprint_match"
+    if previous.context_fingerprint != context_fingerprint:
+        return None
+    urls = set(engagement_totals) | set(previous.engagement_totals)
+    delta = sum(
+        abs(engagement_totals.get(url, 0) - previous.engagement_totals.get(url, 0)) for url in urls
+    )
+    if delta < INSIGHTS_ENGAGEMENT_DELTA_THRESHOLD:
+        return "engagement_delta_below_threshold"
+    return None
+
+
+def _load_previous_analysis(storage) -> LLMAnalysisRecord | None:
+    data = storage.read("llm_analysis.json")
+    if not isinstance(data, dict):
+        return None
     try:
-        # Seed page descriptions from the sitemap registry (independent of analytics).
-        clean_data = storage.read("registry_clean.json")
-        _registry_urls = clean_data.get("urls", []) if isinstance(clean_data, dict) else []
-        page_urls = list(
-            dict.fromkeys(
-                normalize_url(u) for u in _registry_urls if isinstance(u, str) and u.strip()
-            )
-        )[:INSIGHTS_REGISTRY_LIMIT]
-        if not page_urls:
-            logger.warning(
-                "registry_clean.json absent or empty — page descriptions will be missing "
-                "from prompt"
-            )
-        page_metas = fetch_pages_meta(page_urls) if page_urls else {}
-        page_desc_block = "\n".join(
-            f"- {m.url}: {m.description or '(no description)'}" for m in page_metas.values()
+        return LLMAnalysisRecord.model_validate(data)
+    except ValueError:
+        logger.warning("llm_analysis.json is not a valid analysis record — refreshing")
+        return None
+
+
+def _engagement_score(e: dict) -> int:
+    return e.get("favourites", 0) + e.get("reblogs", 0)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - 1].rstrip() + "…"
+
+
+def _page_desc_block(
+    page_metas: dict[str, PageMeta],
+    page_engagement: dict[str, dict],
+    desc_chars: int,
+    page_limit: int,
+) -> str:
+    """Page descriptions, engaged pages first, each truncated to ``desc_chars``."""
+    metas = sorted(
+        page_metas.values(),
+        key=lambda m: -_engagement_score(page_engagement.get(m.url, {})),
+    )
+    return "\n".join(
+        f"- {m.url}: {_truncate(m.description or '(no description)', desc_chars)}"
+        for m in metas[:page_limit]
+    )
+
+
+def _engagement_block(page_engagement: dict[str, dict], top_k: int) -> str:
+    """Top-K pages by engagement; the remaining tail is collapsed into one summary line."""
+    if not page_engagement:
+        return "(no social posts yet)"
+    ranked = sorted(page_engagement.items(), key=lambda x: -_engagement_score(x[1]))
+    lines = [
+        f"- {url}: {e['favourites']} favourites, {e['reblogs']} reblogs, "
+        f"{e['replies']} replies ({e['posts']} posts)"
+        for url, e in ranked[:top_k]
+    ]
+    tail = [e for _, e in ranked[top_k:]]
+    if tail:
+        lines.append(
+            f"- {len(tail)} more pages: {sum(e['favourites'] for e in tail)} favourites, "
+            f"{sum(e['reblogs'] for e in tail)} reblogs, {sum(e['replies'] for e in tail)} "
+            f"replies ({sum(e['posts'] for e in tail)} posts)"
         )
+    return "\n".join(lines)
 
-        # Build per-page social engagement from real Mastodon/Bluesky data.
-        page_engagement = _build_page_engagement(performance, queue)
-        if page_engagement:
-            engagement_block = "\n".join(
-                f"- {url}: {e['favourites']} favourites, {e['reblogs']} reblogs, "
-                f"{e['replies']} replies ({e['posts']} posts)"
-                for url, e in sorted(
-                    page_engagement.items(), key=lambda x: -(x[1]["favourites"] + x[1]["reblogs"])
-                )
-            )
-        else:
-            engagement_block = "(no social posts yet)"
 
-        blog_url = strategy.website_url
-        pillars = ", ".join(strategy.content_pillars)
-        insight_prompt = f"""You are a social media growth analyst \
+def _insight_prompt(strategy: Strategy, page_desc_block: str, engagement_block: str) -> str:
+    blog_url = strategy.website_url
+    pillars = ", ".join(strategy.content_pillars)
+    return f"""You are a social media growth analyst \
 for a technical blog ({blog_url}).
 
 The blog covers: {pillars}
@@ -115,6 +200,107 @@ Set `selection_type` on each page to either `proven` or `exploratory`.
 Aim for a mix that is mostly proven while still including exploratory
 candidates when the data allows it."""
 
+
+def _fit_insight_prompt(
+    strategy: Strategy,
+    page_metas: dict[str, PageMeta],
+    page_engagement: dict[str, dict],
+    token_limit: int = INSIGHTS_PROMPT_TOKEN_LIMIT,
+) -> tuple[str, int]:
+    """Build the insights prompt, trimming it until it fits ``token_limit``.
+
+    Each round halves the engagement top-K, the description length and the number
+    of page descriptions, down to fixed minimums. Returns (prompt, estimated tokens).
+    """
+    top_k = INSIGHTS_ENGAGEMENT_TOP_K
+    desc_chars = INSIGHTS_DESCRIPTION_MAX_CHARS
+    page_limit = max(len(page_metas), _MIN_PAGE_DESCRIPTIONS)
+    while True:
+        prompt = _insight_prompt(
+            strategy,
+            _page_desc_block(page_metas, page_engagement, desc_chars, page_limit),
+            _engagement_block(page_engagement, top_k),
+        )
+        tokens = estimate_tokens(prompt)
+        shrunk = (
+            max(_MIN_ENGAGEMENT_TOP_K, top_k // 2),
+            max(_MIN_DESCRIPTION_CHARS, desc_chars // 2),
+            max(_MIN_PAGE_DESCRIPTIONS, page_limit // 2),
+        )
+        if tokens <= token_limit or shrunk == (top_k, desc_chars, page_limit):
+            if tokens > token_limit:
+                logger.warning(
+                    "Insights prompt still %d tokens after trimming (limit %d)",
+                    tokens,
+                    token_limit,
+                )
+            return prompt, tokens
+        top_k, desc_chars, page_limit = shrunk
+
+
+def generate_insights(
+    storage, budget: LLMBudget | None = None, force: bool = False
+) -> LLMAnalysisRecord:
+    """Run LLM insight generation on current analytics data. Raises on failure.
+
+    Skips the LLM call and returns the stored analysis (``decision="reused"``) when
+    the prompt inputs are unchanged or engagement moved less than
+    INSIGHTS_ENGAGEMENT_DELTA_THRESHOLD since it was generated, unless ``force``.
+    """
+    insights = load_model(storage, "insights.json", Insights)
+    strategy = load_model(storage, "strategy.json", Strategy)
+
+    llm = LLMClient.from_env(budget=budget)
+    try:
+        # Seed page descriptions from the sitemap registry (independent of analytics).
+        clean_data = storage.read("registry_clean.json")
+        _registry_urls = clean_data.get("urls", []) if isinstance(clean_data, dict) else []
+        page_urls = list(
+            dict.fromkeys(
+                normalize_url(u) for u in _registry_urls if isinstance(u, str) and u.strip()
+            )
+        )[:INSIGHTS_REGISTRY_LIMIT]
+        if not page_urls:
+            logger.warning(
+                "registry_clean.json absent or empty — page descriptions will be missing "
+                "from prompt"
+            )
+        page_metas = fetch_pages_meta(page_urls, storage=storage) if page_urls else {}
+        # Prefer cached article summaries (agent.summaries) over meta descriptions.
+        summaries = ArticleSummaryStore(storage)
+        page_metas = {
+            url: meta.model_copy(
+                update={"description": summaries.latest_for_url(url) or meta.description}
+            )
+            for url, meta in page_metas.items()
+        }
+
+        # Per-page social engagement, maintained incrementally by the metrics refresh.
+        page_engagement = _page_engagement(load_or_build_rollup(storage))
+
+        input_fingerprint, context_fingerprint = _input_fingerprints(
+            strategy, page_metas, page_engagement
+        )
+        engagement_totals = _engagement_totals(page_engagement)
+        previous = _load_previous_analysis(storage)
+        reuse_reason = _reuse_reason(
+            previous, input_fingerprint, context_fingerprint, engagement_totals
+        )
+        if previous is not None and reuse_reason and not force:
+            logger.info("Insights inputs unchanged (%s) — reusing previous analysis", reuse_reason)
+            return previous.model_copy(
+                update={"decision": "reused", "decision_reason": reuse_reason}
+            )
+        if force:
+            refresh_reason = "forced"
+        elif previous is None or previous.input_fingerprint is None:
+            refresh_reason = "no_previous_analysis"
+        else:
+            refresh_reason = "inputs_changed"
+
+        insight_prompt, prompt_tokens = _fit_insight_prompt(strategy, page_metas, page_engagement)
+        logger.info("Insights prompt: ~%d tokens", prompt_tokens)
+
         result = llm.structured_output(
             schema=LLMAnalysis,
             messages=[
@@ -124,6 +310,7 @@ candidates when the data allows it."""
                 },
                 {"role": "user", "content": insight_prompt},
             ],
+            purpose="insights",
         )
         assert isinstance(result, LLMAnalysis)
 
@@ -131,9 +318,18 @@ candidates when the data allows it."""
         insights.best_pages_for_social = result.best_pages_for_social
         insights.last_analysis = datetime.now(timezone.utc)
         storage.write("insights.json", insights)
-        storage.write("llm_analysis.json", result)
+        record = LLMAnalysisRecord(
+            **result.model_dump(),
+            prompt_tokens=prompt_tokens,
+            generated_at=insights.last_analysis,
+            input_fingerprint=input_fingerprint,
+            context_fingerprint=context_fingerprint,
+            engagement_totals=engagement_totals,
+            decision_reason=refresh_reason,
+        )
+        storage.write("llm_analysis.json", record)
         logger.info("LLM insights generated and persisted")
-        return result
+        return record
 
     finally:
         llm.close()
@@ -1,25 +1,41 @@
 """Plan node — decides what to post, when, and on which channel."""
 
+import heapq
 import logging
 import math
 import random
-from datetime import date, datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import TypedDict
 from urllib.parse import urlsplit
-from urllib.request import urlopen
-
-from defusedxml import ElementTree as ET  # type: ignore[import-untyped]
 
+from agent.exclusions import ExclusionRules
 from agent.models import (
+    CalendarConfig,
+    CalendarState,
     ContentPlan,
     ContentPlanItem,
     ContentQueue,
+    Draft,
+    LastPublishedIndex,
+    RegistryPage,
+    RegistryPages,
+    SitemapEntry,
+    SitemapState,
 )
-from agent.page_meta import fetch_pages_meta
+from agent.page_meta import fetch_pages_meta, invalidate_pages_meta
+from agent.publish_index import load_last_published
+from agent.sitemap import fetch_sitemap
+from agent.slot_calendar import CALENDAR_KEY, SlotCalendar
 from agent.state import AgentState
 from agent.storage import load_model
 from agent.utils import normalize_url as _normalize_url
 
+try:  # optional: vectorized sampling for large registries
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is not a runtime dependency
+    np = None
+
 logger = logging.getLogger("growth-agent")
 
 PIPELINE_TARGET = 10
@@ -29,6 +45,23 @@ SITEMAP_URL = "https://www.fretchen.eu/sitemap.xml"
 REGISTRY_KEY = "registry.json"
 REGISTRY_CLEAN_KEY = "registry_clean.json"
 REGISTRY_EXCLUDED_KEY = "registry_excluded.json"
+# Sitemap documents with ETag/Last-Modified validators, for conditional re-fetches.
+REGISTRY_SITEMAP_KEY = "registry_sitemap.json"
+# Per-URL records (sitemap lastmod, first seen), diffed on every registry rebuild.
+REGISTRY_PAGES_KEY = "registry_pages.json"
+# Rebuild the agent-generated registry after this many days (conditional fetch keeps it cheap).
+REGISTRY_REFRESH_DAYS = 7
+# Registries at least this large use the NumPy sampling path when numpy is installed.
+NUMPY_MIN_POOL = 10_000
+
+
+@dataclass
+class RegistryDiff:
+    """URLs added to, removed from, or changed (newer <lastmod>) in the sitemap."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
 
 
 class SelectedPage(TypedDict):
@@ -62,35 +95,64 @@ def _urls_from_payload(data: dict | None) -> list[str]:
     return _dedupe_urls(urls)
 
 
-def _load_excluded_rules(storage) -> tuple[set[str], list[str]]:
-    data = storage.read(REGISTRY_EXCLUDED_KEY)
-    if not isinstance(data, dict):
-        return set(), []
-
-    excluded_urls = {
-        _normalize_url(u) for u in data.get("urls", []) if isinstance(u, str) and u.strip()
-    }
-    prefixes = [p.strip() for p in data.get("prefixes", []) if isinstance(p, str) and p.strip()]
-    return excluded_urls, prefixes
-
+def _fetch_sitemap_entries(storage) -> list[SitemapEntry]:
+    """Sitemap entries with normalized, deduplicated URLs.
 
-def _is_excluded(url: str, excluded_urls: set[str], prefixes: list[str]) -> bool:
-    if url in excluded_urls:
+    Only re-downloads sitemap documents that changed since the last fetch.
+    """
+    state = load_model(storage, REGISTRY_SITEMAP_KEY, SitemapState)
+    result = fetch_sitemap(SITEMAP_URL, state)
+    storage.write(REGISTRY_SITEMAP_KEY, result.state)
+    logger.info(
+        "Sitemap fetched (%s, %d requests, %d entries)",
+        "modified" if result.modified else "not modified",
+        result.requests,
+        len(result.entries),
+    )
+    entries: dict[str, SitemapEntry] = {}
+    for entry in result.entries:
+        url = _normalize_url(entry.loc)
+        if url and url not in entries:
+            entries[url] = SitemapEntry(loc=url, lastmod=entry.lastmod)
+    return list(entries.values())
+
+
+def _diff_registry(
+    pages: RegistryPages, entries: list[SitemapEntry], now: datetime
+) -> RegistryDiff:
+    """Apply the sitemap to the per-URL records in place and report what changed."""
+    diff = RegistryDiff()
+    current = {entry.loc: entry for entry in entries}
+    for url in list(pages.pages):
+        if url not in current:
+            diff.removed.append(url)
+            del pages.pages[url]
+    for url, entry in current.items():
+        record = pages.pages.get(url)
+        if record is None:
+            diff.added.append(url)
+            pages.pages[url] = RegistryPage(url=url, lastmod=entry.lastmod, first_seen=now)
+        elif entry.lastmod != record.lastmod:
+            diff.changed.append(url)
+            record.lastmod = entry.lastmod
+    pages.updated_at = now
+    return diff
+
+
+def _registry_is_fresh(clean_data: dict | list | None, now: datetime) -> bool:
+    """Whether registry_clean.json is recent enough to use without a rebuild.
+
+    Registries without ``generated_at`` were not built by the agent and never expire.
+    """
+    if not isinstance(clean_data, dict) or not isinstance(clean_data.get("generated_at"), str):
         return True
-    path = urlsplit(url).path or "/"
-    return any(path.startswith(prefix) for prefix in prefixes)
-
-
-def _fetch_sitemap_urls() -> list[str]:
-    with urlopen(SITEMAP_URL) as response:
-        raw_xml = response.read()
-
-    root = ET.fromstring(raw_xml)
-    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-    loc_nodes = root.findall("sm:url/sm:loc", ns)
-    urls = [_normalize_url(node.text or "") for node in loc_nodes]
-    urls = [u for u in urls if u]
-    return _dedupe_urls(urls)
+    try:
+        generated_at = datetime.fromisoformat(clean_data["generated_at"])
+    except ValueError:
+        return False
+    if generated_at.tzinfo is None:
+        generated_at = generated_at.replace(tzinfo=timezone.utc)
+    return now - generated_at < timedelta(days=REGISTRY_REFRESH_DAYS)
 
 
 def _prepare_registry_urls(storage) -> tuple[list[str], bool, int]:
@@ -98,70 +160,77 @@ def _prepare_registry_urls(storage) -> tuple[list[str], bool, int]:
 
     Option 2 storage convention uses top-level keys in growth-agent prefix.
     """
+    now = datetime.now(timezone.utc)
     clean_data = storage.read(REGISTRY_CLEAN_KEY)
     clean_urls = _urls_from_payload(clean_data)
-    if clean_urls:
-        excluded_count = 0
-        if isinstance(clean_data, dict) and isinstance(clean_data.get("excluded_count"), int):
-            excluded_count = clean_data["excluded_count"]
+    excluded_count = 0
+    if isinstance(clean_data, dict) and isinstance(clean_data.get("excluded_count"), int):
+        excluded_count = clean_data["excluded_count"]
+    if clean_urls and _registry_is_fresh(clean_data, now):
         return clean_urls, False, excluded_count
 
-    # Build fresh registry from sitemap for MVP.
+    # Build a fresh registry from the sitemap; fall back to a stale one if that fails.
     try:
-        registry_urls = _fetch_sitemap_urls()
+        entries = _fetch_sitemap_entries(storage)
     except Exception:
         logger.exception("Failed to build registry from sitemap")
-        return [], False, 0
-
-    excluded_urls, excluded_prefixes = _load_excluded_rules(storage)
-    clean_urls = [
-        url for url in registry_urls if not _is_excluded(url, excluded_urls, excluded_prefixes)
-    ]
-    excluded_count = len(registry_urls) - len(clean_urls)
+        return clean_urls, False, excluded_count
+    registry_urls = [entry.loc for entry in entries]
+
+    pages = load_model(storage, REGISTRY_PAGES_KEY, RegistryPages)
+    diff = _diff_registry(pages, entries, now)
+    storage.write(REGISTRY_PAGES_KEY, pages)
+    # Changed pages are re-fetched even if their cached metadata is within its TTL.
+    invalidate_pages_meta(storage, diff.changed + diff.removed)
+
+    rules = ExclusionRules.from_payload(storage.read(REGISTRY_EXCLUDED_KEY))
+    excluded: dict[str, str] = {}
+    clean_urls = []
+    for url in registry_urls:
+        rule = rules.match(url)
+        if rule:
+            excluded[url] = rule
+        else:
+            clean_urls.append(url)
+    excluded_count = len(excluded)
 
     raw_payload = {
         "source": SITEMAP_URL,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": now.isoformat(),
         "count": len(registry_urls),
         "urls": registry_urls,
+        "diff": {
+            "added": len(diff.added),
+            "removed": len(diff.removed),
+            "changed": len(diff.changed),
+        },
     }
     clean_payload = {
         "source": SITEMAP_URL,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": now.isoformat(),
         "count": len(clean_urls),
         "urls": clean_urls,
         "excluded_count": excluded_count,
+        "excluded": excluded,  # url -> rule that excluded it, for debugging
     }
     storage.write(REGISTRY_KEY, raw_payload)
     storage.write(REGISTRY_CLEAN_KEY, clean_payload)
     logger.info(
-        "Registry rebuilt from sitemap (raw=%d, clean=%d)",
+        "Registry rebuilt from sitemap (raw=%d, clean=%d, added=%d, removed=%d, changed=%d)",
         len(registry_urls),
         len(clean_urls),
+        len(diff.added),
+        len(diff.removed),
+        len(diff.changed),
     )
     return clean_urls, True, excluded_count
 
 
-def _last_published_days(queue: ContentQueue, now: datetime) -> dict[str, float]:
-    """Return days since last publication per page URL from queue.published."""
-
-    def _to_utc_aware(ts: datetime) -> datetime:
-        if ts.tzinfo is None:
-            return ts.replace(tzinfo=timezone.utc)
-        return ts.astimezone(timezone.utc)
-
-    latest_by_url: dict[str, datetime] = {}
-    for draft in queue.published:
-        if not draft.link:
-            continue
-        page_url = _normalize_url(draft.link)
-        ts = _to_utc_aware(draft.scheduled_at or draft.created)
-        if page_url not in latest_by_url or ts > latest_by_url[page_url]:
-            latest_by_url[page_url] = ts
-
+def _last_published_days(index: LastPublishedIndex, now: datetime) -> dict[str, float]:
+    """Return days since last publication per page URL from the last-published index."""
     return {
-        page_url: (now - last_ts).total_seconds() / 86400.0
-        for page_url, last_ts in latest_by_url.items()
+        page_url: (now - entry.last_published_at).total_seconds() / 86400.0
+        for page_url, entry in index.pages.items()
     }
 
 
@@ -172,12 +241,45 @@ def _weight_for_days(t_days: float | None, half_life_days: float) -> float:
     return max(0.0, weight)
 
 
+def _smallest_key_indices(weights: list[float], k: int, rng: random.Random) -> list[int]:
+    """Indices of a weighted sample of size k without replacement (Efraimidis–Spirakis).
+
+    Each item gets the key E/w with E ~ Exp(1); the k smallest keys are distributed
+    like k successive weighted draws that each remove the picked item. heapify + k
+    pops is O(n + k log n). Zero-weight items sort last, in random order.
+    """
+    heap = [
+        (rng.expovariate(1.0) / w, 0.0, i) if w > 0 else (math.inf, rng.random(), i)
+        for i, w in enumerate(weights)
+    ]
+    heapq.heapify(heap)
+    return [heapq.heappop(heap)[2] for _ in range(min(k, len(heap)))]
+
+
+def _smallest_key_indices_numpy(weights: list[float], k: int, rng: random.Random) -> list[int]:
+    """Vectorized _smallest_key_indices for large registries (seeded from ``rng``)."""
+    assert np is not None
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    w = np.asarray(weights, dtype=float)
+    keys = np.full(w.shape, np.inf)
+    positive = w > 0
+    keys[positive] = np_rng.exponential(size=int(positive.sum())) / w[positive]
+    # Random tie-break so zero-weight items fill remaining slots in random order.
+    order = np.lexsort((np_rng.random(w.shape), keys))
+    return order[: min(k, len(order))].tolist()
+
+
 def _weighted_draw(
     registry_urls: list[str],
     last_days_by_url: dict[str, float],
     needed: int,
     half_life_days: float,
+    rng: random.Random | None = None,
 ) -> list[SelectedPage]:
+    """Sample ``needed`` pages without replacement, weighted by _weight_for_days.
+
+    Pass a seeded ``rng`` for reproducible plans.
+    """
     weighted_candidates: list[SelectedPage] = [
         {
             "page_url": page_url,
@@ -192,21 +294,23 @@ def _weighted_draw(
         for c in weighted_candidates:
             c["weight"] = 1.0
 
-    rng = random.Random()
-    chosen: list[SelectedPage] = []
-    pool = weighted_candidates.copy()
-    for _ in range(min(needed, len(pool))):
-        weights = [float(c["weight"]) for c in pool]
-        picked = rng.choices(pool, weights=weights, k=1)[0]
-        chosen.append(picked)
-        pool = [c for c in pool if c["page_url"] != picked["page_url"]]
-
-    return chosen
+    rng = rng or random.Random()
+    weights = [float(c["weight"]) for c in weighted_candidates]
+    if np is not None and len(weights) >= NUMPY_MIN_POOL:
+        picked = _smallest_key_indices_numpy(weights, needed, rng)
+    else:
+        picked = _smallest_key_indices(weights, needed, rng)
+    return [weighted_candidates[i] for i in picked]
 
 
 def plan_node(state: AgentState) -> dict:
     """LangGraph node: plan which pages to promote and when."""
     storage = state["storage"]
+    # Every plan is reproducible: an explicit seed is used as-is, otherwise a fresh one
+    # is drawn and recorded in the plan diagnostics.
+    seed = state.get("plan_seed")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
     try:
         # Queue is the current pipeline state: drafted, approved, and published posts.
         queue = load_model(storage, "content_queue.json", ContentQueue)
@@ -214,7 +318,7 @@ def plan_node(state: AgentState) -> dict:
 
         # Only future-approved posts still occupy upcoming pipeline slots.
         future_approved = [d for d in queue.approved if d.scheduled_at and d.scheduled_at > now]
-        existing = len(queue.drafts) + len(future_approved)
+        existing = _pipeline_size([*queue.drafts, *future_approved])
         needed = max(0, PIPELINE_TARGET - existing)
         if needed == 0:
             logger.info("Pipeline full (%d pending+approved), skipping planning", existing)
@@ -228,6 +332,7 @@ def plan_node(state: AgentState) -> dict:
                 queue=queue,
                 needed=needed,
                 now=now,
+                rng=random.Random(seed),
             )
         )
 
@@ -242,7 +347,7 @@ def plan_node(state: AgentState) -> dict:
             return {"plan_created": False}
 
         # Step 2: Schedule new items.
-        items = build_plan_items(queue=queue, selected_pages=chosen)
+        items = build_plan_items(queue=queue, selected_pages=chosen, storage=storage)
 
         # Diagnostics are lightweight run metrics for observability/debugging.
         diagnostics: dict[str, int | float | bool | str] = {
@@ -256,6 +361,7 @@ def plan_node(state: AgentState) -> dict:
             "selected_unique_urls": len({i.page_url for i in items}),
             "half_life_days": HALF_LIFE_DAYS,
             "channels": ",".join(DEFAULT_CHANNELS),
+            "seed": seed,
         }
 
         plan = ContentPlan(items=items, diagnostics=diagnostics)
@@ -274,6 +380,18 @@ def plan_node(state: AgentState) -> dict:
         return {"plan_created": False}
 
 
+def _pipeline_size(drafts: list[Draft]) -> int:
+    """Plan slots the drafts occupy. Language variants of one plan item count once.
+
+    Variants share channel, slot and page; drafts without a slot or link count alone.
+    """
+    slots = {
+        (d.channel, d.scheduled_at, _normalize_url(d.link)) if d.scheduled_at and d.link else d.id
+        for d in drafts
+    }
+    return len(slots)
+
+
 def _pending_pipeline_urls(queue: ContentQueue, now: datetime) -> set[str]:
     """URLs already represented in pending pipeline items.
 
@@ -298,9 +416,12 @@ def select_pages_for_plan(
     queue: ContentQueue,
     needed: int,
     now: datetime,
+    rng: random.Random | None = None,
 ) -> tuple[list[SelectedPage], int, int, bool, int]:
     """Step 1: select page URLs to promote using half-life weighted sampling.
 
+    Pass a seeded ``rng`` for a reproducible selection.
+
     Returns:
     - selected pages
     - registry size
@@ -313,12 +434,13 @@ def select_pages_for_plan(
     blocked_urls = _pending_pipeline_urls(queue, now)
     draw_urls = [url for url in registry_urls if url not in blocked_urls]
 
-    last_days_by_url = _last_published_days(queue, now)
+    last_days_by_url = _last_published_days(load_last_published(storage, queue), now)
     chosen = _weighted_draw(
         draw_urls,
         last_days_by_url,
         needed,
         HALF_LIFE_DAYS,
+        rng=rng,
     )
     return (
         chosen,
@@ -330,15 +452,25 @@ def select_pages_for_plan(
 
 
 def build_plan_items(
-    queue: ContentQueue, selected_pages: list[SelectedPage]
+    queue: ContentQueue, selected_pages: list[SelectedPage], storage=None
 ) -> list[ContentPlanItem]:
-    """Step 2: assign channels/schedule and enrich selected pages to plan items."""
+    """Step 2: assign channels/schedule and enrich selected pages to plan items.
+
+    With ``storage``, slots are allocated against the calendar config in calendar.json
+    and the updated calendar is written back, and page metadata is served from the
+    shared page-meta cache (see agent.page_meta.fetch_pages_meta).
+    """
     if not selected_pages:
         return []
 
-    schedule = plan_draft_schedule(queue, len(selected_pages), channels=DEFAULT_CHANNELS)
+    now = datetime.now(timezone.utc)
     page_urls = [str(c["page_url"]) for c in selected_pages]
-    page_metas = fetch_pages_meta(page_urls)
+    config = load_model(storage, CALENDAR_KEY, CalendarState).config if storage else None
+    calendar = SlotCalendar.from_queue(queue, now, config=config, channels=DEFAULT_CHANNELS)
+    schedule = calendar.allocate(len(selected_pages), now, refs=page_urls)
+    if storage is not None:
+        storage.write(CALENDAR_KEY, calendar.to_state(now))
+    page_metas = fetch_pages_meta(page_urls, storage=storage)
 
     items: list[ContentPlanItem] = []
     for sampled, (channel, slot) in zip(selected_pages, schedule):
@@ -364,86 +496,30 @@ def plan_draft_schedule(
     needed: int,
     now: datetime | None = None,
     channels: list[str] | None = None,
+    config: CalendarConfig | None = None,
 ) -> list[tuple[str, datetime]]:
     """Plan (channel, scheduled_at) pairs for new drafts.
 
-    Returns a list of ``needed`` tuples, one slot per day, filling the earliest
-    free calendar holes from tomorrow 09:00 UTC onward.
+    Fills the earliest free calendar slots from tomorrow onward. With the default
+    config that is one slot per day at 07:00 UTC; ``config`` can add slots per day,
+    per-channel daily caps and blackout windows (see agent.slot_calendar).
 
-    Occupied days come from already scheduled drafts and future-approved drafts.
+    Occupied slots come from already scheduled drafts and future-approved drafts.
     Channel assignment alternates deterministically and continues from channels
     already present on occupied days where possible.
     """
     if needed <= 0:
         return []
-
-    if channels is None:
-        channels = ["mastodon", "bluesky"]
-    channels = [c for c in channels if c]
-    if not channels:
-        channels = ["mastodon", "bluesky"]
-
     if now is None:
         now = datetime.now(timezone.utc)
-
-    def _to_utc_aware(ts: datetime) -> datetime:
-        if ts.tzinfo is None:
-            return ts.replace(tzinfo=timezone.utc)
-        return ts.astimezone(timezone.utc)
-
-    start_slot = now.replace(hour=7, minute=0, second=0, microsecond=0) + timedelta(days=1)
-
-    occupied_days: set[date] = set()
-    occupied_channel_by_day: dict[date, str] = {}
-
-    for d in queue.drafts:
-        if not d.scheduled_at:
-            continue
-        slot = _to_utc_aware(d.scheduled_at)
-        if slot.date() < start_slot.date():
-            continue
-        day = slot.date()
-        occupied_days.add(day)
-        if day not in occupied_channel_by_day and d.channel in channels:
-            occupied_channel_by_day[day] = d.channel
-
-    for d in queue.approved:
-        if not d.scheduled_at:
-            continue
-        slot = _to_utc_aware(d.scheduled_at)
-        if slot <= now:
-            continue
-        if slot.date() < start_slot.date():
-            continue
-        day = slot.date()
-        occupied_days.add(day)
-        if day not in occupied_channel_by_day and d.channel in channels:
-            occupied_channel_by_day[day] = d.channel
-
-    schedule: list[tuple[str, datetime]] = []
-    next_slot = start_slot
-    next_channel_idx = 0
-    while len(schedule) < needed:
-        day = next_slot.date()
-        if day in occupied_days:
-            existing_channel = occupied_channel_by_day.get(day)
-            if existing_channel in channels:
-                next_channel_idx = (channels.index(existing_channel) + 1) % len(channels)
-            next_slot += timedelta(days=1)
-            continue
-
-        next_channel = channels[next_channel_idx]
-        schedule.append((next_channel, next_slot))
-        next_slot += timedelta(days=1)
-        next_channel_idx = (next_channel_idx + 1) % len(channels)
-
-    return schedule
+    calendar = SlotCalendar.from_queue(queue, now, config=config, channels=channels)
+    return calendar.allocate(needed, now)
 
 
-def create_plan(storage) -> ContentPlan:
+def create_plan(storage, seed: int | None = None) -> ContentPlan:
     """Compatibility wrapper used by tests and direct callers.
 
     Delegates orchestration to ``plan_node`` and returns the persisted plan model.
     """
-    plan_node({"storage": storage})
+    plan_node({"storage": storage, "plan_seed": seed})
     return load_model(storage, "content_plan.json", ContentPlan)
@@ -1,12 +1,11 @@
 """Publish node — publishes approved drafts to social platforms."""
 
 import logging
-import os
 from datetime import datetime, timezone
 
 from agent.models import ContentQueue, Draft
-from agent.platforms.bluesky import BlueskyClient
-from agent.platforms.mastodon import MastodonClient
+from agent.platforms.pool import ClientPool, borrowed_pool
+from agent.publish_index import LAST_PUBLISHED_KEY, load_last_published, record_published
 from agent.publisher import publish_draft
 from agent.state import AgentState
 from agent.storage import load_model
@@ -20,80 +19,69 @@ CHAR_LIMITS = {"mastodon": 500, "bluesky": 300}
 def publish_node(state: AgentState) -> dict:
     """LangGraph node: publish approved drafts, update state."""
     try:
-        published = publish_approved_drafts(state["storage"])
+        published = publish_approved_drafts(state["storage"], clients=state.get("clients"))
         return {"published_ids": published}
     except Exception:
         logger.exception("Publishing failed")
         return {"published_ids": []}
 
 
-def publish_approved_drafts(storage) -> list[str]:
+def publish_approved_drafts(storage, clients: ClientPool | None = None) -> list[str]:
     """Publish approved drafts where scheduled_at <= now. Returns published IDs."""
     queue = load_model(storage, "content_queue.json", ContentQueue)
+    index = load_last_published(storage, queue)
     now = datetime.now(timezone.utc)
 
     published_ids: list[str] = []
     still_approved: list[Draft] = []
 
-    mastodon_client = None
-    bluesky_client = None
-
-    for draft in queue.approved:
-        # Only publish if scheduled time has passed
-        if draft.scheduled_at and draft.scheduled_at > now:
-            still_approved.append(draft)
-            continue
-
-        # Validate content length
-        limit = CHAR_LIMITS.get(draft.channel, 500)
-        if len(draft.content) > limit:
-            logger.warning(
-                "Draft %s exceeds %s char limit (%d/%d chars) — skipping",
-                draft.id,
-                draft.channel,
-                len(draft.content),
-                limit,
-            )
-            still_approved.append(draft)
-            continue
-
-        try:
-            if draft.channel == "mastodon":
-                if mastodon_client is None:
-                    mastodon_client = MastodonClient(
-                        instance=os.environ.get("MASTODON_INSTANCE", "https://mastodon.social"),
-                        access_token=os.environ["MASTODON_ACCESS_TOKEN"],
-                    )
-                response = publish_draft(draft, mastodon_client)
-                draft.platform_id = (response or {}).get("id")
-            elif draft.channel == "bluesky":
-                if bluesky_client is None:
-                    bluesky_client = BlueskyClient(
-                        handle=os.environ.get("BLUESKY_HANDLE", "fretchen.eu"),
-                        app_password=os.environ["BLUESKY_APP_PASSWORD"],
-                    )
-                response = publish_draft(draft, bluesky_client)
-                draft.platform_id = (response or {}).get("uri")
-            else:
-                logger.warning("Unknown channel %s for draft %s", draft.channel, draft.id)
+    with borrowed_pool(clients, storage) as pool:
+        for draft in queue.approved:
+            # Only publish if scheduled time has passed
+            if draft.scheduled_at and draft.scheduled_at > now:
                 still_approved.append(draft)
                 continue
 
-            draft.status = "published"
-            draft.published_at = datetime.now(timezone.utc)
-            queue.published.append(draft)
-            published_ids.append(draft.id)
-            logger.info("Published draft %s to %s", draft.id, draft.channel)
-
-        except Exception:
-            logger.exception("Failed to publish draft %s", draft.id)
-            still_approved.append(draft)
+            # Validate content length
+            limit = CHAR_LIMITS.get(draft.channel, 500)
+            if len(draft.content) > limit:
+                logger.warning(
+                    "Draft %s exceeds %s char limit (%d/%d chars) — skipping",
+                    draft.id,
+                    draft.channel,
+                    len(draft.content),
+                    limit,
+                )
+                still_approved.append(draft)
+                continue
 
-    if mastodon_client:
-        mastodon_client.close()
-    if bluesky_client:
-        bluesky_client.close()
+            try:
+                if draft.channel == "mastodon":
+                    response = publish_draft(draft, pool.mastodon())
+                    draft.platform_id = (response or {}).get("id")
+                elif draft.channel == "bluesky":
+                    response = publish_draft(draft, pool.bluesky())
+                    draft.platform_id = (response or {}).get("uri")
+                else:
+                    logger.warning("Unknown channel %s for draft %s", draft.channel, draft.id)
+                    still_approved.append(draft)
+                    continue
+
+                draft.status = "published"
+                draft.published_at = datetime.now(timezone.utc)
+                queue.published.append(draft)
+                record_published(index, draft)
+                published_ids.append(draft.id)
+                logger.info("Published draft %s to %s", draft.id, draft.channel)
+
+            except Exception:
+                logger.exception("Failed to publish draft %s", draft.id)
+                still_approved.append(draft)
 
     queue.approved = still_approved
     storage.write("content_queue.json", queue)
+    # Written right after the queue; if this write is lost, post_count no longer
+    # matches the history and the next load rebuilds the index.
+    if published_ids:
+        storage.write(LAST_PUBLISHED_KEY, index)
     return published_ids
@@ -1,20 +1,153 @@
-"""Fetch page metadata (title, description) from HTML meta tags."""
+"""Fetch page metadata (title, description, og:*, canonical) from the HTML head."""
 
+import html as html_lib
+import logging
 import re
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
 
 import httpx
 
-from agent.models import PageMeta
+from agent.models import PageMeta, PageMetaCache, PageMetaCacheEntry
+from agent.storage import load_model
+from agent.utils import normalize_url
 
-_DESCRIPTION_RE = re.compile(
-    r'<meta\s+name=["\']description["\']\s+content=["\']([^"\']*)["\']',
-    re.IGNORECASE,
-)
-_OG_DESCRIPTION_RE = re.compile(
-    r'<meta\s+property=["\']og:description["\']\s+content=["\']([^"\']*)["\']',
-    re.IGNORECASE,
+logger = logging.getLogger("growth-agent")
+
+PAGE_META_CACHE_KEY = "page_meta_cache.json"
+# Changed and removed pages are invalidated explicitly on registry rebuilds (see
+# invalidate_pages_meta), so the TTL is only a safety net for edits the sitemap's
+# lastmod does not reflect. Until it expires, cached metadata costs no request.
+PAGE_META_TTL_SECONDS = 30 * 24 * 3600
+PAGE_META_WORKERS = 8
+PAGE_META_PER_HOST = 4  # concurrent requests per host, to stay polite to our own site
+PAGE_META_DEADLINE_SECONDS = 60.0
+# Stop reading a page after this many bytes even if </head> was not seen.
+PAGE_META_MAX_BYTES = 64 * 1024
+
+# Article body extraction: drop non-content blocks, prefer <article>/<main> over <body>.
+_NON_CONTENT_RE = re.compile(
+    r"<(script|style|noscript|svg|nav|header|footer)\b[^>]*>.*?</\1\s*>",
+    re.IGNORECASE | re.DOTALL,
 )
-_TITLE_RE = re.compile(r"<title[^>]*>([^<]+)</title>", re.IGNORECASE)
+_CONTAINER_RES = [
+    re.compile(rf"<{tag}\b[^>]*>(.*)</{tag}\s*>", re.IGNORECASE | re.DOTALL)
+    for tag in ("article", "main", "body")
+]
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class _MetaFetch:
+    """Outcome of one (conditional) page request."""
+
+    meta: PageMeta | None  # None on 304 Not Modified
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class _HeadParser(HTMLParser):
+    """Incremental parser for <title>, <meta> and <link rel=canonical> in the head.
+
+    Sets ``done`` at </head> or the first <body> tag so callers can stop reading.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self.title = ""
+        self.description: str | None = None
+        self.og: dict[str, str] = {}
+        self.canonical: str | None = None
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.done:
+            return
+        attr = {name.lower(): (value or "") for name, value in attrs}
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            content = attr.get("content", "").strip()
+            name = attr.get("name", "").lower()
+            prop = attr.get("property", "").lower()
+            if name == "description" and self.description is None:
+                self.description = content
+            elif prop.startswith("og:") and prop not in self.og:
+                self.og[prop] = content
+        elif tag == "link" and "canonical" in attr.get("rel", "").lower().split():
+            self.canonical = self.canonical or attr.get("href") or None
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title and not self.done:
+            self.title += data
+
+    def page_meta(self, url: str) -> PageMeta:
+        # Prefer name="description", fall back to og:description; same for og:title.
+        description = self.description or self.og.get("og:description") or None
+        return PageMeta(
+            url=url,
+            title=" ".join(self.title.split()) or self.og.get("og:title", ""),
+            description=description,
+            og=self.og,
+            canonical=self.canonical,
+        )
+
+
+def parse_head(url: str, chunks: Iterable[str], max_bytes: int = PAGE_META_MAX_BYTES) -> PageMeta:
+    """Parse PageMeta from text chunks, consuming only up to </head> or ``max_bytes``.
+
+    ``max_bytes`` counts UTF-8 bytes, so multi-byte (e.g. German) text is not undercounted.
+    """
+    parser = _HeadParser()
+    consumed = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        consumed += len(chunk.encode("utf-8"))
+        if parser.done or consumed >= max_bytes:
+            break
+    return parser.page_meta(url)
+
+
+def _fetch_meta(
+    client: httpx.Client,
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> _MetaFetch | None:
+    """Request a page, conditionally when validators are given. None on fetch error."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        # Streamed: the connection is closed once the head is parsed, skipping the body.
+        with client.stream("GET", url, headers=headers, follow_redirects=True) as resp:
+            if resp.status_code == 304 and headers:
+                return _MetaFetch(meta=None, etag=etag, last_modified=last_modified)
+            resp.raise_for_status()
+            return _MetaFetch(
+                meta=parse_head(url, resp.iter_text()),
+                etag=resp.headers.get("etag"),
+                last_modified=resp.headers.get("last-modified"),
+            )
+    except httpx.HTTPError:
+        return None
 
 
 def fetch_page_meta(url: str, client: httpx.Client | None = None) -> PageMeta | None:
@@ -33,42 +166,259 @@ def fetch_page_meta(url: str, client: httpx.Client | None = None) -> PageMeta |
 
     assert client is not None  # narrowing for mypy
     try:
-        resp = client.get(url, follow_redirects=True)
-        resp.raise_for_status()
-    except httpx.HTTPError:
-        return None
+        result = _fetch_meta(client, url)
     finally:
         if own_client:
             client.close()
+    return result.meta if result else None
+
+
+def _fetch_many(
+    client: httpx.Client,
+    validators: dict[str, tuple[str | None, str | None]],
+    deadline_seconds: float,
+) -> tuple[dict[str, _MetaFetch | None], set[Future]]:
+    """Fetch {url: (etag, last_modified)} concurrently, at most PAGE_META_PER_HOST per host.
+
+    Returns what finished before the deadline, with None for pages whose fetch
+    raised, plus the futures still in flight. Those are abandoned and end at the
+    client timeout, so ``client`` must stay open until they are done.
+    """
+    if not validators:
+        return {}, set()
+    host_slots: dict[str, threading.BoundedSemaphore] = {}
+    for url in validators:
+        host_slots.setdefault(urlsplit(url).netloc, threading.BoundedSemaphore(PAGE_META_PER_HOST))
+
+    def fetch(url: str) -> _MetaFetch | None:
+        etag, last_modified = validators[url]
+        with host_slots[urlsplit(url).netloc]:
+            return _fetch_meta(client, url, etag, last_modified)
+
+    pool = ThreadPoolExecutor(max_workers=min(PAGE_META_WORKERS, len(validators)))
+    futures = {pool.submit(fetch, url): url for url in validators}
+    done, pending = wait(futures, timeout=deadline_seconds)
+    pool.shutdown(wait=False, cancel_futures=True)
+    if pending:
+        logger.warning(
+            "Page metadata deadline (%.0fs) hit: %d of %d pages unfinished",
+            deadline_seconds,
+            len(pending),
+            len(futures),
+        )
+    results: dict[str, _MetaFetch | None] = {}
+    for future in done:
+        try:
+            results[futures[future]] = future.result()
+        except Exception:
+            logger.warning("Page metadata fetch failed for %s", futures[future], exc_info=True)
+            results[futures[future]] = None
+    return results, pending
+
+
+def _close_when_done(client: httpx.Client, pending: set[Future]) -> None:
+    """Close ``client`` now, or once the last abandoned request in ``pending`` ends."""
+    if not pending:
+        client.close()
+        return
+    remaining = [len(pending)]
+    lock = threading.Lock()
+
+    def on_done(_future: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            client.close()
+
+    for future in pending:
+        future.add_done_callback(on_done)
 
-    html = resp.text
 
-    # Extract title
-    title_match = _TITLE_RE.search(html)
-    title = title_match.group(1).strip() if title_match else ""
+def _is_fresh(entry: PageMetaCacheEntry, now: datetime, ttl_seconds: int) -> bool:
+    max_age = timedelta(seconds=min(entry.ttl_seconds, ttl_seconds))
+    return now < entry.fetched_at + max_age
 
-    # Extract description: prefer name="description", fall back to og:description
-    desc_match = _DESCRIPTION_RE.search(html)
-    if not desc_match:
-        desc_match = _OG_DESCRIPTION_RE.search(html)
-    description = desc_match.group(1).strip() if desc_match else None
 
-    return PageMeta(url=url, title=title, description=description)
+def _fetch_pages_meta_cached(
+    storage,
+    urls: list[str],
+    client: httpx.Client,
+    ttl_seconds: int,
+    deadline_seconds: float,
+) -> tuple[dict[str, PageMeta], set[Future]]:
+    """Serve fresh cache entries, revalidate stale ones, fetch the rest.
 
+    Also returns the requests still in flight after the deadline (see _fetch_many).
+    """
+    cache = load_model(storage, PAGE_META_CACHE_KEY, PageMetaCache)
+    now = datetime.now(timezone.utc)
+    results: dict[str, PageMeta] = {}
+    served = revalidated = fetched = 0
+    to_fetch: dict[str, tuple[str | None, str | None]] = {}
+    for url in urls:
+        entry = cache.entries.get(normalize_url(url))
+        if entry is not None and _is_fresh(entry, now, ttl_seconds):
+            results[url] = entry.meta.model_copy(update={"url": url})
+            served += 1
+        else:
+            to_fetch[url] = (entry.etag, entry.last_modified) if entry else (None, None)
+
+    responses, pending = _fetch_many(client, to_fetch, deadline_seconds)
+    for url in to_fetch:
+        key = normalize_url(url)
+        entry = cache.entries.get(key)
+        result = responses.get(url)
+        if result is None:
+            # Failed or past the deadline: stale beats nothing.
+            if entry is not None:
+                results[url] = entry.meta.model_copy(update={"url": url})
+            continue
+        if result.meta is not None:
+            entry = PageMetaCacheEntry(
+                meta=result.meta,
+                etag=result.etag,
+                last_modified=result.last_modified,
+                fetched_at=now,
+                ttl_seconds=ttl_seconds,
+            )
+            fetched += 1
+        else:
+            assert entry is not None  # 304 only happens for conditional requests
+            entry.fetched_at = now
+            entry.ttl_seconds = ttl_seconds
+            revalidated += 1
+        cache.entries[key] = entry
+        results[url] = entry.meta.model_copy(update={"url": url})
+
+    if revalidated or fetched:
+        storage.write(PAGE_META_CACHE_KEY, cache)
+    logger.info(
+        "Page metadata: %d cached, %d revalidated (304), %d fetched",
+        served,
+        revalidated,
+        fetched,
+    )
+    return results, pending
 
-def fetch_pages_meta(urls: list[str]) -> dict[str, PageMeta]:
-    """Fetch metadata for multiple pages.
+
+def fetch_pages_meta(
+    urls: list[str],
+    storage=None,
+    client: httpx.Client | None = None,
+    ttl_seconds: int = PAGE_META_TTL_SECONDS,
+    deadline_seconds: float = PAGE_META_DEADLINE_SECONDS,
+) -> dict[str, PageMeta]:
+    """Fetch metadata for multiple pages concurrently.
 
     Args:
         urls: List of full URLs to fetch.
+        storage: Optional state storage. When given, metadata is served from
+            page_meta_cache.json within ``ttl_seconds`` and revalidated with
+            conditional requests (ETag/Last-Modified) afterwards.
+        client: Optional reusable httpx.Client. A temporary one is created if not provided.
+        ttl_seconds: Lifetime of entries written by this call; entries are also only
+            served without a request if they are younger than this.
+        deadline_seconds: Overall time limit; pages not fetched by then are left out.
 
     Returns:
         Dict mapping URL to PageMeta (only successful fetches included).
     """
-    results = {}
-    with httpx.Client(timeout=15.0) as client:
-        for url in urls:
-            meta = fetch_page_meta(url, client=client)
-            if meta:
-                results[url] = meta
-    return results
+    own_client = client is None
+    if own_client:
+        client = httpx.Client(timeout=15.0)
+
+    assert client is not None  # narrowing for mypy
+    pending: set[Future] = set()
+    try:
+        if storage is not None:
+            results, pending = _fetch_pages_meta_cached(
+                storage, urls, client, ttl_seconds, deadline_seconds
+            )
+            return results
+        responses, pending = _fetch_many(
+            client, dict.fromkeys(urls, (None, None)), deadline_seconds
+        )
+        return {
+            url: result.meta
+            for url in urls
+            if (result := responses.get(url)) is not None and result.meta is not None
+        }
+    finally:
+        if own_client:
+            # Requests abandoned at the deadline still use the client.
+            _close_when_done(client, pending)
+
+
+def invalidate_pages_meta(storage, urls: list[str]) -> int:
+    """Drop cached metadata for pages known to have changed. Returns the number dropped."""
+    if not urls:
+        return 0
+    cache = load_model(storage, PAGE_META_CACHE_KEY, PageMetaCache)
+    dropped = [key for key in map(normalize_url, urls) if cache.entries.pop(key, None)]
+    if dropped:
+        storage.write(PAGE_META_CACHE_KEY, cache)
+    return len(dropped)
+
+
+def extract_article_text(html: str) -> str:
+    """Extract the readable article text from HTML, whitespace-normalized."""
+    html = _NON_CONTENT_RE.sub(" ", html)
+    for container_re in _CONTAINER_RES:
+        match = container_re.search(html)
+        if match:
+            html = match.group(1)
+            break
+    text = html_lib.unescape(_TAG_RE.sub(" ", html))
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+@dataclass
+class ArticleFetch:
+    """Outcome of one (conditional) article request."""
+
+    text: str | None  # None on 304 Not Modified
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def fetch_article(
+    url: str,
+    client: httpx.Client | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> ArticleFetch | None:
+    """Fetch a page's article text, conditionally when validators are given.
+
+    Returns ArticleFetch with ``text=None`` if the server answered 304 Not Modified,
+    or None on fetch error or an empty body.
+    """
+    own_client = client is None
+    if own_client:
+        client = httpx.Client(timeout=15.0)
+
+    assert client is not None  # narrowing for mypy
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        resp = client.get(url, headers=headers, follow_redirects=True)
+        if resp.status_code == 304 and headers:
+            return ArticleFetch(text=None, etag=etag, last_modified=last_modified)
+        resp.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    finally:
+        if own_client:
+            client.close()
+
+    text = extract_article_text(resp.text)
+    if not text:
+        return None
+    return ArticleFetch(
+        text=text,
+        etag=resp.headers.get("etag"),
+        last_modified=resp.headers.get("last-modified"),
+    )
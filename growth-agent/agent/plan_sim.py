@@ -0,0 +1,170 @@
+"""Offline, seeded plan simulator for tuning HALF_LIFE_DAYS and PIPELINE_TARGET.
+
+Replays the daily publish + plan cycle in memory: each simulated day publishes what
+is due, then refills the pipeline with the planner's own weighted draw and slot
+calendar. Every planned draft is assumed approved and published at its slot. There
+is no storage, network or LLM involved, so a year of days runs in milliseconds and
+parameter grids can be swept from scripts/run_local.py --simulate.
+"""
+
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import product
+
+from agent.models import ContentQueue
+from agent.nodes.plan import (
+    DEFAULT_CHANNELS,
+    HALF_LIFE_DAYS,
+    PIPELINE_TARGET,
+    _weighted_draw,
+)
+from agent.publish_index import build_last_published, publish_time
+from agent.slot_calendar import SlotCalendar
+from agent.utils import normalize_url
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of one simulated run."""
+
+    days: int
+    seed: int
+    half_life_days: float
+    pipeline_target: int
+    registry_size: int
+    posts: int = 0
+    pages_published: int = 0  # distinct pages published during the run
+    planner_cpu_seconds: float = 0.0  # process time spent drawing and scheduling
+    # url -> days between consecutive publications within the run
+    repeat_intervals: dict[str, list[float]] = field(default_factory=dict)
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of the registry published at least once during the run."""
+        return self.pages_published / self.registry_size if self.registry_size else 0.0
+
+    def interval_stats(self) -> dict[str, float]:
+        intervals = [d for values in self.repeat_intervals.values() for d in values]
+        if not intervals:
+            return {"repeats": 0, "min": 0.0, "median": 0.0, "mean": 0.0}
+        return {
+            "repeats": len(intervals),
+            "min": min(intervals),
+            "median": statistics.median(intervals),
+            "mean": statistics.fmean(intervals),
+        }
+
+
+def synthetic_registry(size: int) -> list[str]:
+    return [f"https://example.com/blog/post-{i}" for i in range(size)]
+
+
+def default_start(queue: ContentQueue | None = None) -> datetime:
+    """Where a simulation starts: the snapshot's latest publication, else today 06:00 UTC."""
+    if queue is not None and queue.published:
+        return max(publish_time(d) for d in queue.published)
+    return datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+
+
+def simulate_plan(
+    registry_urls: list[str],
+    days: int,
+    seed: int = 0,
+    half_life_days: float = HALF_LIFE_DAYS,
+    pipeline_target: int = PIPELINE_TARGET,
+    queue: ContentQueue | None = None,
+    start: datetime | None = None,
+) -> SimulationResult:
+    """Simulate ``days`` daily runs against ``registry_urls``.
+
+    ``queue`` is an optional snapshot: its publish history seeds the last-published
+    times and its pending drafts and future-approved posts start in the pipeline.
+    ``start`` defaults to default_start(queue), so a snapshot's history lies before
+    the simulated days rather than after them. The same seed and inputs (including
+    ``start``) always give the same result (apart from CPU time).
+    """
+    rng = random.Random(seed)
+    start = start or default_start(queue)
+    registry_urls = [normalize_url(u) for u in registry_urls]
+    last_published: dict[str, datetime] = {}
+    # Pending pipeline items: (slot, channel, url)
+    pending: list[tuple[datetime, str, str]] = []
+    if queue is not None:
+        index = build_last_published(queue)
+        last_published = {url: e.last_published_at for url, e in index.pages.items()}
+        for draft in [*queue.drafts, *queue.approved]:
+            if draft.link and draft.scheduled_at and publish_time(draft) > start:
+                pending.append((publish_time(draft), draft.channel, normalize_url(draft.link)))
+
+    result = SimulationResult(
+        days=days,
+        seed=seed,
+        half_life_days=half_life_days,
+        pipeline_target=pipeline_target,
+        registry_size=len(registry_urls),
+    )
+    published_pages: set[str] = set()
+
+    for day in range(days):
+        now = start + timedelta(days=day)
+
+        # Publish: everything whose slot has passed goes out.
+        due = [item for item in pending if item[0] <= now]
+        pending = [item for item in pending if item[0] > now]
+        for slot, _, url in sorted(due):
+            if url in published_pages:
+                interval = (slot - last_published[url]).total_seconds() / 86400.0
+                result.repeat_intervals.setdefault(url, []).append(interval)
+            last_published[url] = slot
+            published_pages.add(url)
+            result.posts += 1
+
+        # Plan: refill the pipeline like plan_node does.
+        needed = pipeline_target - len(pending)
+        if needed <= 0:
+            continue
+        cpu_start = time.process_time()
+        blocked = {url for _, _, url in pending}
+        draw_urls = [url for url in registry_urls if url not in blocked]
+        last_days = {
+            url: (now - ts).total_seconds() / 86400.0 for url, ts in last_published.items()
+        }
+        chosen = _weighted_draw(draw_urls, last_days, needed, half_life_days, rng=rng)
+        calendar = SlotCalendar(channels=DEFAULT_CHANNELS)
+        for slot, channel, url in pending:
+            calendar.book(slot, channel, url)
+        refs = [str(page["page_url"]) for page in chosen]
+        for (channel, slot), url in zip(calendar.allocate(len(refs), now, refs=refs), refs):
+            pending.append((slot, channel, url))
+        result.planner_cpu_seconds += time.process_time() - cpu_start
+
+    result.pages_published = len(published_pages)
+    return result
+
+
+def sweep(
+    registry_urls: list[str],
+    days: int,
+    half_lives: list[float],
+    pipeline_targets: list[int],
+    seed: int = 0,
+    queue: ContentQueue | None = None,
+    start: datetime | None = None,
+) -> list[SimulationResult]:
+    """simulate_plan over the grid of half-lives x pipeline targets, same seed for each."""
+    start = start or default_start(queue)
+    return [
+        simulate_plan(
+            registry_urls,
+            days,
+            seed=seed,
+            half_life_days=half_life,
+            pipeline_target=target,
+            queue=queue,
+            start=start,
+        )
+        for half_life, target in product(half_lives, pipeline_targets)
+    ]
@@ -1,43 +1,179 @@
-"""Bluesky AT Protocol client for posting and metrics."""
+"""Bluesky AT Protocol client for posting and metrics.
 
-from datetime import datetime, timezone
+With ``storage``, the session (access and refresh JWTs) is persisted under its own
+key and reused across runs: a still-valid access token is used as is, one close to
+expiry is renewed with refreshSession, and createSession (slow and tightly rate
+limited by the PDS) is only the fallback. A request failing with ExpiredToken
+refreshes the session and is retried once.
+"""
+
+import base64
+import json
+import logging
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 import httpx
 
+from agent.models import BlueskySession
+from agent.platforms.ratelimit import RateLimitedTransport
+
+logger = logging.getLogger("growth-agent")
+
+BLUESKY_SESSION_KEY = "bluesky_session.json"
+POSTS_BATCH_SIZE = 25  # getPosts accepts at most 25 URIs
+POSTS_BATCH_WORKERS = 4
+FEED_PAGE_SIZE = 100  # getAuthorFeed maximum
+_REASON_PIN = "app.bsky.feed.defs#reasonPin"
+SESSION_REFRESH_MARGIN = timedelta(minutes=5)  # renew access tokens this close to expiry
+_EXPIRED_ERRORS = {"ExpiredToken", "InvalidToken"}
+
+
+def _jwt_expiry(token: str) -> datetime | None:
+    """The unverified ``exp`` claim of a JWT, or None if it cannot be read."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return datetime.fromtimestamp(int(claims["exp"]), tz=timezone.utc)
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _is_valid(expires_at: datetime | None, now: datetime) -> bool:
+    return expires_at is not None and expires_at - SESSION_REFRESH_MARGIN > now
+
+
+def _is_expired_token(resp: httpx.Response) -> bool:
+    try:
+        data = resp.json()
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("error") in _EXPIRED_ERRORS
+
 
 class BlueskyClient:
     """Minimal AT Protocol client for Bluesky posting."""
 
     BASE_URL = "https://bsky.social/xrpc"
 
-    def __init__(self, handle: str, app_password: str):
+    def __init__(
+        self,
+        handle: str,
+        app_password: str,
+        storage=None,
+        transport: httpx.BaseTransport | None = None,
+    ):
         self.handle = handle
-        self.client = httpx.Client(timeout=30)
-        self._did: str | None = None
-        self._access_jwt: str | None = None
-        self._login(handle, app_password)
+        self.storage = storage
+        self.transport = RateLimitedTransport(transport)
+        self.client = httpx.Client(timeout=30, transport=self.transport)
+        self._app_password = app_password
+        self._session: BlueskySession | None = None
+        self._session_lock = threading.Lock()
+        self._start_session()
+
+    # -- session handling --------------------------------------------------
 
-    def _login(self, handle: str, app_password: str) -> None:
+    def _start_session(self) -> None:
+        session = self._load_session()
+        now = datetime.now(timezone.utc)
+        if session is not None and _is_valid(session.access_expires_at, now):
+            self._use_session(session)
+            logger.info("Bluesky: reusing stored session")
+        elif session is not None and _is_valid(session.refresh_expires_at, now):
+            self._session = session
+            self._refresh_or_login()
+        else:
+            self._login()
+
+    def _load_session(self) -> BlueskySession | None:
+        if self.storage is None:
+            return None
+        data = self.storage.read(BLUESKY_SESSION_KEY)
+        if not data:
+            return None
+        try:
+            session = BlueskySession.model_validate(data)
+        except ValueError:
+            logger.warning("Ignoring unreadable %s", BLUESKY_SESSION_KEY)
+            return None
+        return session if session.handle == self.handle else None
+
+    def _use_session(self, session: BlueskySession) -> None:
+        self._session = session
+        self.client.headers["Authorization"] = f"Bearer {session.access_jwt}"
+
+    def _store_session(self, data: dict) -> None:
+        session = BlueskySession(
+            handle=self.handle,
+            did=data["did"],
+            access_jwt=data["accessJwt"],
+            refresh_jwt=data["refreshJwt"],
+            access_expires_at=_jwt_expiry(data["accessJwt"]),
+            refresh_expires_at=_jwt_expiry(data["refreshJwt"]),
+            updated_at=datetime.now(timezone.utc),
+        )
+        self._use_session(session)
+        if self.storage is not None:
+            self.storage.write(BLUESKY_SESSION_KEY, session)
+
+    def _login(self) -> None:
         resp = self.client.post(
             f"{self.BASE_URL}/com.atproto.server.createSession",
-            json={"identifier": handle, "password": app_password},
+            json={"identifier": self.handle, "password": self._app_password},
         )
         resp.raise_for_status()
-        data = resp.json()
-        self._did = data["did"]
-        self._access_jwt = data["accessJwt"]
-        self.client.headers["Authorization"] = f"Bearer {self._access_jwt}"
+        self._store_session(resp.json())
+        logger.info("Bluesky: created new session")
+
+    def _refresh_or_login(self) -> None:
+        """Renew the session with its refresh token, logging in again if that fails."""
+        assert self._session is not None
+        resp = self.client.post(
+            f"{self.BASE_URL}/com.atproto.server.refreshSession",
+            headers={"Authorization": f"Bearer {self._session.refresh_jwt}"},
+        )
+        if resp.is_success:
+            self._store_session(resp.json())
+            logger.info("Bluesky: refreshed session")
+        else:
+            logger.info("Bluesky: refreshSession returned %d — logging in", resp.status_code)
+            self._login()
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Authenticated request; an expired token is refreshed and the call retried once."""
+        sent_with = self._session.access_jwt if self._session else None
+        resp = self.client.request(method, f"{self.BASE_URL}/{path}", **kwargs)
+        if resp.status_code not in (400, 401) or not _is_expired_token(resp):
+            return resp
+        with self._session_lock:
+            # Another thread may already have refreshed the session.
+            if self._session is None or self._session.access_jwt == sent_with:
+                if self._session is None:
+                    self._login()
+                else:
+                    self._refresh_or_login()
+        return self.client.request(method, f"{self.BASE_URL}/{path}", **kwargs)
 
     @property
     def did(self) -> str:
-        assert self._did is not None
-        return self._did
+        assert self._session is not None
+        return self._session.did
 
     def get_profile(self) -> dict:
-        resp = self.client.get(
-            f"{self.BASE_URL}/app.bsky.actor.getProfile",
-            params={"actor": self.did},
-        )
+        resp = self._request("GET", "app.bsky.actor.getProfile", params={"actor": self.did})
         resp.raise_for_status()
         return resp.json()
 
@@ -52,8 +188,9 @@ class BlueskyClient:
             facets = self._detect_link_facet(text, link)
             if facets:
                 record["facets"] = facets
-        resp = self.client.post(
-            f"{self.BASE_URL}/com.atproto.repo.createRecord",
+        resp = self._request(
+            "POST",
+            "com.atproto.repo.createRecord",
             json={
                 "repo": self.did,
                 "collection": "app.bsky.feed.post",
@@ -64,8 +201,9 @@ class BlueskyClient:
         return resp.json()
 
     def delete_post(self, rkey: str) -> None:
-        resp = self.client.post(
-            f"{self.BASE_URL}/com.atproto.repo.deleteRecord",
+        resp = self._request(
+            "POST",
+            "com.atproto.repo.deleteRecord",
             json={
                 "repo": self.did,
                 "collection": "app.bsky.feed.post",
@@ -75,25 +213,73 @@ class BlueskyClient:
         resp.raise_for_status()
 
     def get_author_feed(self, limit: int = 20) -> list[dict]:
-        resp = self.client.get(
-            f"{self.BASE_URL}/app.bsky.feed.getAuthorFeed",
+        resp = self._request(
+            "GET",
+            "app.bsky.feed.getAuthorFeed",
             params={"actor": self.did, "limit": limit},
         )
         resp.raise_for_status()
         return resp.json().get("feed", [])
 
+    def iter_author_feed(
+        self, since: datetime | None = None, page_size: int = FEED_PAGE_SIZE
+    ) -> Iterator[dict]:
+        """Yield the account's feed items newest first, following the cursor across pages.
+
+        With ``since``, stops at the first item indexed at or before it, so an
+        incremental sync reads only new items. A repost is placed by when it was
+        reposted, not by the original post's date. Pinned posts are yielded but
+        never stop the iteration, as they are out of order.
+        """
+        if since is not None:
+            # indexedAt is always aware; treat a naive ``since`` as UTC.
+            since = (
+                since.replace(tzinfo=timezone.utc)
+                if since.tzinfo is None
+                else since.astimezone(timezone.utc)
+            )
+        cursor: str | None = None
+        while True:
+            params: dict = {"actor": self.did, "limit": page_size}
+            if cursor:
+                params["cursor"] = cursor
+            resp = self._request("GET", "app.bsky.feed.getAuthorFeed", params=params)
+            resp.raise_for_status()
+            data = resp.json()
+            for item in data.get("feed", []):
+                reason = item.get("reason")
+                if reason is None:
+                    indexed_at = _parse_time(item.get("post", {}).get("indexedAt"))
+                elif reason.get("$type") == _REASON_PIN:
+                    indexed_at = None
+                else:
+                    indexed_at = _parse_time(reason.get("indexedAt"))
+                if since and indexed_at and indexed_at <= since:
+                    return
+                yield item
+            cursor = data.get("cursor")
+            if not cursor or not data.get("feed"):
+                return
+
     def get_posts(self, uris: list[str]) -> list[dict]:
-        """Fetch posts by AT URI in batches of 25, returning post objects with engagement counts."""
-        posts = []
-        for i in range(0, len(uris), 25):
-            batch = uris[i : i + 25]
-            resp = self.client.get(
-                f"{self.BASE_URL}/app.bsky.feed.getPosts",
-                params=[("uris", u) for u in batch],
+        """Fetch posts by AT URI in batches of 25, returning post objects with engagement counts.
+
+        Batches are requested concurrently (at most POSTS_BATCH_WORKERS at a time);
+        results keep the order of ``uris``. A failing batch raises.
+        """
+        batches = [uris[i : i + POSTS_BATCH_SIZE] for i in range(0, len(uris), POSTS_BATCH_SIZE)]
+        if not batches:
+            return []
+
+        def fetch(batch: list[str]) -> list[dict]:
+            resp = self._request(
+                "GET", "app.bsky.feed.getPosts", params=[("uris", u) for u in batch]
             )
             resp.raise_for_status()
-            posts.extend(resp.json().get("posts", []))
-        return posts
+            return resp.json().get("posts", [])
+
+        with ThreadPoolExecutor(max_workers=min(POSTS_BATCH_WORKERS, len(batches))) as pool:
+            return [post for posts in pool.map(fetch, batches) for post in posts]
 
     @staticmethod
     def _detect_link_facet(text: str, link: str) -> list[dict]:
@@ -111,6 +297,7 @@ class BlueskyClient:
         ]
 
     def close(self) -> None:
+        logger.info("Bluesky rate limits: %s", self.transport.summary())
         self.client.close()
 
     def __enter__(self):
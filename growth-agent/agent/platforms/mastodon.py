@@ -1,18 +1,44 @@
 """Mastodon REST API client for posting and metrics."""
 
+import logging
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
 
+from agent.platforms.ratelimit import RateLimitedTransport
+
+logger = logging.getLogger("growth-agent")
+
+STATUSES_BATCH_SIZE = 20  # Mastodon's default cap on id[] per GET /api/v1/statuses
+SINGLE_FETCH_WORKERS = 4  # concurrency of the per-status fallback
+ACCOUNT_STATUSES_PAGE_SIZE = 40  # Mastodon's maximum limit for account statuses
+# Whether an instance serves GET /api/v1/statuses?id[]= (Mastodon >= 4.3), by base URL.
+# Process-wide, so warm invocations skip the probe.
+_MULTI_GET_SUPPORT: dict[str, bool] = {}
+
 
 class MastodonClient:
     """Minimal Mastodon API client for posting statuses."""
 
     def __init__(self, instance: str, access_token: str):
         self.base_url = instance.rstrip("/")
+        self.transport = RateLimitedTransport()
         self.client = httpx.Client(
             base_url=self.base_url,
             headers={"Authorization": f"Bearer {access_token}"},
             timeout=30,
+            transport=self.transport,
         )
+        self.request_latencies: list[float] = []  # seconds, per status read request
+
+    def _get(self, path: str, params: dict | None = None) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            return self.client.get(path, params=params)
+        finally:
+            self.request_latencies.append(time.perf_counter() - start)
 
     def verify_credentials(self) -> dict:
         resp = self.client.get("/api/v1/accounts/verify_credentials")
@@ -38,16 +64,109 @@ class MastodonClient:
         resp.raise_for_status()
 
     def get_status(self, status_id: str) -> dict:
-        resp = self.client.get(f"/api/v1/statuses/{status_id}")
+        resp = self._get(f"/api/v1/statuses/{status_id}")
         resp.raise_for_status()
         return resp.json()
 
+    def get_statuses(self, status_ids: list[str]) -> dict[str, dict]:
+        """Fetch many statuses, returning {id: status} for those that could be fetched.
+
+        Uses the multi-id endpoint in batches of STATUSES_BATCH_SIZE where the instance
+        supports it, and concurrent single fetches otherwise. Statuses that are gone
+        or fail individually are missing from the result.
+        """
+        ids = list(dict.fromkeys(status_ids))
+        statuses: dict[str, dict] = {}
+        fallback: list[str] = []
+        for start in range(0, len(ids), STATUSES_BATCH_SIZE):
+            batch = ids[start : start + STATUSES_BATCH_SIZE]
+            fetched = self._get_statuses_batch(batch)
+            if fetched is None:
+                fallback.extend(batch)
+            else:
+                statuses.update(fetched)
+        if fallback:
+            statuses.update(self._get_statuses_single(fallback))
+        return statuses
+
+    def _get_statuses_batch(self, batch: list[str]) -> dict[str, dict] | None:
+        """One multi-id request; None if the instance lacks the endpoint or it failed."""
+        if not _MULTI_GET_SUPPORT.get(self.base_url, True):
+            return None
+        try:
+            resp = self._get("/api/v1/statuses", params={"id[]": batch})
+        except httpx.HTTPError:
+            logger.warning("Mastodon multi-status request failed — falling back")
+            return None
+        if resp.status_code in (404, 405, 501):
+            self._mark_unsupported()
+            return None
+        if not resp.is_success:
+            logger.warning("Mastodon multi-status request returned %d", resp.status_code)
+            return None
+        try:
+            body = resp.json()
+        except ValueError:
+            logger.warning("Mastodon multi-status response is not JSON — falling back")
+            return None
+        if not isinstance(body, list):
+            self._mark_unsupported()
+            return None
+        _MULTI_GET_SUPPORT[self.base_url] = True
+        return {str(s["id"]): s for s in body if isinstance(s, dict) and "id" in s}
+
+    def _mark_unsupported(self) -> None:
+        logger.info("%s has no multi-status endpoint — using single fetches", self.base_url)
+        _MULTI_GET_SUPPORT[self.base_url] = False
+
+    def _get_statuses_single(self, status_ids: list[str]) -> dict[str, dict]:
+        def fetch(status_id: str) -> dict | None:
+            try:
+                return self.get_status(status_id)
+            except Exception:
+                logger.warning("Failed to fetch Mastodon status %s", status_id)
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(SINGLE_FETCH_WORKERS, len(status_ids))) as pool:
+            results = list(pool.map(fetch, status_ids))
+        return {sid: status for sid, status in zip(status_ids, results) if status is not None}
+
     def get_account_statuses(self, account_id: str, limit: int = 20) -> list[dict]:
         resp = self.client.get(f"/api/v1/accounts/{account_id}/statuses", params={"limit": limit})
         resp.raise_for_status()
         return resp.json()
 
+    def iter_account_statuses(
+        self,
+        account_id: str,
+        since_id: str | None = None,
+        page_size: int = ACCOUNT_STATUSES_PAGE_SIZE,
+        max_pages: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield an account's statuses newest first, following ``max_id`` pagination.
+
+        With ``since_id`` only statuses newer than it are returned. Stops at the first
+        empty page or after ``max_pages`` pages.
+        """
+        max_id: str | None = None
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            params: dict = {"limit": page_size}
+            if since_id:
+                params["since_id"] = since_id
+            if max_id:
+                params["max_id"] = max_id
+            resp = self._get(f"/api/v1/accounts/{account_id}/statuses", params=params)
+            resp.raise_for_status()
+            page = resp.json()
+            pages += 1
+            if not page:
+                return
+            yield from page
+            max_id = str(page[-1]["id"])
+
     def close(self) -> None:
+        logger.info("Mastodon rate limits: %s", self.transport.summary())
         self.client.close()
 
     def __enter__(self):
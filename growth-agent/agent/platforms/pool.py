@@ -0,0 +1,77 @@
+"""Run-scoped platform clients, shared by ingest, metrics and publish.
+
+Each client is created on first use, one per platform account, so a run logs in to
+Bluesky once (or not at all, with a stored session) and reuses one connection pool
+per platform. The handler closes the pool when the run ends. Functions called
+outside a run create a pool of their own (see ``borrowed_pool``).
+"""
+
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from agent.platforms.bluesky import BlueskyClient
+from agent.platforms.mastodon import MastodonClient
+
+logger = logging.getLogger("growth-agent")
+
+
+class ClientPool:
+    """Lazily created, authenticated platform clients keyed by platform and account."""
+
+    def __init__(self, storage=None):
+        self.storage = storage  # lets BlueskyClient persist and reuse its session
+        self._clients: dict[tuple[str, str], MastodonClient | BlueskyClient] = {}
+        self._lock = threading.Lock()
+
+    def mastodon(self, instance: str | None = None) -> MastodonClient:
+        instance = instance or os.environ.get("MASTODON_INSTANCE", "https://mastodon.social")
+        with self._lock:
+            client = self._clients.get(("mastodon", instance))
+            if client is None:
+                client = MastodonClient(
+                    instance=instance, access_token=os.environ["MASTODON_ACCESS_TOKEN"]
+                )
+                self._clients[("mastodon", instance)] = client
+        return client  # type: ignore[return-value]
+
+    def bluesky(self, handle: str | None = None) -> BlueskyClient:
+        handle = handle or os.environ.get("BLUESKY_HANDLE", "fretchen.eu")
+        with self._lock:
+            client = self._clients.get(("bluesky", handle))
+            if client is None:
+                client = BlueskyClient(
+                    handle=handle,
+                    app_password=os.environ["BLUESKY_APP_PASSWORD"],
+                    storage=self.storage,
+                )
+                self._clients[("bluesky", handle)] = client
+        return client  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Close every client created so far; safe to call more than once."""
+        with self._lock:
+            clients, self._clients = list(self._clients.items()), {}
+        for (platform, account), client in clients:
+            try:
+                client.close()
+            except Exception:
+                logger.warning("Failed to close %s client for %s", platform, account)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+@contextmanager
+def borrowed_pool(clients: ClientPool | None, storage=None) -> Iterator[ClientPool]:
+    """Yield ``clients`` untouched, or a temporary pool closed on exit if it is None."""
+    if clients is not None:
+        yield clients
+        return
+    with ClientPool(storage) as own:
+        yield own
@@ -0,0 +1,195 @@
+"""Rate-limit-aware httpx transport shared by the platform clients.
+
+Reads the quota headers both platforms send: Mastodon's ``X-RateLimit-Limit``,
+``-Remaining`` and ``-Reset`` (ISO timestamp), and Bluesky's ``ratelimit-limit``,
+``-remaining`` and ``-reset`` (Unix seconds). Quota is tracked per host and endpoint.
+When an endpoint runs low, requests are spread over the time left until its reset.
+429 and transient 5xx responses are retried with jittered exponential backoff, and
+a 429 waits for the reset time when the server gives one. Non-idempotent requests
+(POST, DELETE, ...) are only retried on 429, so a 5xx never double-posts.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+logger = logging.getLogger("growth-agent")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.5
+MAX_WAIT_SECONDS = 60.0  # never sleep longer than this for one request; give up instead
+LOW_QUOTA_FRACTION = 0.1  # start pacing once remaining drops below this share of the limit
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9A-Za-z]{20,})$")
+
+
+@dataclass
+class Quota:
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None  # epoch seconds
+
+
+def endpoint_key(request: httpx.Request) -> str:
+    """``host/path`` with ID-like segments collapsed, e.g. ``host/api/v1/statuses/:id``."""
+    segments = [":id" if _ID_SEGMENT.match(s) else s for s in request.url.path.split("/")]
+    return f"{request.url.host}{'/'.join(segments)}"
+
+
+def _header(response: httpx.Response, name: str) -> str | None:
+    return response.headers.get(f"x-ratelimit-{name}") or response.headers.get(f"ratelimit-{name}")
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """Reset time as epoch seconds: Unix seconds (Bluesky) or an ISO timestamp (Mastodon)."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _retry_after(response: httpx.Response, now: float) -> float | None:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - now
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """Wraps another transport with quota tracking, pacing and retries."""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | None = None,
+        max_retries: int = MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._transport = transport or httpx.HTTPTransport()
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.quotas: dict[str, Quota] = {}
+        self.retries = 0
+        self.waited_seconds = 0.0
+
+    def _wait(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.waited_seconds += seconds
+        self._sleep(seconds)
+
+    def _pace(self, key: str) -> None:
+        """Spread the remaining quota over the time left until reset."""
+        with self._lock:
+            quota = self.quotas.get(key)
+        if quota is None or quota.remaining is None or quota.reset_at is None:
+            return
+        until_reset = quota.reset_at - self._clock()
+        if until_reset <= 0:
+            return
+        low_water = max(1, int((quota.limit or 0) * LOW_QUOTA_FRACTION))
+        if quota.remaining >= low_water:
+            return
+        delay = until_reset if quota.remaining <= 0 else until_reset / quota.remaining
+        self._wait(min(delay, MAX_WAIT_SECONDS))
+
+    def _record(self, key: str, response: httpx.Response) -> None:
+        remaining = _header(response, "remaining")
+        if remaining is None:
+            return
+        try:
+            quota = Quota(
+                limit=int(_header(response, "limit") or 0) or None,
+                remaining=int(remaining),
+                reset_at=_parse_reset(_header(response, "reset")),
+            )
+        except ValueError:
+            return
+        with self._lock:
+            self.quotas[key] = quota
+
+    def _backoff(self, key: str, response: httpx.Response, attempt: int) -> float:
+        now = self._clock()
+        jitter = random.uniform(0, BACKOFF_BASE_SECONDS)
+        if response.status_code == 429:
+            retry_after = _retry_after(response, now)
+            if retry_after is not None:
+                return retry_after + jitter
+            quota = self.quotas.get(key)
+            if quota is not None and quota.reset_at is not None and quota.reset_at > now:
+                return quota.reset_at - now + jitter
+        return BACKOFF_BASE_SECONDS * 2**attempt + jitter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = endpoint_key(request)
+        self._pace(key)
+        attempt = 0
+        while True:
+            response = self._transport.handle_request(request)
+            self._record(key, response)
+            retryable = response.status_code == 429 or (
+                response.status_code in RETRY_STATUSES and request.method in IDEMPOTENT_METHODS
+            )
+            if not retryable or attempt >= self.max_retries:
+                return response
+            delay = self._backoff(key, response, attempt)
+            if delay > MAX_WAIT_SECONDS:
+                logger.warning(
+                    "%s: %d, retry in %.0fs exceeds the wait cap — giving up",
+                    key,
+                    response.status_code,
+                    delay,
+                )
+                return response
+            response.close()
+            logger.info("%s: %d, retrying in %.1fs", key, response.status_code, delay)
+            with self._lock:
+                self.retries += 1
+            self._wait(delay)
+            attempt += 1
+
+    def summary(self) -> dict:
+        """Quota state and retry counters for the run log."""
+        now = self._clock()
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "waited_seconds": round(self.waited_seconds, 1),
+                "quotas": {
+                    key: {
+                        "remaining": q.remaining,
+                        "limit": q.limit,
+                        "reset_in": round(q.reset_at - now) if q.reset_at else None,
+                    }
+                    for key, q in self.quotas.items()
+                },
+            }
+
+    def close(self) -> None:
+        self._transport.close()
@@ -0,0 +1,76 @@
+"""Last-published index — per-page publish time and counts, kept current on publish.
+
+The planner reads this index instead of scanning the full publish history. It is
+rebuilt from ``queue.published`` whenever it is missing or its ``post_count`` does
+not match the history (e.g. after a crash between writing the queue and the index).
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from agent.models import ContentQueue, Draft, LastPublishedEntry, LastPublishedIndex
+from agent.storage import load_model
+from agent.utils import normalize_url
+
+logger = logging.getLogger("growth-agent")
+
+LAST_PUBLISHED_KEY = "last_published.json"
+
+
+def publish_time(draft: Draft) -> datetime:
+    """Timestamp the planner counts as a page's publication (slot time, UTC-aware)."""
+    ts = draft.scheduled_at or draft.created
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def record_published(index: LastPublishedIndex, draft: Draft) -> None:
+    """Fold one newly published draft into the index."""
+    index.post_count += 1
+    if not draft.link:
+        return
+    url = normalize_url(draft.link)
+    ts = publish_time(draft)
+    entry = index.pages.get(url)
+    if entry is None:
+        entry = index.pages[url] = LastPublishedEntry(last_published_at=ts)
+    elif ts > entry.last_published_at:
+        entry.last_published_at = ts
+    entry.counts[draft.channel] = entry.counts.get(draft.channel, 0) + 1
+
+
+def build_last_published(queue: ContentQueue) -> LastPublishedIndex:
+    """Build the index from the full publish history."""
+    index = LastPublishedIndex(rebuilt_at=datetime.now(timezone.utc))
+    for draft in queue.published:
+        record_published(index, draft)
+    return index
+
+
+def rebuild_last_published(storage, queue: ContentQueue | None = None) -> LastPublishedIndex:
+    """Rebuild last_published.json from queue.published and persist it."""
+    if queue is None:
+        queue = load_model(storage, "content_queue.json", ContentQueue)
+    index = build_last_published(queue)
+    storage.write(LAST_PUBLISHED_KEY, index)
+    logger.info(
+        "Rebuilt %s (%d pages, %d posts)", LAST_PUBLISHED_KEY, len(index.pages), index.post_count
+    )
+    return index
+
+
+def load_last_published(storage, queue: ContentQueue) -> LastPublishedIndex:
+    """Load the index, rebuilding it if missing or out of sync with ``queue``."""
+    data = storage.read(LAST_PUBLISHED_KEY)
+    if data is not None:
+        index = LastPublishedIndex.model_validate(data)
+        if index.post_count == len(queue.published):
+            return index
+        logger.warning(
+            "%s covers %d posts but history has %d — rebuilding",
+            LAST_PUBLISHED_KEY,
+            index.post_count,
+            len(queue.published),
+        )
+    return rebuild_last_published(storage, queue)
@@ -0,0 +1,174 @@
+"""Conditional, streaming sitemap fetching with sitemap-index support."""
+
+import gzip
+import io
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO
+
+import httpx
+from defusedxml import ElementTree as ET  # type: ignore[import-untyped]
+
+from agent.models import SitemapEntry, SitemapFile, SitemapState
+
+logger = logging.getLogger("growth-agent")
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+SITEMAP_FETCH_WORKERS = 4
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapFetch:
+    """Result of fetch_sitemap: flattened page entries and the state to persist."""
+
+    entries: list[SitemapEntry]
+    state: SitemapState
+    modified: bool  # False when every document was answered with 304
+    requests: int
+
+
+class _ChunkReader(io.RawIOBase):
+    """File-like adapter over an iterator of byte chunks (an httpx response stream)."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _open_body(response: httpx.Response) -> IO[bytes]:
+    """Stream the response body, transparently gunzipping .xml.gz sitemaps.
+
+    Content-Encoding: gzip is already decoded by httpx; this handles gzip files.
+    """
+    stream = io.BufferedReader(_ChunkReader(response.iter_bytes()))
+    if stream.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)  # type: ignore[return-value]
+    return stream
+
+
+def _parse_sitemap(source: IO[bytes]) -> tuple[str, list[SitemapEntry]]:
+    """Incrementally parse a urlset or sitemapindex, discarding each element once read."""
+    kind = "urlset"
+    entries: list[SitemapEntry] = []
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+                kind = elem.tag.removeprefix(SITEMAP_NS)
+            continue
+        if elem.tag in (f"{SITEMAP_NS}url", f"{SITEMAP_NS}sitemap"):
+            loc = (elem.findtext(f"{SITEMAP_NS}loc") or "").strip()
+            lastmod = (elem.findtext(f"{SITEMAP_NS}lastmod") or "").strip() or None
+            if loc:
+                entries.append(SitemapEntry(loc=loc, lastmod=lastmod))
+            assert root is not None  # set by the first start event
+            root.clear()
+    if kind not in ("urlset", "sitemapindex"):
+        raise ValueError(f"Unexpected sitemap root element: {kind!r}")
+    return kind, entries
+
+
+def _fetch_file(
+    client: httpx.Client, url: str, previous: SitemapFile | None
+) -> tuple[SitemapFile, bool]:
+    """Conditionally fetch one sitemap document. Returns (file, modified)."""
+    headers = {}
+    if previous is not None:
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+
+    with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+        if response.status_code == 304 and previous is not None:
+            return previous, False
+        response.raise_for_status()
+        kind, entries = _parse_sitemap(_open_body(response))
+        return (
+            SitemapFile(
+                kind=kind,  # type: ignore[arg-type]
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                entries=entries,
+            ),
+            True,
+        )
+
+
+def _fetch_child(
+    client: httpx.Client, url: str, previous: SitemapFile | None
+) -> tuple[SitemapFile | None, bool]:
+    """Fetch a child sitemap; on error keep its previous version if there is one."""
+    try:
+        return _fetch_file(client, url, previous)
+    except (httpx.HTTPError, ET.ParseError, ValueError):
+        logger.warning("Failed to fetch child sitemap %s — keeping previous entries", url)
+        return previous, False
+
+
+def fetch_sitemap(
+    url: str, state: SitemapState | None = None, client: httpx.Client | None = None
+) -> SitemapFetch:
+    """Fetch a sitemap (or sitemap index and its children) using stored validators.
+
+    An unchanged sitemap costs one 304. For an index, every child is then fetched
+    concurrently with its own conditional request, whether or not the index changed:
+    generators usually leave the index untouched when a child changes, so an
+    unchanged index costs one 304 per child.
+    """
+    state = state or SitemapState()
+    own_client = client is None
+    if own_client:
+        client = httpx.Client(timeout=30.0)
+    assert client is not None  # narrowing for mypy
+
+    try:
+        root_file, modified = _fetch_file(client, url, state.files.get(url))
+        files = {url: root_file}
+        requests = 1
+        if root_file.kind == "urlset":
+            entries = root_file.entries
+        else:
+            children = [e.loc for e in root_file.entries]
+            if children:
+                with ThreadPoolExecutor(
+                    max_workers=min(SITEMAP_FETCH_WORKERS, len(children))
+                ) as pool:
+                    results = list(
+                        pool.map(lambda c: _fetch_child(client, c, state.files.get(c)), children)
+                    )
+                for child, (child_file, child_modified) in zip(children, results):
+                    if child_file is not None:
+                        files[child] = child_file
+                    modified = modified or child_modified
+                requests += len(children)
+            entries = [e for c in children if c in files for e in files[c].entries]
+    finally:
+        if own_client:
+            client.close()
+
+    return SitemapFetch(
+        entries=entries,
+        state=SitemapState(files=files, fetched_at=datetime.now(timezone.utc)),
+        modified=modified,
+        requests=requests,
+    )
@@ -0,0 +1,152 @@
+"""Posting calendar: a sorted slot map with per-day slots, channel caps and blackouts.
+
+Bookings are kept sorted by time, so "what is booked between A and B" is a bisect
+(O(log n) plus the bookings returned) and checking a candidate slot never scans the
+whole queue. The queue stays the source of truth: the calendar is rebuilt from queued
+drafts and future-approved posts on every plan run, so approvals and rejections made
+in the approval UI (which edits content_queue.json only) are picked up by the next
+plan. calendar.json holds the editable config plus the bookings as of the last plan
+run; that snapshot is for inspection and is never read back as bookings.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+
+from agent.models import (
+    BlackoutWindow,
+    CalendarBooking,
+    CalendarConfig,
+    CalendarState,
+    ContentQueue,
+)
+
+CALENDAR_KEY = "calendar.json"
+DEFAULT_CHANNELS = ["mastodon", "bluesky"]
+CALENDAR_HORIZON_DAYS = 365  # allocation gives up rather than search further ahead
+
+
+def _to_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time(0), tzinfo=timezone.utc)
+
+
+def _merge_blackouts(windows: list[BlackoutWindow]) -> list[tuple[datetime, datetime]]:
+    """Sorted, non-overlapping [start, end) intervals."""
+    merged: list[tuple[datetime, datetime]] = []
+    for start, end in sorted((_to_utc(w.start), _to_utc(w.end)) for w in windows):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class SlotCalendar:
+    """Booked slots plus the rules for allocating new ones."""
+
+    def __init__(self, config: CalendarConfig | None = None, channels: list[str] | None = None):
+        self.config = config or CalendarConfig()
+        self.channels = [c for c in channels or [] if c] or list(DEFAULT_CHANNELS)
+        self._slot_times = sorted({time.fromisoformat(t) for t in self.config.slot_times}) or [
+            time(7)
+        ]
+        self._blackouts = _merge_blackouts(self.config.blackouts)
+        self._blackout_starts = [start for start, _ in self._blackouts]
+        # Parallel sorted lists: (at, seq) keys keep insertion order stable for equal times.
+        self._keys: list[tuple[datetime, int]] = []
+        self._bookings: list[CalendarBooking] = []
+
+    @classmethod
+    def from_queue(
+        cls,
+        queue: ContentQueue,
+        now: datetime,
+        config: CalendarConfig | None = None,
+        channels: list[str] | None = None,
+    ) -> "SlotCalendar":
+        """Calendar of upcoming queued drafts and approved posts."""
+        calendar = cls(config, channels)
+        for draft in [*queue.drafts, *queue.approved]:
+            if draft.scheduled_at and _to_utc(draft.scheduled_at) > now:
+                calendar.book(draft.scheduled_at, draft.channel, draft.id)
+        return calendar
+
+    def book(self, at: datetime, channel: str, ref: str = "") -> CalendarBooking:
+        booking = CalendarBooking(at=_to_utc(at), channel=channel, ref=ref)
+        key = (booking.at, len(self._bookings))
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._bookings.insert(index, booking)
+        return booking
+
+    def bookings_between(self, start: datetime, end: datetime) -> list[CalendarBooking]:
+        """Bookings with ``start <= at < end``, in time order."""
+        lo = bisect_left(self._keys, (_to_utc(start), -1))
+        hi = bisect_left(self._keys, (_to_utc(end), -1))
+        return self._bookings[lo:hi]
+
+    def is_blacked_out(self, at: datetime) -> bool:
+        index = bisect_right(self._blackout_starts, at) - 1
+        return index >= 0 and at < self._blackouts[index][1]
+
+    def _channel_for(self, day: date, start_index: int) -> str | None:
+        """First channel in rotation order from ``start_index`` still under its daily cap."""
+        booked = self.bookings_between(_day_start(day), _day_start(day + timedelta(days=1)))
+        for offset in range(len(self.channels)):
+            channel = self.channels[(start_index + offset) % len(self.channels)]
+            cap = self.config.channel_daily_capacity.get(channel)
+            if cap is None or sum(1 for b in booked if b.channel == channel) < cap:
+                return channel
+        return None
+
+    def allocate(
+        self, needed: int, now: datetime, refs: list[str] | None = None
+    ) -> list[tuple[str, datetime]]:
+        """Book up to ``needed`` (channel, slot) pairs from tomorrow onward, earliest first.
+
+        A day offers ``len(slot_times)`` slots minus what is already booked on it; slots
+        in a blackout or over a channel's daily cap are skipped. Channels rotate, and a
+        day with existing bookings continues the rotation after its first booked channel.
+        Returns fewer pairs only if the horizon runs out of free slots. ``refs`` labels
+        the new bookings in order (e.g. the page URLs being planned).
+        """
+        schedule: list[tuple[str, datetime]] = []
+        first_day = (_to_utc(now) + timedelta(days=1)).date()
+        channel_index = 0
+        for offset in range(CALENDAR_HORIZON_DAYS):
+            if len(schedule) >= needed:
+                break
+            day = first_day + timedelta(days=offset)
+            booked = self.bookings_between(_day_start(day), _day_start(day + timedelta(days=1)))
+            if booked and booked[0].channel in self.channels:
+                channel_index = (self.channels.index(booked[0].channel) + 1) % len(self.channels)
+            free = len(self._slot_times) - len(booked)
+            taken = {b.at for b in booked}
+            for slot_time in self._slot_times:
+                if free <= 0 or len(schedule) >= needed:
+                    break
+                slot = datetime.combine(day, slot_time, tzinfo=timezone.utc)
+                if slot in taken or self.is_blacked_out(slot):
+                    continue
+                channel = self._channel_for(day, channel_index)
+                if channel is None:
+                    break
+                self.book(slot, channel, refs[len(schedule)] if refs else "")
+                schedule.append((channel, slot))
+                free -= 1
+                channel_index = (self.channels.index(channel) + 1) % len(self.channels)
+        return schedule
+
+    def to_state(self, now: datetime | None = None) -> CalendarState:
+        return CalendarState(
+            config=self.config,
+            bookings=list(self._bookings),
+            updated_at=now or datetime.now(timezone.utc),
+        )
@@ -7,10 +7,14 @@ class AgentState(TypedDict, total=False):
     """State flowing through the growth-agent graph."""
 
     storage: Any
+    llm_budget: Any  # agent.budget.LLMBudget shared by every LLM call of the run
+    clients: Any  # agent.platforms.pool.ClientPool, closed by the handler after the run
     is_monday: bool
     analytics_ok: bool
     published_ids: list[str]
     insights_ok: bool
+    insights_decision: str
     strategy_updated: bool
+    plan_seed: int | None  # sampling seed; None draws one (recorded in plan diagnostics)
     plan_created: bool
     drafts_created: int
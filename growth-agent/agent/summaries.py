@@ -0,0 +1,225 @@
+"""Article summary cache — one LLM summary per article version, keyed by content hash.
+
+Prompts only see meta descriptions unless an article summary is available. Summaries
+are generated once per article body and reused by later draft and insights runs; a
+changed body hashes differently and gets a fresh summary. Each entry keeps the page's
+ETag/Last-Modified, so later runs re-fetch conditionally and a 304 reuses the summary
+without downloading the body.
+"""
+
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import httpx
+
+from agent.budget import BudgetExceeded
+from agent.llm_client import LLMClient
+from agent.models import ArticleSummary, ArticleSummaryCache
+from agent.page_meta import ArticleFetch, fetch_article
+from agent.storage import load_model
+from agent.utils import normalize_url
+
+logger = logging.getLogger("growth-agent")
+
+ARTICLE_SUMMARIES_KEY = "article_summaries.json"
+SUMMARY_CACHE_MAX_ENTRIES = 200  # least recently used entries are evicted beyond this
+ARTICLE_TEXT_MAX_CHARS = 12_000  # article text sent to the summarizer (~3k tokens)
+SUMMARY_MAX_TOKENS = 250
+ARTICLE_FETCH_WORKERS = 4  # concurrent article downloads in summarize_pages
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of whitespace-normalized article text."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def _summary_prompt(title: str, text: str) -> str:
+    return f"""Summarize this blog article for someone writing social media posts about it.
+
+Title: {title}
+Article:
+---
+{text[:ARTICLE_TEXT_MAX_CHARS]}
+---
+
+Write 3-5 sentences in English: the core argument, the most specific concrete insights
+(numbers, results, examples) and who the article is for. Plain text, no markdown."""
+
+
+class ArticleSummaryStore:
+    """Read-through cache over article_summaries.json with an LRU size cap."""
+
+    def __init__(self, storage, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        self.storage = storage
+        self.max_entries = max_entries
+        self.cache = load_model(storage, ARTICLE_SUMMARIES_KEY, ArticleSummaryCache)
+        self.run_hits = 0
+        self.run_misses = 0
+        self.run_evictions = 0
+        self._dirty = False
+
+    def lookup(self, text: str) -> ArticleSummary | None:
+        """Summary for this exact article text, counting a hit or miss."""
+        entry = self.cache.entries.get(content_hash(text))
+        if entry is None:
+            self.run_misses += 1
+            self.cache.misses += 1
+            self._dirty = True
+            return None
+        return self._hit(entry)
+
+    def _latest_entry(self, url: str) -> ArticleSummary | None:
+        canonical = normalize_url(url)
+        entries = [e for e in self.cache.entries.values() if e.url == canonical]
+        return max(entries, key=lambda e: e.created_at) if entries else None
+
+    def latest_for_url(self, url: str) -> str | None:
+        """Most recent cached summary for a page, without fetching or counting a lookup."""
+        entry = self._latest_entry(url)
+        return entry.summary if entry else None
+
+    def _hit(self, entry: ArticleSummary) -> ArticleSummary:
+        self.run_hits += 1
+        self.cache.hits += 1
+        entry.last_used_at = datetime.now(timezone.utc)
+        self._dirty = True
+        return entry
+
+    def put(
+        self,
+        url: str,
+        text: str,
+        summary: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> ArticleSummary:
+        """Store a summary, replacing older versions of the same page."""
+        canonical = normalize_url(url)
+        now = datetime.now(timezone.utc)
+        self.cache.entries = {key: e for key, e in self.cache.entries.items() if e.url != canonical}
+        entry = ArticleSummary(
+            url=canonical,
+            content_hash=content_hash(text),
+            summary=summary,
+            created_at=now,
+            last_used_at=now,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self.cache.entries[entry.content_hash] = entry
+        self._evict()
+        self._dirty = True
+        return entry
+
+    def _evict(self) -> None:
+        overflow = len(self.cache.entries) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = sorted(self.cache.entries.values(), key=lambda e: e.last_used_at)[:overflow]
+        for entry in oldest:
+            del self.cache.entries[entry.content_hash]
+        self.run_evictions += overflow
+        self.cache.evictions += overflow
+
+    def get_or_create(
+        self,
+        llm: LLMClient,
+        url: str,
+        title: str,
+        text: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> str | None:
+        """Cached summary for ``text``, summarizing on a miss. None if skipped or failed.
+
+        ``etag``/``last_modified`` are the validators the text was fetched with.
+        """
+        entry = self.lookup(text)
+        if entry is not None:
+            if etag or last_modified:
+                entry.etag, entry.last_modified = etag, last_modified
+            return entry.summary
+        if not llm.admit("summarize"):
+            return None
+        try:
+            result = llm.chat(
+                messages=[
+                    {"role": "system", "content": "You summarize technical blog articles."},
+                    {"role": "user", "content": _summary_prompt(title, text)},
+                ],
+                temperature=0.2,
+                max_tokens=SUMMARY_MAX_TOKENS,
+                purpose="summarize",
+            )
+        except BudgetExceeded:
+            return None
+        except Exception:
+            logger.exception("Article summary failed for %s", url)
+            return None
+        summary = result["content"].strip()
+        if not summary:
+            return None
+        return self.put(url, text, summary, etag=etag, last_modified=last_modified).summary
+
+    def summarize_pages(self, llm: LLMClient, pages: list[tuple[str, str]]) -> dict[str, str]:
+        """Fetch each (url, title) page and return {url: summary} for those available.
+
+        Pages are downloaded concurrently (at most ARTICLE_FETCH_WORKERS at a time);
+        summarizing runs one page after another. Pages with a cached summary are
+        requested conditionally; on 304 the cached summary is used as is.
+        """
+        titles: dict[str, str] = {}
+        for url, title in pages:
+            titles.setdefault(url, title)
+        if not titles:
+            return {}
+        cached = {url: self._latest_entry(url) for url in titles}
+
+        def fetch(url: str) -> ArticleFetch | None:
+            entry = cached[url]
+            return fetch_article(
+                url,
+                client=client,
+                etag=entry.etag if entry else None,
+                last_modified=entry.last_modified if entry else None,
+            )
+
+        with (
+            httpx.Client(timeout=15.0) as client,
+            ThreadPoolExecutor(max_workers=min(ARTICLE_FETCH_WORKERS, len(titles))) as pool,
+        ):
+            results = dict(zip(titles, pool.map(fetch, titles)))
+
+        summaries: dict[str, str] = {}
+        for url, result in results.items():
+            if result is None:
+                continue
+            entry = cached[url]
+            if result.text is None:  # 304: the summarized version is still current
+                assert entry is not None
+                summaries[url] = self._hit(entry).summary
+                continue
+            summary = self.get_or_create(
+                llm, url, titles[url], result.text, result.etag, result.last_modified
+            )
+            if summary:
+                summaries[url] = summary
+        return summaries
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.run_hits,
+            "misses": self.run_misses,
+            "evictions": self.run_evictions,
+            "entries": len(self.cache.entries),
+        }
+
+    def save(self) -> None:
+        """Persist entries and counters if anything changed this run."""
+        if not self._dirty:
+            return
+        self.storage.write(ARTICLE_SUMMARIES_KEY, self.cache)
+        self._dirty = False
+        logger.info("Article summaries: %s", self.stats())
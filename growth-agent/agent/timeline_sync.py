@@ -0,0 +1,216 @@
+"""Incremental Mastodon timeline and Bluesky author-feed sync.
+
+Each run pages through the account's posts newer than the last one seen (Mastodon:
+``since_id``, then ``max_id`` to walk back; Bluesky: the feed cursor, stopping at the
+last ``indexedAt``). It matches them to published drafts: by known ``platform_id``,
+else by link and text. A matched draft with no ``platform_id`` gets it backfilled,
+which is the recovery notebooks/08 used to do by hand. The posts already carry
+engagement counts, so they are handed to the metrics refresh and those posts are
+not fetched again.
+"""
+
+import logging
+import re
+from datetime import datetime, timezone
+from html import unescape
+from itertools import islice
+
+from agent.models import BlueskyFeedState, ContentQueue, Draft, MastodonTimelineState
+from agent.platforms.bluesky import BlueskyClient
+from agent.platforms.mastodon import MastodonClient
+from agent.storage import load_model
+from agent.utils import normalize_url
+
+logger = logging.getLogger("growth-agent")
+
+TIMELINE_STATE_KEY = "mastodon_timeline.json"
+BLUESKY_FEED_STATE_KEY = "bluesky_feed.json"
+# Without a stored cursor, look back this many pages (of 40 statuses) only.
+INITIAL_SYNC_PAGES = 3
+# Same for the Bluesky feed, in items.
+INITIAL_SYNC_ITEMS = 120
+_LINK_FACET = "app.bsky.richtext.facet#link"
+
+_TAG = re.compile(r"<[^>]+>")
+_HREF = re.compile(r'href="([^"]+)"')
+_URL = re.compile(r"https?://\S+")
+
+
+def _plain_text(html: str) -> str:
+    # Drop tags without inserting spaces: Mastodon splits a URL across <span>s.
+    return unescape(_TAG.sub("", html.replace("<br>", "\n").replace("</p>", "\n")))
+
+
+def _text_key(text: str) -> str:
+    """Post text with URLs removed and whitespace collapsed, for matching."""
+    return " ".join(_URL.sub(" ", text).split()).lower()
+
+
+def _links(html: str) -> set[str]:
+    return {normalize_url(unescape(href)) for href in _HREF.findall(html)}
+
+
+def _parse_time(value: object) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _created_at(status: dict) -> datetime | None:
+    return _parse_time(status["created_at"]) if "created_at" in status else None
+
+
+def match_status(status: dict, candidates: list[Draft]) -> Draft | None:
+    """The draft among ``candidates`` that Mastodon ``status`` was published from, if any."""
+    html = status.get("content") or ""
+    return _best_match(candidates, _links(html), _text_key(_plain_text(html)), _created_at(status))
+
+
+def match_bluesky_post(post: dict, candidates: list[Draft]) -> Draft | None:
+    """The draft among ``candidates`` that Bluesky ``post`` was published from, if any."""
+    record = post.get("record") or {}
+    links = {
+        normalize_url(feature["uri"])
+        for facet in record.get("facets") or []
+        for feature in facet.get("features") or []
+        if feature.get("$type") == _LINK_FACET and feature.get("uri")
+    }
+    external = ((record.get("embed") or {}).get("external") or {}).get("uri")
+    if external:
+        links.add(normalize_url(external))
+    created = _parse_time(record["createdAt"]) if record.get("createdAt") else None
+    return _best_match(candidates, links, _text_key(record.get("text") or ""), created)
+
+
+def _best_match(
+    candidates: list[Draft], links: set[str], text: str, created: datetime | None
+) -> Draft | None:
+    """A draft matches on its link or its text. When several do, drafts matching on
+    both win, then the one published (or scheduled) closest to ``created``.
+    """
+    scored = []
+    for draft in candidates:
+        link_match = bool(draft.link) and normalize_url(draft.link or "") in links
+        text_match = bool(text) and _text_key(draft.content) == text
+        if not (link_match or text_match):
+            continue
+        when = draft.published_at or draft.scheduled_at
+        distance = abs((when - created).total_seconds()) if when and created else float("inf")
+        scored.append((not (link_match and text_match), distance, draft))
+    if not scored:
+        return None
+    return min(scored, key=lambda item: item[:2])[2]
+
+
+def sync_mastodon_timeline(
+    storage, masto: MastodonClient, account_id: str, now: datetime | None = None
+) -> dict[str, dict]:
+    """Sync new account statuses into content_queue.json.
+
+    Returns {status id: status} for statuses that belong to published drafts.
+    """
+    now = now or datetime.now(timezone.utc)
+    state = load_model(storage, TIMELINE_STATE_KEY, MastodonTimelineState)
+    since_id = state.last_status_id if state.account_id == account_id else None
+    queue = load_model(storage, "content_queue.json", ContentQueue)
+    published = [d for d in queue.published if d.channel == "mastodon"]
+    by_platform_id = {d.platform_id: d for d in published if d.platform_id}
+    unmatched = [d for d in published if not d.platform_id]
+
+    statuses: dict[str, dict] = {}
+    newest = since_id
+    seen = backfilled = 0
+    for status in masto.iter_account_statuses(
+        account_id, since_id=since_id, max_pages=None if since_id else INITIAL_SYNC_PAGES
+    ):
+        status_id = str(status["id"])
+        seen += 1
+        if newest is None or (len(status_id), status_id) > (len(newest), newest):
+            newest = status_id
+        if status.get("reblog"):
+            continue
+        draft = by_platform_id.get(status_id)
+        if draft is None and unmatched:
+            draft = match_status(status, unmatched)
+            if draft is not None:
+                unmatched.remove(draft)
+                draft.platform_id = status_id
+                draft.published_at = draft.published_at or _created_at(status)
+                backfilled += 1
+        if draft is not None:
+            statuses[status_id] = status
+
+    if backfilled:
+        storage.write("content_queue.json", queue)
+    storage.write(
+        TIMELINE_STATE_KEY,
+        MastodonTimelineState(account_id=account_id, last_status_id=newest, synced_at=now),
+    )
+    logger.info(
+        "Mastodon timeline sync: %d new statuses, %d matched, %d platform_ids backfilled",
+        seen,
+        len(statuses),
+        backfilled,
+    )
+    return statuses
+
+
+def sync_bluesky_feed(
+    storage, bsky: BlueskyClient, did: str, now: datetime | None = None
+) -> dict[str, dict]:
+    """Sync new author-feed posts into content_queue.json.
+
+    Returns {AT URI: post} for the account's own posts that belong to published drafts.
+    """
+    now = now or datetime.now(timezone.utc)
+    state = load_model(storage, BLUESKY_FEED_STATE_KEY, BlueskyFeedState)
+    since = state.last_indexed_at if state.did == did else None
+    queue = load_model(storage, "content_queue.json", ContentQueue)
+    published = [d for d in queue.published if d.channel == "bluesky"]
+    by_platform_id = {d.platform_id: d for d in published if d.platform_id}
+    unmatched = [d for d in published if not d.platform_id]
+
+    feed = bsky.iter_author_feed(since=since)
+    if since is None:
+        feed = islice(feed, INITIAL_SYNC_ITEMS)
+    posts: dict[str, dict] = {}
+    newest = since
+    seen = backfilled = 0
+    for item in feed:
+        post = item.get("post") or {}
+        uri = post.get("uri")
+        if not uri or item.get("reason") or (post.get("author") or {}).get("did") != did:
+            continue  # reposts, pinned posts, other authors
+        seen += 1
+        indexed_at = _parse_time(post["indexedAt"]) if post.get("indexedAt") else None
+        if indexed_at and (newest is None or indexed_at > newest):
+            newest = indexed_at
+        draft = by_platform_id.get(uri)
+        if draft is None and unmatched:
+            draft = match_bluesky_post(post, unmatched)
+            if draft is not None:
+                unmatched.remove(draft)
+                draft.platform_id = uri
+                record_created = (post.get("record") or {}).get("createdAt")
+                draft.published_at = draft.published_at or (
+                    _parse_time(record_created) if record_created else None
+                )
+                backfilled += 1
+        if draft is not None:
+            posts[uri] = post
+
+    if backfilled:
+        storage.write("content_queue.json", queue)
+    storage.write(
+        BLUESKY_FEED_STATE_KEY,
+        BlueskyFeedState(did=did, last_indexed_at=newest, synced_at=now),
+    )
+    logger.info(
+        "Bluesky feed sync: %d new posts, %d matched, %d platform_ids backfilled",
+        seen,
+        len(posts),
+        backfilled,
+    )
+    return posts
@@ -0,0 +1,54 @@
+"""Prompt size estimation for budgeting and trimming LLM prompts.
+
+tiktoken downloads its BPE file on first use. The container image pre-populates
+TIKTOKEN_CACHE_DIR at build time (see Dockerfile); the encoding is only loaded from
+that cache, so estimates never make a network call. Without a populated cache they
+fall back to a character count. To use tiktoken locally, set TIKTOKEN_CACHE_DIR and run
+``python -c "import tiktoken; tiktoken.get_encoding('cl100k_base')"`` once.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger("growth-agent")
+
+# cl100k is not the Llama/Mistral tokenizer, but tracks it closely enough for sizing prompts.
+TOKENIZER_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4
+# Where tiktoken fetches the encoding; its cache file is named by the SHA-1 of this URL.
+_ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+
+
+def _encoding_cached() -> bool:
+    cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR")
+    if not cache_dir:
+        return False
+    return (Path(cache_dir) / hashlib.sha1(_ENCODING_URL.encode()).hexdigest()).is_file()
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """Load the tiktoken encoding once from the local cache. None when it is not cached."""
+    if not _encoding_cached():
+        logger.info("tiktoken encoding not cached — estimating tokens from character count")
+        return None
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception:
+        logger.info("tiktoken encoding unavailable — estimating tokens from character count")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of ``text`` with tiktoken, or ~4 chars/token as fallback."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
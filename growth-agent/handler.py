@@ -14,7 +14,9 @@ import logging
 import os
 from datetime import datetime, timezone
 
+from agent.budget import LLMBudget
 from agent.graph import graph
+from agent.platforms.pool import ClientPool
 from agent.storage import S3Storage
 
 logger = logging.getLogger("growth-agent")
@@ -56,6 +58,8 @@ def handle(event, _context):
     log_key = f"logs/{now.strftime('%Y-%m-%d')}.json"
 
     storage.write(log_key, {"timestamp": now.isoformat(), "status": "started"})
+    budget: LLMBudget | None = None
+    clients = ClientPool(storage)  # one login/connection pool per platform for the whole run
 
     crashed = False
     result = {
@@ -66,9 +70,12 @@ def handle(event, _context):
     }
 
     try:
+        budget = LLMBudget.from_env()
         state = graph.invoke(
             {
                 "storage": storage,
+                "llm_budget": budget,
+                "clients": clients,
                 "is_monday": now.weekday() == 0,
                 "analytics_ok": False,
                 "published_ids": [],
@@ -82,8 +89,10 @@ def handle(event, _context):
             "published": state.get("published_ids", []),
             "analytics": state.get("analytics_ok", False),
             "insights": state.get("insights_ok", False),
+            "insights_decision": state.get("insights_decision"),
             "plan_created": state.get("plan_created", False),
             "drafts_created": state.get("drafts_created", 0),
+            "llm_budget": budget.diagnostics(),
         }
 
         storage.write(
@@ -100,6 +109,8 @@ def handle(event, _context):
         import traceback
 
         crashed = True
+        if budget is not None:
+            result["llm_budget"] = budget.diagnostics()
         storage.write(
             log_key,
             {
@@ -110,6 +121,9 @@ def handle(event, _context):
             },
         )
 
+    finally:
+        clients.close()
+
     logger.info("Growth Agent cron finished: %s", result)
 
     return {
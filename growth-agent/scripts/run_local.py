@@ -5,7 +5,12 @@ Usage:
     uv run python scripts/run_local.py --publish     # Only publish approved drafts
     uv run python scripts/run_local.py --refill      # Only pipeline refill (create drafts)
     uv run python scripts/run_local.py --insights    # Only generate LLM insights
+    uv run python scripts/run_local.py --insights --force  # ...even if inputs are unchanged
     uv run python scripts/run_local.py --analytics   # Ingest analytics
+    uv run python scripts/run_local.py --rebuild-index  # Rebuild last_published.json
+    uv run python scripts/run_local.py --refill --seed 42  # Reproducible plan sampling
+    uv run python scripts/run_local.py --simulate 365 --half-life 14,30,60  # Offline sweep
+    uv run python scripts/run_local.py --simulate 365 --synthetic 500  # ...synthetic registry
 
 Add --prod to any command to target S3_STATE_PREFIX_PROD instead of S3_STATE_PREFIX:
     uv run python scripts/run_local.py --diagnose --prod
@@ -20,6 +25,7 @@ import argparse
 import json
 import os
 import sys
+from datetime import date, datetime, time, timezone
 from pathlib import Path
 
 # Add project root to sys.path so `agent` is importable when running as scripts/run_local.py
@@ -33,8 +39,15 @@ from agent.models import ContentQueue, LLMAnalysis  # noqa: E402
 from agent.nodes.drafts import create_drafts  # noqa: E402
 from agent.nodes.ingest import ingest_analytics  # noqa: E402
 from agent.nodes.insights import generate_insights  # noqa: E402
-from agent.nodes.plan import create_plan  # noqa: E402
+from agent.nodes.plan import (  # noqa: E402
+    HALF_LIFE_DAYS,
+    PIPELINE_TARGET,
+    REGISTRY_CLEAN_KEY,
+    create_plan,
+)
 from agent.nodes.publish import publish_approved_drafts  # noqa: E402
+from agent.plan_sim import default_start, sweep, synthetic_registry  # noqa: E402
+from agent.publish_index import rebuild_last_published  # noqa: E402
 from agent.storage import S3Storage, load_model  # noqa: E402
 
 
@@ -99,10 +112,16 @@ def diagnose(prod: bool = False) -> None:
     if isinstance(registry_excluded, dict):
         excluded_urls = registry_excluded.get("urls", [])
         excluded_prefixes = registry_excluded.get("prefixes", [])
+        excluded_patterns = sum(
+            len(v)
+            for key in ("globs", "regexes")
+            if isinstance(v := registry_excluded.get(key), list)
+        )
         print(
             "  registry_excluded.json: "
             f"urls={len(excluded_urls) if isinstance(excluded_urls, list) else 0}, "
-            f"prefixes={len(excluded_prefixes) if isinstance(excluded_prefixes, list) else 0}"
+            f"prefixes={len(excluded_prefixes) if isinstance(excluded_prefixes, list) else 0}, "
+            f"patterns={excluded_patterns}"
         )
     else:
         print("  registry_excluded.json: MISSING (defaults to no exclusions)")
@@ -138,20 +157,21 @@ def run_publish(prod: bool = False) -> None:
     print(f"Published: {published}")
 
 
-def run_refill(prod: bool = False) -> None:
+def run_refill(prod: bool = False, seed: int | None = None) -> None:
     storage = _make_storage(prod)
-    plan = create_plan(storage)
-    print(f"Plan created with {len(plan.items)} items")
+    plan = create_plan(storage, seed=seed)
+    print(f"Plan created with {len(plan.items)} items (seed {plan.diagnostics.get('seed')})")
     count = create_drafts(storage, plan)
     print(f"Created {count} new drafts")
 
 
-def run_insights(prod: bool = False) -> None:
+def run_insights(prod: bool = False, force: bool = False) -> None:
     storage = _make_storage(prod)
-    analysis = generate_insights(storage)
+    analysis = generate_insights(storage, force=force)
     if analysis:
         print(
-            f"Insights generated — pages for social: {len(analysis.best_pages_for_social)}, "
+            f"Insights {analysis.decision} ({analysis.decision_reason}) — "
+            f"pages for social: {len(analysis.best_pages_for_social)}, "
             f"growth opportunities: {len(analysis.growth_opportunities)}"
         )
     else:
@@ -165,6 +185,51 @@ def run_analytics(prod: bool = False) -> None:
     print(json.dumps(result.model_dump(), indent=2, default=str)[:500])
 
 
+def run_rebuild_index(prod: bool = False) -> None:
+    storage = _make_storage(prod)
+    index = rebuild_last_published(storage)
+    print(f"last_published.json rebuilt — {len(index.pages)} pages, {index.post_count} posts")
+
+
+def run_simulate(
+    days: int,
+    half_lives: list[float],
+    pipeline_targets: list[int],
+    seed: int,
+    synthetic: int | None = None,
+    start: datetime | None = None,
+    prod: bool = False,
+) -> None:
+    """Sweep the planner offline over a snapshot (S3 registry + queue) or synthetic registry."""
+    if synthetic:
+        registry_urls, queue = synthetic_registry(synthetic), None
+    else:
+        storage = _make_storage(prod)
+        clean = storage.read(REGISTRY_CLEAN_KEY)
+        registry_urls = clean.get("urls", []) if isinstance(clean, dict) else []
+        queue = load_model(storage, "content_queue.json", ContentQueue)
+    if not registry_urls:
+        print("No registry URLs — run --refill first or pass --synthetic N")
+        return
+
+    start = start or default_start(queue)
+    print(
+        f"Simulating {days} days from {start:%Y-%m-%d} over {len(registry_urls)} pages "
+        f"(seed {seed})"
+    )
+    print("half_life  target  posts  coverage  repeats  min_gap  median_gap  cpu_ms")
+    results = sweep(
+        registry_urls, days, half_lives, pipeline_targets, seed=seed, queue=queue, start=start
+    )
+    for r in results:
+        stats = r.interval_stats()
+        print(
+            f"{r.half_life_days:>9g}  {r.pipeline_target:>6}  {r.posts:>5}  "
+            f"{r.coverage:>8.1%}  {stats['repeats']:>7}  {stats['min']:>7.1f}  "
+            f"{stats['median']:>10.1f}  {r.planner_cpu_seconds * 1000:>6.0f}"
+        )
+
+
 def cleanup_orphans() -> None:
     """Delete malformed-prefix S3 objects and dev startup logs."""
     import boto3
@@ -221,6 +286,17 @@ def main() -> None:
     group.add_argument("--refill", action="store_true", help="Pipeline refill (create drafts)")
     group.add_argument("--insights", action="store_true", help="Generate LLM insights")
     group.add_argument("--analytics", action="store_true", help="Ingest analytics")
+    group.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild last_published.json from the publish history",
+    )
+    group.add_argument(
+        "--simulate",
+        type=int,
+        metavar="DAYS",
+        help="Offline plan simulation over DAYS days (no writes, no LLM)",
+    )
     group.add_argument(
         "--graph",
         nargs="?",
@@ -233,6 +309,39 @@ def main() -> None:
         action="store_true",
         help="Delete malformed-prefix S3 objects and dev startup logs",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --insights: call the LLM even if the inputs are unchanged",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="With --refill/--simulate: sampling seed (simulation default: 0)",
+    )
+    parser.add_argument(
+        "--half-life",
+        default=str(HALF_LIFE_DAYS),
+        help="With --simulate: comma-separated HALF_LIFE_DAYS values to sweep",
+    )
+    parser.add_argument(
+        "--pipeline-target",
+        default=str(PIPELINE_TARGET),
+        help="With --simulate: comma-separated PIPELINE_TARGET values to sweep",
+    )
+    parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        metavar="YYYY-MM-DD",
+        help="With --simulate: first simulated day (default: the snapshot's latest post)",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="N",
+        help="With --simulate: use a synthetic registry of N pages instead of S3 state",
+    )
     parser.add_argument(
         "--prod",
         action="store_true",
@@ -249,11 +358,27 @@ def main() -> None:
     elif args.publish:
         run_publish(prod=args.prod)
     elif args.refill:
-        run_refill(prod=args.prod)
+        run_refill(prod=args.prod, seed=args.seed)
     elif args.insights:
-        run_insights(prod=args.prod)
+        run_insights(prod=args.prod, force=args.force)
     elif args.analytics:
         run_analytics(prod=args.prod)
+    elif args.rebuild_index:
+        run_rebuild_index(prod=args.prod)
+    elif args.simulate:
+        run_simulate(
+            days=args.simulate,
+            half_lives=[float(v) for v in args.half_life.split(",")],
+            pipeline_targets=[int(v) for v in args.pipeline_target.split(",")],
+            seed=args.seed or 0,
+            synthetic=args.synthetic,
+            start=(
+                datetime.combine(args.start, time(6, 0), tzinfo=timezone.utc)
+                if args.start
+                else None
+            ),
+            prod=args.prod,
+        )
     elif args.graph:
         show_graph(args.graph)
     elif args.cleanup_orphans:
@@ -6,19 +6,28 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from agent.engagement_series import EngagementSeries
 from agent.models import (
+    BilingualDraftCritique,
+    BlackoutWindow,
+    BlueskyFeedState,
+    CalendarConfig,
     ContentPlan,
     ContentPlanItem,
     ContentQueue,
     Draft,
     DraftCritique,
+    EngagementRollup,
     Insights,
     LLMAnalysis,
+    LLMAnalysisRecord,
     PageForSocial,
     Performance,
     PostMetrics,
+    Strategy,
 )
 from agent.nodes.drafts import (
+    BilingualDraftOutput,
     MastodonDraftOutput,
     _former_posts_context,
     create_drafts,
@@ -59,6 +68,13 @@ def _env(monkeypatch):
         monkeypatch.setenv(k, v)
 
 
+@pytest.fixture(autouse=True)
+def _no_article_fetch():
+    """Article summaries need the live site; tests opt in by setting the return value."""
+    with patch("agent.summaries.fetch_article", return_value=None) as mock_fetch:
+        yield mock_fetch
+
+
 @pytest.fixture()
 def mock_storage():
     """In-memory storage mock that supports read/write/list_keys."""
@@ -85,20 +101,18 @@ def mock_storage():
 # ---------------------------------------------------------------------------
 
 
-@patch("agent.nodes.ingest.BlueskyClient")
-@patch("agent.nodes.ingest.MastodonClient")
+@patch("agent.platforms.pool.BlueskyClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_ingest_analytics(MockMasto, MockBsky, mock_storage):
     storage, store = mock_storage
 
     masto_ctx = MagicMock()
     masto_ctx.verify_credentials.return_value = {"followers_count": 300}
-    MockMasto.return_value.__enter__ = MagicMock(return_value=masto_ctx)
-    MockMasto.return_value.__exit__ = MagicMock(return_value=False)
+    MockMasto.return_value = masto_ctx
 
     bsky_ctx = MagicMock()
     bsky_ctx.get_profile.return_value = {"followersCount": 150}
-    MockBsky.return_value.__enter__ = MagicMock(return_value=bsky_ctx)
-    MockBsky.return_value.__exit__ = MagicMock(return_value=False)
+    MockBsky.return_value = bsky_ctx
 
     result = ingest_analytics(storage)
 
@@ -107,12 +121,49 @@ def test_ingest_analytics(MockMasto, MockBsky, mock_storage):
     assert "insights.json" in store
 
 
+@patch("agent.nodes.publish.publish_draft", return_value={"uri": "at://post"})
+@patch("agent.platforms.pool.BlueskyClient")
+@patch("agent.platforms.pool.MastodonClient")
+def test_client_pool_shares_one_login_per_run(MockMasto, MockBsky, _publish, mock_storage):
+    """Ingest, metrics and publish reuse one client per platform; closed once by the pool."""
+    from agent.platforms.pool import ClientPool
+
+    storage, _store = mock_storage
+    now = datetime.now(timezone.utc)
+    storage.write(
+        "content_queue.json",
+        ContentQueue(
+            approved=[Draft(id="a1", channel="bluesky", language="en", content="hi")],
+            published=[
+                Draft(
+                    id="p1",
+                    channel="bluesky",
+                    language="en",
+                    content="x",
+                    platform_id="at://p1",
+                    published_at=now,
+                )
+            ],
+        ),
+    )
+    MockBsky.return_value.get_posts.return_value = []
+
+    with ClientPool() as clients:
+        ingest_analytics(storage, clients=clients)
+        assert publish_approved_drafts(storage, clients=clients) == ["a1"]
+        MockBsky.return_value.close.assert_not_called()
+
+    assert MockBsky.call_count == 1 and MockMasto.call_count == 1
+    MockBsky.return_value.close.assert_called_once()
+    MockMasto.return_value.close.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # _collect_post_metrics
 # ---------------------------------------------------------------------------
 
 
-@patch("agent.nodes.ingest.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_collect_post_metrics_mastodon(MockMasto, mock_storage):
     storage, store = mock_storage
     queue = ContentQueue(
@@ -130,13 +181,10 @@ def test_collect_post_metrics_mastodon(MockMasto, mock_storage):
     storage.write("content_queue.json", queue)
 
     masto_ctx = MagicMock()
-    masto_ctx.get_status.return_value = {
-        "reblogs_count": 3,
-        "favourites_count": 7,
-        "replies_count": 1,
+    masto_ctx.get_statuses.return_value = {
+        "111": {"reblogs_count": 3, "favourites_count": 7, "replies_count": 1}
     }
-    MockMasto.return_value.__enter__ = MagicMock(return_value=masto_ctx)
-    MockMasto.return_value.__exit__ = MagicMock(return_value=False)
+    MockMasto.return_value = masto_ctx
 
     _collect_post_metrics(storage)
 
@@ -147,7 +195,516 @@ def test_collect_post_metrics_mastodon(MockMasto, mock_storage):
     assert perf.posts[0].replies == 1
 
 
-@patch("agent.nodes.ingest.BlueskyClient")
+@patch("agent.platforms.pool.MastodonClient")
+def test_collect_post_metrics_mastodon_bulk_partial_result(MockMasto, mock_storage):
+    """One bulk get_statuses call; statuses missing from its result are skipped."""
+    storage, store = mock_storage
+    now = datetime.now(timezone.utc)
+    queue = ContentQueue(
+        published=[
+            Draft(
+                id=f"d{i}",
+                channel="mastodon",
+                language="en",
+                content="x",
+                platform_id=str(i),
+                published_at=now,
+            )
+            for i in range(4)
+        ]
+    )
+    storage.write("content_queue.json", queue)
+
+    masto_ctx = MagicMock()
+    masto_ctx.get_statuses.return_value = {
+        sid: {"reblogs_count": int(sid), "favourites_count": 0, "replies_count": 0}
+        for sid in ("0", "1", "3")
+    }
+    MockMasto.return_value = masto_ctx
+
+    _collect_post_metrics(storage)
+
+    masto_ctx.get_statuses.assert_called_once_with(["0", "1", "2", "3"])
+    perf = Performance.model_validate(store["performance.json"])
+    assert {p.id: p.reblogs for p in perf.posts} == {"d0": 0, "d1": 1, "d3": 3}
+
+
+@patch("agent.platforms.pool.MastodonClient")
+def test_collect_post_metrics_tiered_refresh_schedule(MockMasto, mock_storage):
+    """Only due posts are fetched; unchanged old posts freeze, moving ones stay weekly."""
+    storage, store = mock_storage
+    now = datetime.now(timezone.utc)
+
+    def draft(draft_id: str, age: timedelta) -> Draft:
+        return Draft(
+            id=draft_id,
+            channel="mastodon",
+            language="en",
+            content="x",
+            platform_id=f"s-{draft_id}",
+            published_at=now - age,
+        )
+
+    def metrics(draft_id: str, age: timedelta, **schedule) -> PostMetrics:
+        return PostMetrics(
+            id=draft_id,
+            channel="mastodon",
+            published_at=(now - age).isoformat(),
+            platform_id=f"s-{draft_id}",
+            reblogs=1,
+            **schedule,
+        )
+
+    ages = {
+        "new": timedelta(hours=3),
+        "waiting": timedelta(days=3),
+        "settled": timedelta(days=25),
+        "moving": timedelta(days=25),
+        "frozen": timedelta(days=60),
+    }
+    storage.write(
+        "content_queue.json", ContentQueue(published=[draft(i, a) for i, a in ages.items()])
+    )
+    storage.write(
+        "performance.json",
+        Performance(
+            posts=[
+                metrics("waiting", ages["waiting"], next_refresh_at=now + timedelta(hours=5)),
+                metrics(
+                    "settled",
+                    ages["settled"],
+                    next_refresh_at=now - timedelta(minutes=1),
+                    last_changed_at=now - timedelta(days=20),
+                ),
+                metrics(
+                    "moving",
+                    ages["moving"],
+                    next_refresh_at=now - timedelta(minutes=1),
+                    last_changed_at=now - timedelta(days=20),
+                ),
+                metrics("frozen", ages["frozen"], frozen=True),
+            ]
+        ),
+    )
+
+    masto_ctx = MagicMock()
+    masto_ctx.get_statuses.return_value = {
+        "s-new": {"reblogs_count": 2},
+        "s-settled": {"reblogs_count": 1},  # unchanged
+        "s-moving": {"reblogs_count": 4},
+    }
+    MockMasto.return_value = masto_ctx
+
+    _collect_post_metrics(storage)
+
+    masto_ctx.get_statuses.assert_called_once_with(["s-new", "s-settled", "s-moving"])
+    by_id = {p.id: p for p in Performance.model_validate(store["performance.json"]).posts}
+    assert by_id["new"].next_refresh_at - by_id["new"].fetched_at == timedelta(hours=1)
+    assert by_id["settled"].frozen and by_id["settled"].next_refresh_at is None
+    assert not by_id["moving"].frozen
+    assert by_id["moving"].next_refresh_at - by_id["moving"].fetched_at == timedelta(days=7)
+    assert by_id["moving"].last_changed_at == by_id["moving"].fetched_at
+    assert by_id["frozen"].reblogs == 1 and by_id["waiting"].fetched_at is None
+
+    # Each fetched post gets a snapshot in this month's engagement partition.
+    series = EngagementSeries(storage).read()
+    assert sorted(series["post_id"]) == ["moving", "new", "settled"]
+
+
+def test_engagement_series_dedups_and_partitions_by_month(mock_storage):
+    storage, store = mock_storage
+    day = datetime(2026, 1, 30, 12, tzinfo=timezone.utc)
+
+    series = EngagementSeries(storage)
+    assert series.append("p1", day, 1, 2, 0)
+    assert not series.append("p1", day + timedelta(hours=1), 1, 2, 0)  # unchanged
+    assert series.append("p1", day + timedelta(days=1), 3, 2, 0)
+    assert series.append("p2", day + timedelta(days=1), 0, 1, 0)
+    # A new month starts with a fresh row even if counts are unchanged.
+    assert series.append("p1", day + timedelta(days=3), 3, 2, 0)
+    series.save()
+
+    assert sorted(store) == ["engagement/2026-01.json", "engagement/2026-02.json"]
+    assert store["engagement/2026-01.json"]["post_ids"] == ["p1", "p2"]
+    assert store["engagement/2026-01.json"]["post"] == [0, 0, 1]
+
+    # A second writer appends after the stored rows and still deduplicates.
+    later = EngagementSeries(storage)
+    assert not later.append("p2", day + timedelta(days=1, hours=5), 0, 1, 0)
+    later.save()
+
+    result = EngagementSeries(storage).read(end=datetime(2026, 2, 1, tzinfo=timezone.utc))
+    assert list(result["post_id"]) == ["p1", "p1", "p2"]
+    assert list(result["reblogs"]) == [1, 3, 0]
+    assert list(result["ts"])[0] == int(day.timestamp())
+    only_p1 = EngagementSeries(storage).read(post_ids=["p1"])
+    assert list(only_p1["favourites"]) == [2, 2, 2]
+
+
+@patch("agent.platforms.pool.MastodonClient")
+def test_collect_post_metrics_updates_engagement_rollup(MockMasto, mock_storage):
+    """The rollup is built once, then only refreshed posts' deltas are added."""
+    from agent.engagement_rollup import load_or_build_rollup
+
+    storage, store = mock_storage
+    published = datetime(2026, 3, 4, 9, tzinfo=timezone.utc)  # ISO week 2026-W10
+    drafts = [
+        Draft(
+            id=f"d{i}",
+            channel="mastodon",
+            language="en",
+            content="x",
+            link="https://fretchen.eu/quantum/",
+            platform_id=f"s{i}",
+            published_at=published,
+        )
+        for i in (1, 2)
+    ]
+    storage.write("content_queue.json", ContentQueue(published=drafts))
+    storage.write(
+        "performance.json",
+        Performance(
+            posts=[
+                PostMetrics(
+                    id="d1",
+                    channel="mastodon",
+                    published_at=published.isoformat(),
+                    platform_id="s1",
+                    favourites=5,
+                    frozen=True,
+                )
+            ]
+        ),
+    )
+    masto_ctx = MagicMock()
+    masto_ctx.get_statuses.return_value = {"s2": {"favourites_count": 3, "reblogs_count": 1}}
+    MockMasto.return_value = masto_ctx
+
+    _collect_post_metrics(storage)
+
+    rollup = EngagementRollup.model_validate(store["engagement_rollup.json"])
+    (page,) = rollup.pages.values()
+    assert (page.favourites, page.reblogs, page.posts) == (8, 1, 2)
+    assert rollup.weeks["2026-W10"] == page
+    assert rollup.channels["mastodon"] == page
+
+    # Next refresh of d2: only the change (+4 favourites) is added.
+    masto_ctx.get_statuses.return_value = {"s2": {"favourites_count": 7, "reblogs_count": 1}}
+    perf = Performance.model_validate(store["performance.json"])
+    for p in perf.posts:
+        p.next_refresh_at = None if p.frozen else published
+    storage.write("performance.json", perf)
+    _collect_post_metrics(storage)
+
+    rollup = EngagementRollup.model_validate(store["engagement_rollup.json"])
+    assert (rollup.channels["mastodon"].favourites, rollup.channels["mastodon"].posts) == (12, 2)
+
+    # Reads trust the stored rollup without scanning performance.json ...
+    perf = Performance.model_validate(store["performance.json"])
+    perf.posts[0].favourites += 100
+    storage.write("performance.json", perf)
+    assert load_or_build_rollup(storage).channels["mastodon"].favourites == 12
+    # ... and the next refresh detects the manual edit (or a lost rollup write) and rebuilds.
+    _collect_post_metrics(storage)
+    assert masto_ctx.get_statuses.call_count == 2  # nothing was due this time
+    assert store["engagement_rollup.json"]["channels"]["mastodon"]["favourites"] == 112
+
+    # A rollup from an older ROLLUP_VERSION is rebuilt on read.
+    store["engagement_rollup.json"]["version"] = 0
+    store["engagement_rollup.json"]["channels"] = {}
+    assert load_or_build_rollup(storage).channels["mastodon"].favourites == 112
+
+
+def _status_json(status_id: str) -> dict:
+    return {"id": status_id, "reblogs_count": 1, "favourites_count": 2, "replies_count": 0}
+
+
+def test_mastodon_get_statuses_batches_multi_id_requests():
+    """Supported instances get 20 ids per request; deleted statuses are just absent."""
+    import httpx
+
+    from agent.platforms import mastodon as mastodon_module
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        ids = request.url.params.get_list("id[]")
+        return httpx.Response(200, json=[_status_json(i) for i in ids if i != "7"])
+
+    masto = mastodon_module.MastodonClient("https://multi.example", "token")
+    masto.client = httpx.Client(base_url=masto.base_url, transport=httpx.MockTransport(handler))
+    with patch.dict(mastodon_module._MULTI_GET_SUPPORT, clear=True):
+        statuses = masto.get_statuses([str(i) for i in range(45)])
+
+    assert len(requests) == 3  # 20 + 20 + 5
+    assert len(statuses) == 44 and "7" not in statuses
+    assert len(masto.request_latencies) == 3
+
+
+def test_mastodon_get_statuses_survives_malformed_batch_response():
+    """A batch whose body is not JSON falls back to single fetches; others are kept."""
+    import httpx
+
+    from agent.platforms import mastodon as mastodon_module
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/statuses":
+            ids = request.url.params.get_list("id[]")
+            if "0" in ids:
+                return httpx.Response(200, content=b"<html>upstream hiccup</html>")
+            return httpx.Response(200, json=[_status_json(i) for i in ids])
+        return httpx.Response(200, json=_status_json(request.url.path.rsplit("/", 1)[-1]))
+
+    masto = mastodon_module.MastodonClient("https://flaky.example", "token")
+    masto.client = httpx.Client(base_url=masto.base_url, transport=httpx.MockTransport(handler))
+    with patch.dict(mastodon_module._MULTI_GET_SUPPORT, clear=True):
+        statuses = masto.get_statuses([str(i) for i in range(25)])
+        assert mastodon_module._MULTI_GET_SUPPORT == {"https://flaky.example": True}
+
+    assert set(statuses) == {str(i) for i in range(25)}
+
+
+def test_mastodon_status_fetch_log_counts_only_its_own_requests(caplog):
+    """Earlier reads on a pooled client (credentials, timeline) are not reported."""
+    import logging
+
+    import httpx
+
+    from agent.nodes.ingest import _fetch_mastodon_statuses
+    from agent.platforms import mastodon as mastodon_module
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params.get_list("id[]")
+        return httpx.Response(200, json=[_status_json(i) for i in ids])
+
+    masto = mastodon_module.MastodonClient("https://multi.example", "token")
+    masto.client = httpx.Client(base_url=masto.base_url, transport=httpx.MockTransport(handler))
+    masto.request_latencies.extend([9.0, 9.0])  # earlier requests on the same client
+    drafts = [
+        Draft(id=f"d{i}", channel="mastodon", language="en", content="x", platform_id=str(i))
+        for i in range(3)
+    ]
+    with (
+        patch.dict(mastodon_module._MULTI_GET_SUPPORT, clear=True),
+        caplog.at_level(logging.INFO, logger="growth-agent"),
+    ):
+        assert len(_fetch_mastodon_statuses(masto, drafts)) == 3
+
+    message = next(r.getMessage() for r in caplog.records if "status fetch" in r.getMessage())
+    assert ", 1 requests in " in message and "n=1 " in message and "max=9000ms" not in message
+
+
+def test_mastodon_get_statuses_falls_back_and_caches_support():
+    """A 404 on the multi-id endpoint switches to isolated single fetches for the instance."""
+    import httpx
+
+    from agent.platforms import mastodon as mastodon_module
+
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/api/v1/statuses":
+            return httpx.Response(404)
+        status_id = request.url.path.rsplit("/", 1)[-1]
+        if status_id == "2":
+            return httpx.Response(500)
+        return httpx.Response(200, json=_status_json(status_id))
+
+    with patch.dict(mastodon_module._MULTI_GET_SUPPORT, clear=True):
+        for _ in range(2):
+            masto = mastodon_module.MastodonClient("https://old.example", "token")
+            masto.client = httpx.Client(
+                base_url=masto.base_url, transport=httpx.MockTransport(handler)
+            )
+            assert set(masto.get_statuses(["1", "2", "3"])) == {"1", "3"}
+        assert mastodon_module._MULTI_GET_SUPPORT == {"https://old.example": False}
+
+    assert paths.count("/api/v1/statuses") == 1  # probed once, then remembered
+
+
+@patch("agent.platforms.pool.MastodonClient")
+def test_mastodon_timeline_sync_backfills_and_feeds_metrics(MockMasto, mock_storage):
+    """New timeline statuses fill in missing platform_ids and replace per-status fetches."""
+    import httpx
+
+    from agent.platforms.mastodon import MastodonClient
+    from agent.timeline_sync import sync_mastodon_timeline
+
+    storage, store = mock_storage
+    now = datetime.now(timezone.utc)
+    link = "https://fretchen.eu/blog/42"
+    link_html = (
+        f'<a href="{link}?utm_source=mastodon"><span class="invisible">https://</span>'
+        '<span class="ellipsis">fretchen.eu/blog/42</span></a>'
+    )
+
+    def status(status_id: int, content: str, **extra) -> dict:
+        created = (now - timedelta(hours=110 - status_id)).isoformat()
+        return {"id": str(status_id), "created_at": created, "content": content, **extra}
+
+    timeline = [
+        status(105, "<p>boosted</p>", reblog={"id": "9"}),
+        status(104, "<p>Qubits &amp; you</p>", favourites_count=4),
+        status(103, f"<p>New post: {link_html}</p>", reblogs_count=2),
+        status(102, "<p>unrelated</p>"),
+        status(101, "<p>old</p>", favourites_count=1),
+    ]
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        since = int(request.url.params.get("since_id", 0))
+        below = int(request.url.params.get("max_id", 10**9))
+        page = [s for s in timeline if since < int(s["id"]) < below]
+        return httpx.Response(200, json=page[: int(request.url.params["limit"])])
+
+    def draft(draft_id: str, content: str, **extra) -> Draft:
+        return Draft(
+            id=draft_id,
+            channel="mastodon",
+            language="en",
+            content=content,
+            published_at=now - timedelta(hours=8),
+            **extra,
+        )
+
+    storage.write(
+        "content_queue.json",
+        ContentQueue(
+            published=[
+                draft("text", "Qubits & you"),
+                draft("link", f"Fresh words {link}", link=link),
+                draft("known", "old", platform_id="101"),
+                draft("missing", "never posted"),
+            ]
+        ),
+    )
+    masto = MastodonClient("https://masto.example", "token")
+    masto.client = httpx.Client(base_url=masto.base_url, transport=httpx.MockTransport(handler))
+
+    pages = list(masto.iter_account_statuses("42", page_size=2))
+    assert [s["id"] for s in pages] == ["105", "104", "103", "102", "101"]
+    assert [r.url.params.get("max_id") for r in requests] == [None, "104", "102", "101"]
+
+    statuses = sync_mastodon_timeline(storage, masto, "42", now=now)
+    assert set(statuses) == {"104", "103", "101"}
+    queue = ContentQueue.model_validate(store["content_queue.json"])
+    assert {d.id: d.platform_id for d in queue.published} == {
+        "text": "104",
+        "link": "103",
+        "known": "101",
+        "missing": None,
+    }
+    assert store["mastodon_timeline.json"]["last_status_id"] == "105"
+
+    # Next sync only asks for statuses newer than the stored cursor.
+    requests.clear()
+    assert sync_mastodon_timeline(storage, masto, "42") == {}
+    assert requests[0].url.params["since_id"] == "105"
+
+    # Metrics for the synced posts come from the timeline response, not get_statuses.
+    _collect_post_metrics(storage, mastodon_statuses=statuses)
+    MockMasto.return_value.get_statuses.assert_not_called()
+    by_id = {p.id: p for p in Performance.model_validate(store["performance.json"]).posts}
+    assert (by_id["text"].favourites, by_id["link"].reblogs) == (4, 2)
+
+
+def _rate_limited_client(handler, now: float = 1_000.0):
+    import httpx
+
+    from agent.platforms.ratelimit import RateLimitedTransport
+
+    sleeps: list[float] = []
+    transport = RateLimitedTransport(
+        httpx.MockTransport(handler), sleep=sleeps.append, clock=lambda: now
+    )
+    return httpx.Client(transport=transport), transport, sleeps
+
+
+def test_rate_limited_transport_waits_for_reset_on_429():
+    """A 429 is retried after the advertised reset; quota is tracked per endpoint."""
+    import httpx
+
+    responses = iter(
+        [
+            httpx.Response(
+                429,
+                headers={
+                    "ratelimit-limit": "3000",
+                    "ratelimit-remaining": "0",
+                    "ratelimit-reset": "1030",
+                },
+            ),
+            httpx.Response(
+                200,
+                json={"ok": True},
+                headers={
+                    "ratelimit-limit": "3000",
+                    "ratelimit-remaining": "2999",
+                    "ratelimit-reset": "1300",
+                },
+            ),
+        ]
+    )
+    client, transport, sleeps = _rate_limited_client(lambda request: next(responses))
+
+    resp = client.get("https://bsky.social/xrpc/app.bsky.feed.getPosts")
+
+    assert resp.status_code == 200
+    assert len(sleeps) == 1 and 30 <= sleeps[0] <= 30.5  # reset in 30s plus jitter
+    summary = transport.summary()
+    assert summary["retries"] == 1
+    assert summary["quotas"]["bsky.social/xrpc/app.bsky.feed.getPosts"] == {
+        "remaining": 2999,
+        "limit": 3000,
+        "reset_in": 300,
+    }
+
+
+def test_rate_limited_transport_retries_5xx_only_for_idempotent_requests():
+    """GETs back off on 503 until max retries; a POST is never replayed after a 5xx."""
+    import httpx
+
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    client, _transport, sleeps = _rate_limited_client(handler)
+    assert client.get("https://mastodon.example/api/v1/statuses/1").status_code == 503
+    assert calls == ["GET"] * 4
+    assert [round(s - s % 0.5, 1) for s in sleeps] == [0.5, 1.0, 2.0]  # base * 2^n + jitter
+
+    calls.clear()
+    assert client.post("https://mastodon.example/api/v1/statuses").status_code == 503
+    assert calls == ["POST"]
+
+
+def test_rate_limited_transport_paces_when_quota_runs_low():
+    """Below 10% of the limit, requests are spread over the time left until reset."""
+    import httpx
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={
+                "X-RateLimit-Limit": "300",
+                "X-RateLimit-Remaining": "10",
+                "X-RateLimit-Reset": "1970-01-01T00:18:20+00:00",  # epoch 1100
+            },
+        )
+
+    client, _transport, sleeps = _rate_limited_client(handler)
+    client.get("https://mastodon.example/api/v1/statuses/1")
+    assert sleeps == []  # nothing known yet
+    client.get("https://mastodon.example/api/v1/statuses/2")  # same endpoint key
+    assert sleeps == [10.0]  # 100s to reset / 10 remaining
+
+
+@patch("agent.platforms.pool.BlueskyClient")
 def test_collect_post_metrics_bluesky(MockBsky, mock_storage):
     storage, store = mock_storage
     uri = "at://did:plc:abc/app.bsky.feed.post/123"
@@ -169,8 +726,7 @@ def test_collect_post_metrics_bluesky(MockBsky, mock_storage):
     bsky_ctx.get_posts.return_value = [
         {"uri": uri, "repostCount": 2, "likeCount": 5, "replyCount": 0},
     ]
-    MockBsky.return_value.__enter__ = MagicMock(return_value=bsky_ctx)
-    MockBsky.return_value.__exit__ = MagicMock(return_value=False)
+    MockBsky.return_value = bsky_ctx
 
     _collect_post_metrics(storage)
 
@@ -191,7 +747,7 @@ def test_collect_post_metrics_no_published(mock_storage):
     assert perf.posts == []
 
 
-@patch("agent.nodes.ingest.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_collect_post_metrics_mastodon_api_failure(MockMasto, mock_storage):
     storage, store = mock_storage
     queue = ContentQueue(
@@ -209,9 +765,8 @@ def test_collect_post_metrics_mastodon_api_failure(MockMasto, mock_storage):
     storage.write("content_queue.json", queue)
 
     masto_ctx = MagicMock()
-    masto_ctx.get_status.side_effect = Exception("API error")
-    MockMasto.return_value.__enter__ = MagicMock(return_value=masto_ctx)
-    MockMasto.return_value.__exit__ = MagicMock(return_value=False)
+    masto_ctx.get_statuses.side_effect = Exception("API error")
+    MockMasto.return_value = masto_ctx
 
     _collect_post_metrics(storage)  # must not raise
 
@@ -219,7 +774,7 @@ def test_collect_post_metrics_mastodon_api_failure(MockMasto, mock_storage):
     assert perf.posts == []
 
 
-@patch("agent.nodes.ingest.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_collect_post_metrics_preserves_old_posts(MockMasto, mock_storage):
     """Posts older than 30 days keep their stored metrics; only recent posts are re-fetched."""
     storage, store = mock_storage
@@ -266,13 +821,10 @@ def test_collect_post_metrics_preserves_old_posts(MockMasto, mock_storage):
     )
 
     masto_ctx = MagicMock()
-    masto_ctx.get_status.return_value = {
-        "reblogs_count": 1,
-        "favourites_count": 2,
-        "replies_count": 0,
+    masto_ctx.get_statuses.return_value = {
+        "recent-id": {"reblogs_count": 1, "favourites_count": 2, "replies_count": 0}
     }
-    MockMasto.return_value.__enter__ = MagicMock(return_value=masto_ctx)
-    MockMasto.return_value.__exit__ = MagicMock(return_value=False)
+    MockMasto.return_value = masto_ctx
 
     _collect_post_metrics(storage)
 
@@ -287,10 +839,10 @@ def test_collect_post_metrics_preserves_old_posts(MockMasto, mock_storage):
     assert by_id["recent"].reblogs == 1
     assert by_id["recent"].favourites == 2
 
-    assert masto_ctx.get_status.call_count == 1  # only the recent post
+    masto_ctx.get_statuses.assert_called_once_with(["recent-id"])  # only the recent post
 
 
-@patch("agent.nodes.ingest.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_collect_post_metrics_api_failure_preserves_existing(MockMasto, mock_storage):
     """API failure for a recent post keeps its previously stored metrics."""
     storage, store = mock_storage
@@ -327,9 +879,8 @@ def test_collect_post_metrics_api_failure_preserves_existing(MockMasto, mock_sto
     )
 
     masto_ctx = MagicMock()
-    masto_ctx.get_status.side_effect = Exception("API error")
-    MockMasto.return_value.__enter__ = MagicMock(return_value=masto_ctx)
-    MockMasto.return_value.__exit__ = MagicMock(return_value=False)
+    masto_ctx.get_statuses.side_effect = Exception("API error")
+    MockMasto.return_value = masto_ctx
 
     _collect_post_metrics(storage)
 
@@ -369,8 +920,8 @@ def test_collect_post_metrics_skips_no_published_at(mock_storage):
 
 
 @patch("agent.nodes.publish.publish_draft")
-@patch("agent.nodes.publish.BlueskyClient")
-@patch("agent.nodes.publish.MastodonClient")
+@patch("agent.platforms.pool.BlueskyClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_publish_approved_drafts_publishes_due(MockMasto, MockBsky, mock_publish, mock_storage):
     storage, store = mock_storage
 
@@ -411,7 +962,7 @@ def test_publish_approved_drafts_publishes_due(MockMasto, MockBsky, mock_publish
 
 
 @patch("agent.nodes.publish.publish_draft")
-@patch("agent.nodes.publish.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_publish_no_scheduled_at_publishes_immediately(MockMasto, mock_publish, mock_storage):
     storage, store = mock_storage
 
@@ -465,6 +1016,56 @@ def test_publish_skips_oversized_content(mock_storage):
     assert updated_queue.approved[0].id == "too-long"
 
 
+@patch("agent.nodes.publish.publish_draft")
+@patch("agent.platforms.pool.MastodonClient")
+def test_publish_updates_last_published_index(MockMasto, mock_publish, mock_storage):
+    """Publishing folds new posts into last_published.json; drift triggers a rebuild."""
+    from agent.models import LastPublishedIndex
+    from agent.publish_index import load_last_published
+
+    storage, store = mock_storage
+    past = datetime(2026, 3, 1, 7, 0, tzinfo=timezone.utc)
+    queue = ContentQueue(
+        published=[
+            Draft(
+                id="old",
+                channel="bluesky",
+                language="en",
+                content="old",
+                link="https://fretchen.eu/quantum?utm_source=bluesky",
+                scheduled_at=past - timedelta(days=30),
+            )
+        ],
+        approved=[
+            Draft(
+                id="new",
+                channel="mastodon",
+                language="en",
+                content="new",
+                link="https://fretchen.eu/quantum/?utm_source=mastodon",
+                scheduled_at=past,
+            )
+        ],
+    )
+    storage.write("content_queue.json", queue)
+    mock_publish.return_value = {"id": "masto-1"}
+
+    assert publish_approved_drafts(storage) == ["new"]
+
+    index = LastPublishedIndex.model_validate(store["last_published.json"])
+    entry = index.pages["https://fretchen.eu/quantum/"]
+    assert entry.last_published_at == past
+    assert entry.counts == {"bluesky": 1, "mastodon": 1}
+    assert index.post_count == 2
+
+    # History edited behind the index's back -> rebuilt on next load.
+    updated = ContentQueue.model_validate(store["content_queue.json"])
+    updated.published.pop()
+    assert load_last_published(storage, updated).pages["https://fretchen.eu/quantum/"].counts == {
+        "bluesky": 1
+    }
+
+
 # ---------------------------------------------------------------------------
 # generate_insights
 # ---------------------------------------------------------------------------
@@ -513,6 +1114,7 @@ def test_generate_insights(MockLLM, mock_fetch, mock_storage):
     assert updated.best_pages_for_social[0].reason == "High traffic"
     # LLMAnalysis should be persisted for daily reuse
     assert "llm_analysis.json" in store
+    assert store["llm_analysis.json"]["prompt_tokens"] > 0
 
 
 @patch("agent.nodes.insights.fetch_pages_meta")
@@ -551,6 +1153,98 @@ def test_generate_insights_handles_corrupt_registry(MockLLM, mock_fetch, mock_st
     mock_fetch.assert_not_called()
 
 
+@patch("agent.nodes.insights.fetch_pages_meta")
+@patch("agent.nodes.insights.LLMClient")
+def test_generate_insights_reuses_analysis_when_inputs_unchanged(MockLLM, mock_fetch, mock_storage):
+    """A second run with identical inputs (or a tiny engagement delta) skips the LLM call."""
+    storage, store = mock_storage
+    storage.write("insights.json", Insights())
+    storage.write(
+        "content_queue.json",
+        ContentQueue(
+            published=[
+                Draft(
+                    id="d1",
+                    channel="mastodon",
+                    language="en",
+                    content="x",
+                    link="https://fretchen.eu/quantum",
+                )
+            ]
+        ),
+    )
+    storage.write(
+        "performance.json",
+        Performance(posts=[PostMetrics(id="d1", channel="mastodon", published_at="", reblogs=2)]),
+    )
+    llm_inst = MockLLM.from_env.return_value
+    llm_inst.structured_output.return_value = LLMAnalysis(
+        best_pages_for_social=[], growth_opportunities=["Grow!"]
+    )
+
+    first = generate_insights(storage)
+    assert (first.decision, first.decision_reason) == ("refreshed", "no_previous_analysis")
+
+    second = generate_insights(storage)
+    assert (second.decision, second.decision_reason) == ("reused", "fingerprint_match")
+    assert second.growth_opportunities == ["Grow!"]
+
+    # +1 favourite is below INSIGHTS_ENGAGEMENT_DELTA_THRESHOLD (the metrics refresh
+    # keeps the rollup current; insights reads only the rollup)
+    (page,) = store["engagement_rollup.json"]["pages"].values()
+    page["favourites"] = 1
+    third = generate_insights(storage)
+    assert third.decision_reason == "engagement_delta_below_threshold"
+    assert llm_inst.structured_output.call_count == 1
+
+    page["favourites"] = 20
+    fourth = generate_insights(storage)
+    assert (fourth.decision, fourth.decision_reason) == ("refreshed", "inputs_changed")
+
+    forced = generate_insights(storage, force=True)
+    assert forced.decision_reason == "forced"
+    assert llm_inst.structured_output.call_count == 3
+
+
+def test_fit_insight_prompt_trims_to_token_limit():
+    """Large registries/engagement histories are trimmed: top-K pages plus a summarized tail."""
+    from agent.models import PageMeta, Strategy
+    from agent.nodes.insights import _fit_insight_prompt
+    from agent.tokens import estimate_tokens
+
+    page_metas = {
+        f"https://fretchen.eu/p{i}/": PageMeta(
+            url=f"https://fretchen.eu/p{i}/", title=f"P{i}", description="word " * 200
+        )
+        for i in range(30)
+    }
+    page_engagement = {
+        f"https://fretchen.eu/p{i}/": {"favourites": i, "reblogs": 1, "replies": 0, "posts": 1}
+        for i in range(60)
+    }
+
+    prompt, tokens = _fit_insight_prompt(Strategy(), page_metas, page_engagement, token_limit=1500)
+
+    assert tokens <= 1500
+    assert tokens == estimate_tokens(prompt)
+    assert "https://fretchen.eu/p59/: 59 favourites" in prompt  # top page kept
+    assert "more pages:" in prompt  # tail summarized
+
+
+def test_estimate_tokens_never_downloads_the_encoding(monkeypatch, tmp_path):
+    """Without a cached encoding file, tiktoken is not asked to fetch one."""
+    from agent import tokens
+
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+    tokens._encoding.cache_clear()
+    try:
+        with patch("tiktoken.get_encoding", side_effect=AssertionError("network")) as get:
+            assert tokens.estimate_tokens("x" * 40) == 10
+        get.assert_not_called()
+    finally:
+        tokens._encoding.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # create_drafts
 # ---------------------------------------------------------------------------
@@ -696,6 +1390,234 @@ def test_create_drafts_mastodon_refine_failure_keeps_original(MockLLM, mock_stor
     assert updated_queue.drafts[0].hashtags == ["#Old"]
 
 
+@patch("agent.nodes.drafts.LLMClient")
+def test_create_drafts_skips_refinement_when_budget_is_tight(MockLLM, mock_storage):
+    """A tight run budget keeps the first draft instead of spending calls on refinement."""
+    storage, store = mock_storage
+    plan = ContentPlan(
+        items=[
+            ContentPlanItem(
+                page_url="https://fretchen.eu/quantum/",
+                page_title="Quantum Blog",
+                page_description="Quantum computing intro",
+                channel="mastodon",
+                scheduled_at=datetime(2025, 6, 11, 7, 0, tzinfo=timezone.utc),
+            ),
+        ]
+    )
+
+    llm_inst = MockLLM.from_env.return_value
+    llm_inst.admit.side_effect = lambda purpose: purpose != "refine"
+    llm_inst.structured_output.side_effect = [
+        MastodonDraftOutput(content="First take #Quantum", hashtags=["#Quantum"]),
+        DraftCritique(
+            has_strong_hook=False,
+            follows_platform_conventions=True,
+            mentions_specific_insight=True,
+            includes_link=True,
+            appropriate_tone=True,
+            overall_score=55,
+            issues=["weak_hook"],
+            suggested_improvement="Sharper opening",
+        ),
+    ]
+
+    count = create_drafts(storage, plan)
+
+    assert count == 1
+    assert llm_inst.structured_output.call_count == 2  # generate + critique, no refine
+    draft = ContentQueue.model_validate(store["content_queue.json"]).drafts[0]
+    assert draft.content == "First take #Quantum"
+    assert draft.quality_score == 55
+    assert draft.quality_issues == ["weak_hook"]
+
+
+@patch("agent.nodes.drafts.LLMClient")
+def test_create_drafts_bilingual_single_generation_call(MockLLM, mock_storage):
+    """draft_languages=[en, de] yields both variants from one generate + one critique call."""
+    storage, store = mock_storage
+    storage.write("strategy.json", Strategy(draft_languages=["en", "de"]))
+
+    plan = ContentPlan(
+        items=[
+            ContentPlanItem(
+                page_url="https://fretchen.eu/quantum/",
+                page_title="Quantum Blog",
+                page_description="Quantum computing intro",
+                channel="mastodon",
+                scheduled_at=datetime(2025, 6, 11, 7, 0, tzinfo=timezone.utc),
+            ),
+        ]
+    )
+
+    def _critique(score: int) -> DraftCritique:
+        return DraftCritique(
+            has_strong_hook=True,
+            follows_platform_conventions=True,
+            mentions_specific_insight=True,
+            includes_link=True,
+            appropriate_tone=True,
+            overall_score=score,
+            issues=[],
+            suggested_improvement="",
+        )
+
+    llm_inst = MockLLM.from_env.return_value
+    llm_inst.structured_output.side_effect = [
+        BilingualDraftOutput(
+            en=MastodonDraftOutput(content="Qubits explained #Quantum", hashtags=["Quantum"]),
+            de=MastodonDraftOutput(content="Qubits erklärt #Quanten", hashtags=["#Quanten"]),
+        ),
+        BilingualDraftCritique(en=_critique(88), de=_critique(81)),
+    ]
+
+    count = create_drafts(storage, plan)
+
+    assert count == 2
+    assert llm_inst.structured_output.call_count == 2
+    llm_inst.chat.assert_not_called()
+    drafts = ContentQueue.model_validate(store["content_queue.json"]).drafts
+    assert [d.language for d in drafts] == ["en", "de"]
+    assert drafts[0].hashtags == ["#Quantum"]
+    assert drafts[1].content == "Qubits erklärt #Quanten"
+    assert [d.quality_score for d in drafts] == [88, 81]
+    assert drafts[0].scheduled_at == drafts[1].scheduled_at
+    # The JSON instruction is the only output format in the combined prompt.
+    prompt = llm_inst.structured_output.call_args_list[0].kwargs["messages"][1]["content"]
+    assert "Return JSON with keys en and de" in prompt
+    assert "Return ONLY" not in prompt and "Gib NUR" not in prompt
+
+
+def test_article_summary_store_hits_misses_and_lru_cap(mock_storage):
+    """Summaries are keyed by content hash: unchanged text hits, edits re-summarize."""
+    from agent.summaries import ArticleSummaryStore
+
+    storage, store = mock_storage
+    llm = MagicMock()
+    llm.admit.return_value = True
+    llm.chat.side_effect = [{"content": f"Summary {i}"} for i in range(4)]
+
+    summaries = ArticleSummaryStore(storage, max_entries=2)
+    url = "https://fretchen.eu/quantum"
+    assert summaries.get_or_create(llm, url, "Quantum", "Qubits are  fun.") == "Summary 0"
+    assert summaries.get_or_create(llm, url, "Quantum", "Qubits are fun.") == "Summary 0"
+    assert summaries.get_or_create(llm, url, "Quantum", "Qubits are great.") == "Summary 1"
+    assert llm.chat.call_count == 2
+    assert summaries.latest_for_url("https://fretchen.eu/quantum/") == "Summary 1"
+
+    summaries.get_or_create(llm, "https://fretchen.eu/a/", "A", "Article A")
+    summaries.get_or_create(llm, "https://fretchen.eu/b/", "B", "Article B")
+    summaries.save()
+
+    saved = store["article_summaries.json"]
+    assert len(saved["entries"]) == 2  # the edited quantum entry was least recently used
+    assert summaries.latest_for_url(url) is None
+    assert (saved["hits"], saved["misses"], saved["evictions"]) == (1, 4, 1)
+
+
+@patch("agent.nodes.drafts.LLMClient")
+def test_create_drafts_uses_cached_article_summary(MockLLM, mock_storage, _no_article_fetch):
+    """A cached summary for the unchanged article is added to the prompt without an LLM call."""
+    from agent.page_meta import ArticleFetch
+    from agent.summaries import ArticleSummaryStore
+
+    storage, store = mock_storage
+    _no_article_fetch.return_value = ArticleFetch(text="Full article body about qubits.")
+    cached = ArticleSummaryStore(storage)
+    cached.put("https://fretchen.eu/quantum/", "Full article body about qubits.", "Qubit gist.")
+    cached.save()
+
+    plan = ContentPlan(
+        items=[
+            ContentPlanItem(
+                page_url="https://fretchen.eu/quantum/",
+                page_title="Quantum Blog",
+                page_description="Quantum computing intro",
+                channel="bluesky",
+                scheduled_at=datetime(2025, 6, 11, 7, 0, tzinfo=timezone.utc),
+            )
+        ]
+    )
+    llm_inst = MockLLM.from_env.return_value
+    llm_inst.chat.return_value = {"content": "Qubits, briefly."}
+    llm_inst.structured_output.return_value = DraftCritique(
+        has_strong_hook=True,
+        follows_platform_conventions=True,
+        mentions_specific_insight=True,
+        includes_link=True,
+        appropriate_tone=True,
+        overall_score=90,
+        issues=[],
+    )
+
+    assert create_drafts(storage, plan) == 1
+
+    assert llm_inst.chat.call_count == 1  # draft only, no summary call
+    prompt = llm_inst.chat.call_args.kwargs["messages"][1]["content"]
+    assert "Key points: Qubit gist." in prompt
+    assert store["article_summaries.json"]["hits"] == 1
+
+
+def test_summarize_pages_revalidates_with_stored_validators(mock_storage, _no_article_fetch):
+    """A stored ETag is sent back; 304 reuses the summary without the body or an LLM call."""
+    import httpx
+
+    from agent.page_meta import ArticleFetch, fetch_article
+    from agent.summaries import ArticleSummaryStore
+
+    storage, store = mock_storage
+    url = "https://fretchen.eu/quantum/"
+    llm = MagicMock()
+    llm.admit.return_value = True
+    llm.chat.return_value = {"content": "Qubit gist."}
+
+    _no_article_fetch.return_value = ArticleFetch(text="Body v1", etag='"v1"')
+    summaries = ArticleSummaryStore(storage)
+    assert summaries.summarize_pages(llm, [(url, "Quantum")]) == {url: "Qubit gist."}
+    summaries.save()
+    assert _no_article_fetch.call_args.kwargs["etag"] is None
+
+    _no_article_fetch.return_value = ArticleFetch(text=None, etag='"v1"')
+    again = ArticleSummaryStore(storage)
+    assert again.summarize_pages(llm, [(url, "Quantum")]) == {url: "Qubit gist."}
+    assert _no_article_fetch.call_args.kwargs["etag"] == '"v1"'
+    assert llm.chat.call_count == 1
+    assert again.stats()["hits"] == 1
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html="<article>Body v1</article>", headers={"ETag": '"v1"'})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    assert fetch_article(url, client=client) == ArticleFetch(text="Body v1", etag='"v1"')
+    assert fetch_article(url, client=client, etag='"v1"') == ArticleFetch(text=None, etag='"v1"')
+
+
+def test_summarize_pages_fetches_articles_concurrently(mock_storage, _no_article_fetch):
+    """Article downloads overlap (bounded by ARTICLE_FETCH_WORKERS); results keep page order."""
+    import threading
+
+    from agent.page_meta import ArticleFetch
+    from agent.summaries import ArticleSummaryStore
+
+    storage, _store = mock_storage
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch(url, **_kwargs):
+        barrier.wait()  # only passes with three downloads in flight
+        return ArticleFetch(text=f"Body of {url}")
+
+    _no_article_fetch.side_effect = fetch
+    llm = MagicMock()
+    llm.admit.return_value = True
+    llm.chat.side_effect = lambda **kw: {"content": kw["messages"][1]["content"][-9:]}
+    urls = [f"https://fretchen.eu/p{i}/" for i in range(3)]
+
+    result = ArticleSummaryStore(storage).summarize_pages(llm, [(u, "T") for u in urls])
+    assert list(result) == urls
+
+
 # ---------------------------------------------------------------------------
 # handle() — integration-level tests
 # ---------------------------------------------------------------------------
@@ -745,9 +1667,10 @@ def test_handle_weekly_on_monday(
     mock_publish.return_value = []
     mock_ingest.return_value = MagicMock()
 
-    analysis = LLMAnalysis(
+    analysis = LLMAnalysisRecord(
         best_pages_for_social=[],
         growth_opportunities=[],
+        decision_reason="no_previous_analysis",
     )
     mock_insights.return_value = analysis
 
@@ -768,6 +1691,7 @@ def test_handle_weekly_on_monday(
     assert body["drafts_created"] == 0
     assert body["analytics"] is True
     assert body["insights"] is True  # Monday — insights ran
+    assert body["insights_decision"] == "refreshed:no_previous_analysis"
 
 
 @patch("agent.nodes.publish.publish_approved_drafts")
@@ -852,6 +1776,69 @@ def test_plan_draft_schedule_zero_needed():
     assert plan_draft_schedule(ContentQueue(), 0) == []
 
 
+def test_plan_draft_schedule_calendar_slots_caps_and_blackouts():
+    """Several slots per day, a per-channel daily cap and a blackout day are honoured."""
+    now = datetime(2025, 4, 10, 8, 0, tzinfo=timezone.utc)
+    queue = ContentQueue(
+        drafts=[
+            Draft(
+                id="d1",
+                channel="mastodon",
+                language="en",
+                content="a",
+                scheduled_at=datetime(2025, 4, 11, 7, 0, tzinfo=timezone.utc),
+            )
+        ]
+    )
+    config = CalendarConfig(
+        slot_times=["07:00", "15:00"],
+        channel_daily_capacity={"mastodon": 1},
+        blackouts=[
+            BlackoutWindow(
+                start=datetime(2025, 4, 12, tzinfo=timezone.utc),
+                end=datetime(2025, 4, 13, tzinfo=timezone.utc),
+            )
+        ],
+    )
+    schedule = plan_draft_schedule(queue, 4, now=now, config=config)
+    assert schedule == [
+        ("bluesky", datetime(2025, 4, 11, 15, 0, tzinfo=timezone.utc)),
+        ("mastodon", datetime(2025, 4, 13, 7, 0, tzinfo=timezone.utc)),
+        ("bluesky", datetime(2025, 4, 13, 15, 0, tzinfo=timezone.utc)),
+        ("mastodon", datetime(2025, 4, 14, 7, 0, tzinfo=timezone.utc)),
+    ]
+
+    # Mastodon-only rotation with a cap of one: the second daily slot stays empty.
+    schedule = plan_draft_schedule(ContentQueue(), 2, now=now, channels=["mastodon"], config=config)
+    assert [slot.day for _, slot in schedule] == [11, 13]
+
+
+@patch("agent.nodes.plan.fetch_pages_meta", return_value={})
+def test_build_plan_items_rebuilds_bookings_from_queue(_mock_fetch, mock_storage):
+    """Bookings left in calendar.json (e.g. for a draft rejected in the UI) free up."""
+    from agent.models import CalendarBooking, CalendarState
+    from agent.nodes.plan import build_plan_items
+
+    storage, store = mock_storage
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).date()
+    slot = datetime.combine(tomorrow, datetime.min.time().replace(hour=7), tzinfo=timezone.utc)
+    storage.write(
+        "calendar.json",
+        CalendarState(
+            config=CalendarConfig(channel_daily_capacity={"mastodon": 1, "bluesky": 0}),
+            bookings=[CalendarBooking(at=slot, channel="mastodon", ref="rejected-draft")],
+        ),
+    )
+    page = {"page_url": "https://fretchen.eu/q", "t_days": None, "weight": 1.0}
+
+    (item,) = build_plan_items(ContentQueue(), [page], storage=storage)
+
+    assert (item.channel, item.scheduled_at) == ("mastodon", slot)
+    state = CalendarState.model_validate(store["calendar.json"])
+    assert [b.ref for b in state.bookings] == ["https://fretchen.eu/q"]
+    assert state.config.channel_daily_capacity == {"mastodon": 1, "bluesky": 0}
+
+
 # ---------------------------------------------------------------------------
 # create_plan — simple registry planner behavior
 # ---------------------------------------------------------------------------
@@ -878,6 +1865,33 @@ def test_create_plan_pipeline_full(mock_fetch, mock_storage):
     mock_fetch.assert_not_called()
 
 
+@patch("agent.nodes.plan.fetch_pages_meta", return_value={})
+def test_create_plan_counts_bilingual_pairs_once(_mock_fetch, mock_storage):
+    """An en+de pair shares one plan slot, so it fills one pipeline place, not two."""
+    storage, _store = mock_storage
+    pairs = PIPELINE_TARGET // 2
+    now = datetime.now(timezone.utc)
+    drafts = [
+        Draft(
+            id=f"d{i}-{lang}",
+            channel="mastodon",
+            language=lang,
+            content=f"Post {i}",
+            link=f"https://fretchen.eu/p{i}?utm_source=mastodon&utm_campaign=growth-agent",
+            scheduled_at=now + timedelta(days=i + 1),
+        )
+        for i in range(pairs)
+        for lang in ("en", "de")
+    ]
+    storage.write("content_queue.json", ContentQueue(drafts=drafts))
+    storage.write("registry_clean.json", {"urls": [f"https://fretchen.eu/r{i}" for i in range(20)]})
+
+    plan = create_plan(storage, seed=1)
+
+    assert plan.diagnostics["existing_pipeline"] == pairs
+    assert len(plan.items) == PIPELINE_TARGET - pairs
+
+
 @patch("agent.nodes.plan.fetch_pages_meta")
 def test_create_plan_pipeline_partial(mock_fetch, mock_storage):
     """When pipeline has 7 drafts, planner creates only 3 items from registry."""
@@ -1117,6 +2131,531 @@ def test_create_plan_excludes_urls_already_in_pending_pipeline(mock_fetch, mock_
     assert all(item.page_url == "https://fretchen.eu/allowed/" for item in plan.items)
 
 
+def _sequential_inclusion_probabilities(weights: list[float], k: int) -> list[float]:
+    """Exact inclusion probabilities of k successive weighted draws without replacement."""
+    probs = [0.0] * len(weights)
+
+    def walk(remaining: list[int], p: float, depth: int) -> None:
+        if depth == k:
+            return
+        total = sum(weights[i] for i in remaining)
+        for i in remaining:
+            q = p * weights[i] / total
+            probs[i] += q
+            walk([j for j in remaining if j != i], q, depth + 1)
+
+    walk(list(range(len(weights))), 1.0, 0)
+    return probs
+
+
+@pytest.mark.parametrize("sampler", ["python", "numpy"])
+def test_weighted_draw_matches_sequential_draw_distribution(sampler):
+    """Exponential-key sampling keeps the distribution of repeated rng.choices draws."""
+    import random
+
+    from agent.nodes import plan as plan_module
+
+    if sampler == "numpy":
+        pytest.importorskip("numpy")
+    urls = [f"https://fretchen.eu/p{i}/" for i in range(5)]
+    last_days = {urls[0]: 1.0, urls[1]: 10.0, urls[2]: 30.0, urls[3]: 90.0}  # p4: never posted
+    weights = [plan_module._weight_for_days(last_days.get(u), 30.0) for u in urls]
+    expected = _sequential_inclusion_probabilities(weights, k=2)
+
+    rng = random.Random(1234)
+    trials = 20_000
+    counts = dict.fromkeys(urls, 0)
+    with patch.object(plan_module, "NUMPY_MIN_POOL", 0 if sampler == "numpy" else 10**9):
+        for _ in range(trials):
+            for page in plan_module._weighted_draw(urls, last_days, 2, 30.0, rng=rng):
+                counts[page["page_url"]] += 1
+
+    for url, p in zip(urls, expected):
+        assert counts[url] / trials == pytest.approx(p, abs=0.015)
+
+    first = plan_module._weighted_draw(urls, last_days, 3, 30.0, rng=random.Random(7))
+    second = plan_module._weighted_draw(urls, last_days, 3, 30.0, rng=random.Random(7))
+    assert first == second
+
+
+@pytest.mark.benchmark
+def test_weighted_draw_100k_urls_benchmark():
+    """Sampling 10 pages from a 100k-URL registry stays well below a second.
+
+    Timing depends on the machine, so this only runs with ``pytest -m benchmark``.
+    """
+    import random
+    import time
+
+    from agent.nodes.plan import _weighted_draw
+
+    rng = random.Random(42)
+    urls = [f"https://fretchen.eu/page-{i}/" for i in range(100_000)]
+    last_days = {url: rng.uniform(0.0, 365.0) for url in urls[::2]}
+
+    start = time.perf_counter()
+    chosen = _weighted_draw(urls, last_days, PIPELINE_TARGET, 30.0, rng=rng)
+    elapsed = time.perf_counter() - start
+
+    assert len({c["page_url"] for c in chosen}) == PIPELINE_TARGET
+    assert elapsed < 1.0, f"weighted draw over 100k URLs took {elapsed:.3f}s"
+
+
+@patch("agent.nodes.plan.fetch_pages_meta", return_value={})
+def test_create_plan_seed_is_recorded_and_reproducible(_mock_fetch, mock_storage):
+    """The same seed selects the same pages; the seed used is kept in the diagnostics."""
+    storage, _store = mock_storage
+    storage.write("registry_clean.json", {"urls": [f"https://fretchen.eu/p{i}" for i in range(50)]})
+
+    first = create_plan(storage, seed=42)
+    second = create_plan(storage, seed=42)
+    assert first.diagnostics["seed"] == 42
+    assert [i.page_url for i in first.items] == [i.page_url for i in second.items]
+    assert isinstance(create_plan(storage).diagnostics["seed"], int)
+
+
+def test_simulate_plan_is_seeded_and_reports_coverage():
+    """A simulated year is deterministic per seed and publishes one post per day."""
+    from agent.plan_sim import simulate_plan, sweep, synthetic_registry
+
+    urls = synthetic_registry(60)
+    start = datetime(2025, 1, 1, 6, 0, tzinfo=timezone.utc)
+    result = simulate_plan(urls, 120, seed=5, start=start)
+    again = simulate_plan(urls, 120, seed=5, start=start)
+
+    assert result.repeat_intervals == again.repeat_intervals
+    assert result.posts == 118  # slots start the day after the first run, publish a day later
+    assert 0 < result.coverage <= 1
+    # A page is never re-planned while it is still pending, so repeats are spaced out.
+    assert result.interval_stats()["min"] >= 1
+    assert len(sweep(urls, 30, [14.0, 30.0], [5, 10])) == 4
+
+
+def test_simulate_plan_starts_after_a_current_snapshot():
+    """Without ``start``, a snapshot from this year is simulated forward from its last post."""
+    from agent.plan_sim import simulate_plan, sweep, synthetic_registry
+
+    urls = synthetic_registry(40)
+    now = datetime.now(timezone.utc)
+    queue = ContentQueue(
+        published=[
+            Draft(
+                id=f"p{i}",
+                channel="mastodon",
+                language="en",
+                content="x",
+                link=urls[i],
+                scheduled_at=now - timedelta(days=i + 1),
+            )
+            for i in range(10)
+        ],
+        approved=[  # a full pipeline of upcoming posts
+            Draft(
+                id=f"a{i}",
+                channel="bluesky",
+                language="en",
+                content="x",
+                link=urls[10 + i],
+                scheduled_at=now + timedelta(days=i + 1),
+            )
+            for i in range(PIPELINE_TARGET)
+        ],
+    )
+
+    result = simulate_plan(urls, 60, seed=1, queue=queue)
+    assert result.posts > 0 and result.coverage > 0
+    assert sweep(urls, 60, [30.0], [PIPELINE_TARGET], seed=1, queue=queue)[0].posts > 0
+
+
+def _page_html(title: str, description: str) -> str:
+    return (
+        f"<html><head><title>{title}</title>"
+        f'<meta name="description" content="{description}"></head><body></body></html>'
+    )
+
+
+@patch("agent.nodes.plan.fetch_sitemap")
+def test_create_plan_refreshes_stale_registry_incrementally(mock_sitemap, mock_storage):
+    """A stale registry is diffed against the sitemap; only new/changed pages are fetched.
+
+    The unchanged page's metadata is days old but costs no request: changed pages are
+    invalidated explicitly, so the cache TTL is far longer than the daily cron.
+    """
+    import httpx
+
+    from agent.models import PageMeta, PageMetaCache, RegistryPages, SitemapEntry, SitemapState
+    from agent.page_meta import PAGE_META_TTL_SECONDS
+    from agent.sitemap import SitemapFetch
+
+    storage, store = mock_storage
+    now = datetime.now(timezone.utc)
+    base = "https://fretchen.eu"
+    storage.write(
+        "registry_clean.json",
+        {
+            "urls": [f"{base}/a/", f"{base}/b/", f"{base}/c/"],
+            "generated_at": (now - timedelta(days=10)).isoformat(),
+        },
+    )
+    seen = now - timedelta(days=10)
+    storage.write(
+        "registry_pages.json",
+        RegistryPages.model_validate(
+            {
+                "pages": {
+                    f"{base}/{p}/": {
+                        "url": f"{base}/{p}/",
+                        "lastmod": "2026-01-01",
+                        "first_seen": seen,
+                    }
+                    for p in "abc"
+                }
+            }
+        ),
+    )
+    storage.write(
+        "page_meta_cache.json",
+        PageMetaCache.model_validate(
+            {
+                "entries": {
+                    f"{base}/{p}/": {
+                        "meta": PageMeta(url=f"{base}/{p}/", title=p, description=f"Cached {p}"),
+                        "fetched_at": seen,
+                        "ttl_seconds": PAGE_META_TTL_SECONDS,
+                    }
+                    for p in "abc"
+                }
+            }
+        ),
+    )
+    mock_sitemap.return_value = SitemapFetch(
+        entries=[
+            SitemapEntry(loc=f"{base}/a", lastmod="2026-02-01"),  # changed
+            SitemapEntry(loc=f"{base}/b", lastmod="2026-01-01"),  # unchanged
+            SitemapEntry(loc=f"{base}/d", lastmod="2026-02-01"),  # added; c removed
+        ],
+        state=SitemapState(),
+        modified=True,
+        requests=1,
+    )
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, text=_page_html("Fresh", "Fetched"))
+
+    real_client = httpx.Client
+    with patch(
+        "agent.page_meta.httpx.Client",
+        side_effect=lambda **kw: real_client(transport=httpx.MockTransport(handler)),
+    ):
+        plan = create_plan(storage)
+
+    assert store["registry.json"]["diff"] == {"added": 1, "removed": 1, "changed": 1}
+    assert sorted(requested) == [f"{base}/a/", f"{base}/d/"]
+    descriptions = {item.page_url: item.page_description for item in plan.items}
+    assert descriptions == {
+        f"{base}/a/": "Fetched",
+        f"{base}/b/": "Cached b",
+        f"{base}/d/": "Fetched",
+    }
+    pages = RegistryPages.model_validate(store["registry_pages.json"]).pages
+    assert sorted(pages) == [f"{base}/a/", f"{base}/b/", f"{base}/d/"]
+    assert pages[f"{base}/a/"].lastmod == "2026-02-01"
+    assert f"{base}/c/" not in store["page_meta_cache.json"]["entries"]
+
+
+def test_fetch_pages_meta_cache_serves_within_ttl_and_revalidates_after():
+    """Fresh entries cost no request; expired ones are revalidated with If-None-Match."""
+    import httpx
+
+    from agent.page_meta import fetch_pages_meta
+
+    storage_store: dict = {}
+
+    class Storage:
+        def read(self, key):
+            return storage_store.get(key)
+
+        def write(self, key, data):
+            storage_store[key] = data.model_dump(mode="json")
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=_page_html("Q", "Qubits"), headers={"ETag": '"v1"'})
+
+    url = "https://fretchen.eu/quantum/"
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        first = fetch_pages_meta([url], storage=Storage(), client=client)
+        cached = fetch_pages_meta([url], storage=Storage(), client=client)
+        assert len(requests) == 1
+
+        expired = fetch_pages_meta([url], storage=Storage(), client=client, ttl_seconds=0)
+        revalidated = fetch_pages_meta([url], storage=Storage(), client=client)
+
+    assert first[url].description == cached[url].description == "Qubits"
+    assert expired[url].title == revalidated[url].title == "Q"
+    # initial fetch, then two conditional revalidations answered with 304
+    assert [r.headers.get("if-none-match") for r in requests] == [None, '"v1"', '"v1"']
+
+
+def test_fetch_pages_meta_concurrent_with_host_cap_and_deadline():
+    """Pages are fetched in parallel, capped per host; a deadline returns partial results."""
+    import threading
+    import time
+
+    import httpx
+
+    from agent.page_meta import PAGE_META_PER_HOST, fetch_pages_meta
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(1.0 if request.url.path == "/slow/" else 0.05)
+        with lock:
+            active["now"] -= 1
+        return httpx.Response(200, text=_page_html(request.url.path, "d"))
+
+    urls = [f"https://fretchen.eu/p{i}/" for i in range(12)]
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        start = time.perf_counter()
+        metas = fetch_pages_meta(urls, client=client)
+        elapsed = time.perf_counter() - start
+        partial = fetch_pages_meta(
+            ["https://fretchen.eu/slow/", urls[0]], client=client, deadline_seconds=0.3
+        )
+
+    assert list(metas) == urls
+    assert active["max"] == PAGE_META_PER_HOST
+    assert elapsed < 12 * 0.05  # faster than sequential
+    assert list(partial) == [urls[0]]
+
+
+def test_fetch_pages_meta_degrades_on_errors_and_keeps_client_for_stragglers():
+    """An unexpected fetch error drops only that page; an owned client outlives stragglers."""
+    import threading
+
+    import httpx
+
+    from agent.page_meta import fetch_pages_meta
+
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/broken/":
+            raise RuntimeError("decoder exploded")
+        if request.url.path == "/slow/":
+            release.wait(5)
+        return httpx.Response(200, text=_page_html(request.url.path, "d"))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    urls = ["https://fretchen.eu/broken/", "https://fretchen.eu/ok/", "https://fretchen.eu/slow/"]
+    with patch("agent.page_meta.httpx.Client", return_value=client):
+        metas = fetch_pages_meta(urls, deadline_seconds=0.3)
+
+    assert list(metas) == ["https://fretchen.eu/ok/"]
+    assert not client.is_closed  # the slow request is still using it
+    release.set()
+    for _ in range(50):
+        if client.is_closed:
+            break
+        threading.Event().wait(0.05)
+    assert client.is_closed
+
+
+def test_fetch_page_meta_stops_reading_after_head():
+    """Only the head is parsed; the body stream is abandoned after </head>."""
+    import httpx
+
+    from agent.page_meta import fetch_page_meta
+
+    pulled = []
+
+    def body():
+        head = (
+            '<html><head><title>Qubits &amp; Co</title><link rel="canonical" '
+            'href="https://www.fretchen.eu/quantum/"><meta content="Intro to qubits" '
+            'property="og:description"><meta property="og:image" content="/q.png"></head>'
+        )
+        for chunk in [head] + ["<p>" + "x" * 65536 + "</p>"] * 20:
+            pulled.append(chunk)
+            yield chunk.encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body(), headers={"Content-Type": "text/html"})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        meta = fetch_page_meta("https://fretchen.eu/quantum/", client=client)
+
+    assert meta is not None
+    assert meta.title == "Qubits & Co"
+    assert meta.description == "Intro to qubits"  # og:description fallback, any attr order
+    assert meta.og["og:image"] == "/q.png"
+    assert meta.canonical == "https://www.fretchen.eu/quantum/"
+    assert len(pulled) <= 2
+
+
+def test_parse_head_byte_cap_counts_utf8_bytes():
+    """A head without </head> stops at max_bytes encoded bytes, not characters."""
+    from agent.page_meta import parse_head
+
+    pulled = []
+
+    def chunks():
+        yield "<html><head><title>Grüße</title>"
+        for _ in range(10):
+            pulled.append(1)
+            yield "<!-- " + "ü" * 500 + " -->"  # ~1 KB encoded, ~500 characters
+
+    meta = parse_head("https://fretchen.eu/de/", chunks(), max_bytes=4000)
+
+    assert meta.title == "Grüße"
+    assert len(pulled) == 4  # a character count would have read 8 chunks
+
+
+def _sitemap_xml(root: str, tag: str, locs: list[str]) -> bytes:
+    ns = "http://www.sitemaps.org/schemas/sitemap/0.9"
+    body = "".join(
+        f"<{tag}><loc>{loc}</loc><lastmod>2026-01-0{i + 1}</lastmod></{tag}>"
+        for i, loc in enumerate(locs)
+    )
+    return f'<?xml version="1.0"?><{root} xmlns="{ns}">{body}</{root}>'.encode()
+
+
+def test_exclusion_rules_trie_matches_startswith_semantics():
+    """Trie matching is equivalent to path.startswith(prefix) and reports the rule."""
+    from agent.exclusions import ExclusionRules
+
+    prefixes = ["/tags/", "/blog/dr", "/archive", "/a/b/"]
+    rules = ExclusionRules(
+        urls=["https://fretchen.eu/imprint"],
+        prefixes=prefixes,
+        globs=["/blog/*/print/"],
+        regexes=[r"^/\d{4}/", "("],  # invalid regex is ignored
+    )
+    paths = [
+        "/", "/tags/", "/tags/x/", "/tag/", "/blog/draft-1/", "/blog/dr/", "/blog/d/",
+        "/archive/", "/archives/", "/a/", "/a/b/", "/a/bc/", "/blog/x/print/", "/2024/05/",
+    ]  # fmt: skip
+    for path in paths:
+        url = f"https://fretchen.eu{path}"
+        expected = next((p for p in prefixes if path.startswith(p)), None)
+        rule = rules.match(url)
+        if expected:
+            assert rule == f"prefix:{expected}", path
+        elif path == "/blog/x/print/":
+            assert rule == "glob:/blog/*/print/"
+        elif path == "/2024/05/":
+            assert rule == r"regex:^/\d{4}/"
+        else:
+            assert rule is None, path
+    assert rules.match("https://fretchen.eu/imprint/") == "url:https://fretchen.eu/imprint"
+
+
+@patch("agent.nodes.plan.fetch_sitemap")
+def test_registry_clean_records_exclusion_rule(mock_sitemap, mock_storage):
+    """registry_clean.json lists which rule excluded each URL."""
+    from agent.models import SitemapEntry, SitemapState
+    from agent.nodes.plan import _prepare_registry_urls
+    from agent.sitemap import SitemapFetch
+
+    storage, store = mock_storage
+    storage.write("registry_excluded.json", {"prefixes": ["/tags/"], "globs": ["*/draft-*"]})
+    mock_sitemap.return_value = SitemapFetch(
+        entries=[
+            SitemapEntry(loc="https://fretchen.eu/tags/ai"),
+            SitemapEntry(loc="https://fretchen.eu/blog/draft-2"),
+            SitemapEntry(loc="https://fretchen.eu/blog/post"),
+        ],
+        state=SitemapState(),
+        modified=True,
+        requests=1,
+    )
+
+    urls, refreshed, excluded_count = _prepare_registry_urls(storage)
+
+    assert (urls, refreshed, excluded_count) == (["https://fretchen.eu/blog/post/"], True, 2)
+    assert store["registry_clean.json"]["excluded"] == {
+        "https://fretchen.eu/tags/ai/": "prefix:/tags/",
+        "https://fretchen.eu/blog/draft-2/": "glob:*/draft-*",
+    }
+
+
+def test_fetch_sitemap_conditional_refetch_costs_one_304():
+    """Stored ETags turn an unchanged sitemap into a single 304 with reused entries."""
+    import httpx
+
+    from agent.sitemap import fetch_sitemap
+
+    xml = _sitemap_xml("urlset", "url", ["https://www.fretchen.eu/a", "https://www.fretchen.eu/b"])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=xml, headers={"ETag": '"v1"'})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        first = fetch_sitemap("https://www.fretchen.eu/sitemap.xml", client=client)
+        second = fetch_sitemap("https://www.fretchen.eu/sitemap.xml", first.state, client=client)
+
+    assert first.modified and [e.lastmod for e in first.entries] == ["2026-01-01", "2026-01-02"]
+    assert not second.modified
+    assert second.requests == 1
+    assert second.entries == first.entries
+    assert len(requests) == 2
+
+
+def test_fetch_sitemap_index_fans_out_to_gzipped_children():
+    """A sitemapindex is expanded concurrently; .xml.gz children are decompressed."""
+    import gzip
+
+    import httpx
+
+    from agent.sitemap import fetch_sitemap
+
+    base = "https://www.fretchen.eu"
+    bodies = {
+        "/sitemap.xml": _sitemap_xml(
+            "sitemapindex", "sitemap", [f"{base}/pages.xml.gz", f"{base}/blog.xml"]
+        ),
+        "/pages.xml.gz": gzip.compress(_sitemap_xml("urlset", "url", [f"{base}/a"])),
+        "/blog.xml": _sitemap_xml("urlset", "url", [f"{base}/blog/1", f"{base}/blog/2"]),
+    }
+
+    etags = dict.fromkeys(bodies, '"x"')
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etag = etags[request.url.path]
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=bodies[request.url.path], headers={"ETag": etag})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        result = fetch_sitemap(f"{base}/sitemap.xml", client=client)
+        unchanged = fetch_sitemap(f"{base}/sitemap.xml", result.state, client=client)
+        # A child changes while the index stays byte-identical.
+        bodies["/blog.xml"] = _sitemap_xml("urlset", "url", [f"{base}/blog/3"])
+        etags["/blog.xml"] = '"y"'
+        child_changed = fetch_sitemap(f"{base}/sitemap.xml", unchanged.state, client=client)
+
+    assert [e.loc for e in result.entries] == [f"{base}/a", f"{base}/blog/1", f"{base}/blog/2"]
+    assert result.requests == 3
+    assert (unchanged.requests, unchanged.modified) == (3, False)  # one 304 per document
+    assert unchanged.entries == result.entries
+    assert child_changed.modified
+    assert [e.loc for e in child_changed.entries] == [f"{base}/a", f"{base}/blog/3"]
+
+
 # ---------------------------------------------------------------------------
 # handle() — daily pipeline refill without saved analysis
 # ---------------------------------------------------------------------------
@@ -1214,7 +2753,7 @@ class TestRunServer:
 # ---------------------------------------------------------------------------
 
 
-@patch("agent.nodes.publish.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_publish_sets_published_at(MockMasto, mock_storage):
     """Successful publish populates published_at on the draft."""
     storage, store = mock_storage
@@ -1282,7 +2821,7 @@ def test_former_posts_context_empty_when_no_history():
 
 
 @patch("agent.nodes.publish.publish_draft")
-@patch("agent.nodes.publish.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_publish_stores_platform_id_mastodon(MockMasto, mock_publish, mock_storage):
     """platform_id is populated from the Mastodon API response after publish."""
     storage, store = mock_storage
@@ -1305,7 +2844,7 @@ def test_publish_stores_platform_id_mastodon(MockMasto, mock_publish, mock_stora
 
 
 @patch("agent.nodes.publish.publish_draft")
-@patch("agent.nodes.publish.BlueskyClient")
+@patch("agent.platforms.pool.BlueskyClient")
 def test_publish_stores_platform_id_bluesky(MockBsky, mock_publish, mock_storage):
     """platform_id is populated from the Bluesky AT URI after publish."""
     storage, store = mock_storage
@@ -1323,7 +2862,7 @@ def test_publish_stores_platform_id_bluesky(MockBsky, mock_publish, mock_storage
 
 
 @patch("agent.nodes.publish.publish_draft")
-@patch("agent.nodes.publish.MastodonClient")
+@patch("agent.platforms.pool.MastodonClient")
 def test_publish_platform_id_none_when_publisher_returns_none(
     MockMasto, mock_publish, mock_storage
 ):
@@ -1371,18 +2910,281 @@ def test_old_queue_deserializes_without_published_at():
 # ---------------------------------------------------------------------------
 
 
+def _jwt(expires_in: timedelta) -> str:
+    import base64
+
+    exp = int((datetime.now(timezone.utc) + expires_in).timestamp())
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.sig"
+
+
+def _session_json(access_in: timedelta, refresh_in: timedelta = timedelta(days=60)) -> dict:
+    return {"did": "did:plc:me", "accessJwt": _jwt(access_in), "refreshJwt": _jwt(refresh_in)}
+
+
+def _bluesky_client(handler, storage=None):
+    import httpx
+
+    from agent.platforms.bluesky import BlueskyClient
+
+    return BlueskyClient(
+        "me.example", "app-pw", storage=storage, transport=httpx.MockTransport(handler)
+    )
+
+
 def test_bluesky_get_posts_batches():
     """URIs beyond 25 trigger a second HTTP request."""
-    from agent.platforms.bluesky import BlueskyClient
+    import httpx
+
+    calls: list[str] = []
 
-    bsky = BlueskyClient.__new__(BlueskyClient)
-    mock_http = MagicMock()
-    bsky.client = mock_http
-    mock_http.get.return_value.raise_for_status = MagicMock()
-    mock_http.get.return_value.json.return_value = {"posts": [{"uri": "x"}]}
+    def handler(request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit("/", 1)[-1]
+        calls.append(method)
+        if method == "com.atproto.server.createSession":
+            return httpx.Response(200, json=_session_json(timedelta(hours=2)))
+        return httpx.Response(200, json={"posts": [{"uri": "x"}]})
 
-    uris = [f"at://did/post/{i}" for i in range(26)]
-    result = bsky.get_posts(uris)
+    bsky = _bluesky_client(handler)
+    result = bsky.get_posts([f"at://did/post/{i}" for i in range(26)])
 
-    assert mock_http.get.call_count == 2  # batch of 25 + batch of 1
+    assert calls.count("app.bsky.feed.getPosts") == 2  # batch of 25 + batch of 1
     assert len(result) == 2  # one entry per batch response
+
+
+def test_bluesky_get_posts_batches_run_concurrently_in_order():
+    """Batches are in flight together and results keep the URI order."""
+    import threading
+
+    import httpx
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("createSession"):
+            return httpx.Response(200, json=_session_json(timedelta(hours=2)))
+        barrier.wait()  # only passes with all three batches in flight
+        return httpx.Response(
+            200, json={"posts": [{"uri": u} for u in request.url.params.get_list("uris")]}
+        )
+
+    uris = [f"at://did/post/{i}" for i in range(60)]
+    assert [p["uri"] for p in _bluesky_client(handler).get_posts(uris)] == uris
+
+
+def test_bluesky_iter_author_feed_follows_cursor_and_stops_at_since():
+    """Pages are followed via cursor; a pinned old post does not end the sync early."""
+    import httpx
+
+    pages = {
+        None: {
+            "feed": [
+                {
+                    "post": {"uri": "pinned", "indexedAt": "2025-01-01T00:00:00.000Z"},
+                    "reason": {"$type": "app.bsky.feed.defs#reasonPin"},
+                },
+                {"post": {"uri": "p5", "indexedAt": "2025-03-05T00:00:00.000Z"}},
+                {"post": {"uri": "p4", "indexedAt": "2025-03-04T00:00:00.000Z"}},
+            ],
+            "cursor": "c1",
+        },
+        "c1": {
+            "feed": [
+                {"post": {"uri": "p3", "indexedAt": "2025-03-03T00:00:00.000Z"}},
+                {"post": {"uri": "p2", "indexedAt": "2025-03-02T00:00:00.000Z"}},
+            ],
+            "cursor": "c2",
+        },
+    }
+    requested: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("createSession"):
+            return httpx.Response(200, json=_session_json(timedelta(hours=2)))
+        cursor = request.url.params.get("cursor")
+        requested.append(cursor)
+        return httpx.Response(200, json=pages[cursor])
+
+    bsky = _bluesky_client(handler)
+    since = datetime(2025, 3, 2, tzinfo=timezone.utc)
+    assert [i["post"]["uri"] for i in bsky.iter_author_feed(since=since)] == [
+        "pinned",
+        "p5",
+        "p4",
+        "p3",
+    ]
+    assert requested == [None, "c1"]  # stopped at p2 without requesting c2
+
+    # A naive ``since`` is read as UTC instead of failing against the aware indexedAt.
+    naive = [i["post"]["uri"] for i in bsky.iter_author_feed(since=datetime(2025, 3, 2))]
+    assert naive == ["pinned", "p5", "p4", "p3"]
+
+
+def test_bluesky_iter_author_feed_repost_of_old_post_does_not_stop_sync():
+    """A repost sorts by when it was reposted; the old original's indexedAt is ignored."""
+    import httpx
+
+    feed = [
+        {"post": {"uri": "a", "indexedAt": "2026-10-10T00:00:00.000Z"}},
+        {
+            "post": {"uri": "old", "indexedAt": "2024-05-01T00:00:00.000Z"},
+            "reason": {
+                "$type": "app.bsky.feed.defs#reasonRepost",
+                "indexedAt": "2026-10-09T00:00:00.000Z",
+            },
+        },
+        {"post": {"uri": "b", "indexedAt": "2026-10-08T00:00:00.000Z"}},
+        {"post": {"uri": "c", "indexedAt": "2026-09-20T00:00:00.000Z"}},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("createSession"):
+            return httpx.Response(200, json=_session_json(timedelta(hours=2)))
+        return httpx.Response(200, json={"feed": feed})
+
+    since = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    items = _bluesky_client(handler).iter_author_feed(since=since)
+    assert [i["post"]["uri"] for i in items] == ["a", "old", "b"]
+
+
+@patch("agent.platforms.pool.BlueskyClient")
+def test_bluesky_feed_sync_backfills_and_feeds_metrics(MockBsky, mock_storage):
+    """Own feed posts fill in missing platform_ids and replace get_posts for those URIs."""
+    import httpx
+
+    from agent.timeline_sync import sync_bluesky_feed
+
+    storage, store = mock_storage
+    now = datetime.now(timezone.utc)
+    link = "https://fretchen.eu/blog/42"
+
+    def item(n: int, text: str, author: str = "did:plc:me", **extra) -> dict:
+        at = (now - timedelta(hours=10 - n)).isoformat()
+        post = {
+            "uri": f"at://did:plc:me/app.bsky.feed.post/{n}",
+            "author": {"did": author},
+            "record": {"text": text, "createdAt": at},
+            "indexedAt": at,
+            **extra,
+        }
+        return {"post": post}
+
+    linked = item(4, "Fresh words fretchen.eu/blog/42", repostCount=2)
+    linked["post"]["record"]["facets"] = [
+        {"features": [{"$type": "app.bsky.richtext.facet#link", "uri": f"{link}?utm=x"}]}
+    ]
+    feed = [
+        item(5, "someone else", author="did:plc:other"),
+        linked,
+        item(3, "Qubits & you", likeCount=4),
+        item(2, "unrelated"),
+    ]
+    cursors: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("createSession"):
+            return httpx.Response(200, json=_session_json(timedelta(hours=2)))
+        cursors.append(request.url.params.get("cursor"))
+        return httpx.Response(200, json={"feed": feed})
+
+    def draft(draft_id: str, content: str, **extra) -> Draft:
+        return Draft(
+            id=draft_id,
+            channel="bluesky",
+            language="en",
+            content=content,
+            published_at=now - timedelta(hours=8),
+            **extra,
+        )
+
+    storage.write(
+        "content_queue.json",
+        ContentQueue(
+            published=[
+                draft("text", "Qubits & you"),
+                draft("link", f"Fresh words {link}", link=link),
+                draft("missing", "never posted"),
+            ]
+        ),
+    )
+    bsky = _bluesky_client(handler)
+
+    posts = sync_bluesky_feed(storage, bsky, "did:plc:me", now=now)
+    assert set(posts) == {linked["post"]["uri"], feed[2]["post"]["uri"]}
+    queue = ContentQueue.model_validate(store["content_queue.json"])
+    assert {d.id: d.platform_id for d in queue.published} == {
+        "text": feed[2]["post"]["uri"],
+        "link": linked["post"]["uri"],
+        "missing": None,
+    }
+    state = BlueskyFeedState.model_validate(store["bluesky_feed.json"])
+    assert state.last_indexed_at == now - timedelta(hours=6)
+
+    # The next sync stops at the stored indexedAt instead of re-reading the feed.
+    assert sync_bluesky_feed(storage, bsky, "did:plc:me", now=now) == {}
+    assert cursors == [None, None]
+
+    # Metrics for the synced posts come from the feed response, not get_posts.
+    _collect_post_metrics(storage, bluesky_posts=posts)
+    MockBsky.return_value.get_posts.assert_not_called()
+    by_id = {p.id: p for p in Performance.model_validate(store["performance.json"]).posts}
+    assert (by_id["text"].favourites, by_id["link"].reblogs) == (4, 2)
+
+
+def test_bluesky_session_is_persisted_refreshed_and_reused(mock_storage):
+    """createSession once; later clients reuse or refresh the stored session."""
+    import httpx
+
+    from agent.platforms.bluesky import BLUESKY_SESSION_KEY
+
+    storage, store = mock_storage
+    calls: list[str] = []
+    next_session = {"access_in": timedelta(minutes=1)}  # nearly expired on purpose
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit("/", 1)[-1]
+        calls.append(method)
+        if method in ("com.atproto.server.createSession", "com.atproto.server.refreshSession"):
+            return httpx.Response(200, json=_session_json(next_session["access_in"]))
+        return httpx.Response(200, json={"followersCount": 1})
+
+    _bluesky_client(handler, storage).close()
+    assert calls == ["com.atproto.server.createSession"]
+    assert store[BLUESKY_SESSION_KEY]["did"] == "did:plc:me"
+
+    # Access token within the refresh margin: renewed without a password login.
+    next_session["access_in"] = timedelta(hours=2)
+    _bluesky_client(handler, storage).close()
+    assert calls[-1] == "com.atproto.server.refreshSession"
+
+    # Valid stored session: no auth request at all.
+    calls.clear()
+    assert _bluesky_client(handler, storage).get_profile() == {"followersCount": 1}
+    assert calls == ["app.bsky.actor.getProfile"]
+
+
+def test_bluesky_expired_token_refreshes_and_retries_once(mock_storage):
+    """An ExpiredToken error mid-run refreshes the session and replays the request."""
+    import httpx
+
+    storage, _store = mock_storage
+    calls: list[str] = []
+    expired = {"first": True}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit("/", 1)[-1]
+        calls.append(method)
+        if method in ("com.atproto.server.createSession", "com.atproto.server.refreshSession"):
+            return httpx.Response(200, json=_session_json(timedelta(hours=2)))
+        if expired.pop("first", False):
+            return httpx.Response(400, json={"error": "ExpiredToken"})
+        return httpx.Response(200, json={"followersCount": 2})
+
+    bsky = _bluesky_client(handler, storage)
+    assert bsky.get_profile() == {"followersCount": 2}
+    assert calls == [
+        "com.atproto.server.createSession",
+        "app.bsky.actor.getProfile",
+        "com.atproto.server.refreshSession",
+        "app.bsky.actor.getProfile",
+    ]
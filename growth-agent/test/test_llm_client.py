@@ -3,8 +3,10 @@
 from unittest.mock import patch
 
 import pytest
+from langchain_core.messages import AIMessage
 from pydantic import SecretStr
 
+from agent.budget import BudgetExceeded, LLMBudget
 from agent.llm_client import PROVIDERS, LLMClient
 
 
@@ -95,3 +97,66 @@ def test_from_env_missing_api_key_raises(MockChatOpenAI, monkeypatch):
 
     with pytest.raises(KeyError):
         LLMClient.from_env()
+
+
+def test_budget_reserves_remainder_for_first_pass_generation():
+    budget = LLMBudget(max_calls=10, calls_used=8)
+
+    assert budget.allows("generate")
+    assert not budget.allows("refine")
+    budget.calls_used = 10
+    assert not budget.allows("generate")
+
+
+def test_budget_caps_summaries_at_their_share(monkeypatch):
+    budget = LLMBudget(max_calls=20)
+    for _ in range(2):
+        assert budget.allows("summarize")
+        budget.record(100, "summarize")
+    assert not budget.allows("summarize")  # 10% of 20 calls
+    assert budget.allows("generate")
+
+    for name in ("LLM_BUDGET_MAX_TOKENS", "LLM_BUDGET_MAX_CALLS", "LLM_BUDGET_SECONDS"):
+        monkeypatch.delenv(name, raising=False)
+    unconfigured = LLMBudget.from_env()
+    assert (unconfigured.max_tokens, unconfigured.max_calls, unconfigured.deadline_seconds) == (
+        None,
+        None,
+        None,
+    )
+
+
+def test_budget_from_env_ignores_invalid_limits(monkeypatch):
+    monkeypatch.setenv("LLM_BUDGET_MAX_TOKENS", "abc")
+    monkeypatch.setenv("LLM_BUDGET_MAX_CALLS", "40")
+    monkeypatch.setenv("LLM_BUDGET_SECONDS", "1e3x")
+
+    budget = LLMBudget.from_env()
+
+    assert (budget.max_tokens, budget.max_calls, budget.deadline_seconds) == (None, 40, None)
+
+
+@patch("agent.llm_client.ChatOpenAI")
+def test_chat_over_budget_raises_without_calling_provider(MockChatOpenAI):
+    budget = LLMBudget(max_calls=1, calls_used=1)
+    client = LLMClient(SecretStr("k"), "https://example.invalid/v1", "m", budget=budget)
+
+    with pytest.raises(BudgetExceeded):
+        client.chat([{"role": "user", "content": "hi"}])
+
+    MockChatOpenAI.return_value.bind.assert_not_called()
+    assert budget.diagnostics()["skipped_generate"] == 1
+
+
+@patch("agent.llm_client.ChatOpenAI")
+def test_chat_charges_provider_token_usage(MockChatOpenAI):
+    MockChatOpenAI.return_value.bind.return_value.invoke.return_value = AIMessage(
+        content="hello",
+        usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    )
+    budget = LLMBudget(max_tokens=1000)
+    client = LLMClient(SecretStr("k"), "https://example.invalid/v1", "m", budget=budget)
+
+    assert client.chat([{"role": "user", "content": "hi"}], max_tokens=50) == {"content": "hello"}
+    assert budget.calls_used == 1
+    assert budget.tokens_used == 15